@@ -11,27 +11,49 @@ __version__ = "1.0.0"
 from ami_engine.trace_types import TRACE_VERSION
 
 # Simplified API (recommended for new users)
-from ami_engine.api import decide, replay_trace
+from ami_engine.api import decide, decide_batch, decide_multi, replay_trace
 
 # Full API (for advanced users)
-from ami_engine.engine import moral_decision_engine, replay
+from ami_engine.engine import moral_decision_engine, moral_decision_engine_batch, moral_decision_engine_multi, replay
+from ami_engine.result import (
+    LazyEngineResult,
+    TraceDigests,
+    compute_trace_digests,
+    compute_trace_root,
+    diff_trace_steps,
+    trace_step_proof,
+    verify_trace_step,
+)
+from ami_engine.trace_codec import GridRegistry, decode_trace, encode_trace
+from ami_engine.audit_log import AuditLog, verify_audit_log, verify_range, verify_record
+from ami_engine.session import DecisionSession
+from ami_engine.parallel import decide_many, decide_many_shared, iter_decide_many
+from ami_engine.transport import BatchResults, SharedBatch
+from ami_engine.aio import AsyncDecisionEngine, adecide
 
 # Import from repo root packages
 # Note: core/ and config_profiles/ are at repo root for backward compatibility
 # When installed as package, these should be accessible via setuptools package discovery
 try:
     from core.trace_collector import TraceCollector, build_decision_trace
+    from core.engine_config import EngineConfig, load_engine_config
+    from core.decision_cache import DecisionCache
     from config_profiles import get_config, list_profiles
 except ImportError:
     # Fallback: if core/config_profiles not found (shouldn't happen in normal install)
     # Try importing from shim modules
     try:
         from ami_engine.core.trace_collector import TraceCollector, build_decision_trace
+        from core.engine_config import EngineConfig, load_engine_config
+        from core.decision_cache import DecisionCache
         from ami_engine.config_profiles import get_config, list_profiles
     except ImportError:
         # Last resort: these won't be available
         TraceCollector = None
         build_decision_trace = None
+        EngineConfig = None
+        load_engine_config = None
+        DecisionCache = None
         get_config = None
         list_profiles = None
 
@@ -41,12 +63,41 @@ __all__ = [
     "TRACE_VERSION",
     # Simplified API (recommended)
     "decide",
+    "decide_batch",
+    "decide_multi",
+    "decide_many",
+    "iter_decide_many",
+    "decide_many_shared",
+    "adecide",
     "replay_trace",
     # Full API (advanced)
     "moral_decision_engine",
+    "moral_decision_engine_batch",
+    "moral_decision_engine_multi",
     "replay",
+    "LazyEngineResult",
+    "TraceDigests",
+    "compute_trace_digests",
+    "compute_trace_root",
+    "diff_trace_steps",
+    "trace_step_proof",
+    "verify_trace_step",
+    "encode_trace",
+    "decode_trace",
+    "GridRegistry",
+    "AuditLog",
+    "verify_audit_log",
+    "verify_record",
+    "verify_range",
+    "DecisionSession",
+    "AsyncDecisionEngine",
+    "SharedBatch",
+    "BatchResults",
     "TraceCollector",
     "build_decision_trace",
+    "EngineConfig",
+    "load_engine_config",
+    "DecisionCache",
     "get_config",
     "list_profiles",
 ]
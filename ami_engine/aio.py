@@ -0,0 +1,358 @@
+"""
+AMI-ENGINE asyncio API - non-blocking decisions for event-loop services
+
+``AsyncDecisionEngine`` owns a worker pool and a bounded request queue. A
+dispatcher task drains the queue into micro-batches: every request that is
+waiting when a worker slot frees up goes into the same batch, which runs on
+the vectorized ``moral_decision_engine_batch`` path. Under light load batches
+hold a single request (no added latency); under heavy load batches grow
+instead of the queue, which keeps tail latency flat. When the queue is full,
+``adecide()`` waits for room (backpressure) instead of buffering without bound.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ami_engine.engine import _check_output_options, moral_decision_engine, moral_decision_engine_batch
+from ami_engine.parallel import EXECUTORS, _default_workers
+from core.action_plan import get_action_plan
+from core.engine_config import EngineConfig, resolve_engine_config
+
+_Request = Tuple[Dict[str, Any], "asyncio.Future[Dict[str, Any]]"]
+
+
+def _decide_one(
+    raw_state: Dict[str, Any],
+    cfg: EngineConfig,
+    resolution: Optional[List[float]],
+    trace_level: str,
+    result_detail: str,
+) -> Dict[str, Any]:
+    if trace_level == "none":
+        return moral_decision_engine_batch(
+            [raw_state], resolution=resolution, config_override=cfg, result_detail=result_detail,
+        )[0]
+    return moral_decision_engine(
+        raw_state, resolution=resolution, config_override=cfg, trace_level=trace_level, result_detail=result_detail,
+    )
+
+
+def _run_batch(
+    states: List[Dict[str, Any]],
+    cfg: EngineConfig,
+    resolution: Optional[List[float]],
+    trace_level: str,
+    result_detail: str,
+) -> List[Any]:
+    """Micro-batch'i çalıştırır; hata olursa satırları tek tek dener (hatalı satır yerine exception döner)."""
+    try:
+        if trace_level == "none":
+            return moral_decision_engine_batch(
+                states, resolution=resolution, config_override=cfg, result_detail=result_detail,
+            )
+        return [_decide_one(s, cfg, resolution, trace_level, result_detail) for s in states]
+    except Exception:
+        out: List[Any] = []
+        for raw_state in states:
+            try:
+                out.append(_decide_one(raw_state, cfg, resolution, trace_level, result_detail))
+            except Exception as e:
+                out.append(e)
+        return out
+
+
+def _warm_worker(resolution: Optional[List[float]]) -> None:
+    get_action_plan(resolution)
+
+
+class AsyncDecisionEngine:
+    """
+    Micro-batching asyncio front end for the decision engine.
+
+    Results are identical to ``decide(state, profile, trace_level=..., result_detail=...)``.
+    With the default ``trace_level="none"`` requests are decided on the
+    vectorized batch path; with ``"summary"``/``"full"`` each request gets its
+    trace from the scalar engine (still dispatched in micro-batches).
+
+    A call that times out or is cancelled before dispatch is not decided: its
+    entry stays in the queue (and counts toward ``max_queue``) until the
+    dispatcher pops it and skips it. A batch already running in a worker
+    finishes and its result for that call is discarded.
+
+    Example:
+        >>> async with AsyncDecisionEngine("scenario_test", workers=4) as engine:
+        ...     result = await engine.adecide(state, timeout=0.5)
+        ...     async for r in engine.adecide_stream(state_source):
+        ...         handle(r)
+    """
+
+    def __init__(
+        self,
+        profile: Optional[Union[str, Dict[str, Any], EngineConfig]] = None,
+        *,
+        workers: Optional[int] = None,
+        executor: str = "thread",
+        max_queue: int = 1024,
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+        resolution: Optional[List[float]] = None,
+        trace_level: str = "none",
+        result_detail: str = "full",
+    ) -> None:
+        """
+        Args:
+            profile: Profile name, override dict or ``EngineConfig`` (resolved once)
+            workers: Batches in flight / pool size (default: ``min(32, os.cpu_count())``)
+            executor: ``"thread"`` (default) or ``"process"``
+            max_queue: Requests that may wait for dispatch before ``adecide()`` blocks
+            max_batch: Largest micro-batch
+            max_delay: Seconds the dispatcher may wait to fill a batch (0: never wait)
+            resolution: Action grid resolution (default: ``ACTION_GRID_RESOLUTION``)
+            trace_level: As in ``decide()`` (default: "none")
+            result_detail: As in ``decide()``
+        """
+        _check_output_options(trace_level, result_detail)
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers!r}")
+        if max_queue < 1:
+            raise ValueError(f"max_queue must be >= 1, got {max_queue!r}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch!r}")
+        if max_delay < 0:
+            raise ValueError(f"max_delay must be >= 0, got {max_delay!r}")
+        self.config = resolve_engine_config(profile)
+        self.workers = workers or _default_workers()
+        self.executor = executor
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.resolution = resolution
+        self.trace_level = trace_level
+        self.result_detail = result_detail
+        self._pool: Optional[Executor] = None
+        self._queue: Optional["asyncio.Queue[_Request]"] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+        self._running: Set["asyncio.Task[None]"] = set()
+        self._closed = False
+        self.batches = 0
+        self.decisions = 0
+        self.largest_batch = 0
+
+    # --- lifecycle -------------------------------------------------------
+
+    def _make_pool(self) -> Executor:
+        if self.executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_warm_worker, initargs=(self.resolution,),
+            )
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ami-engine")
+
+    def _start(self) -> None:
+        if self._closed:
+            raise RuntimeError("AsyncDecisionEngine is closed")
+        if self._dispatcher is None:
+            self._pool = self._make_pool()
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._slots = asyncio.Semaphore(self.workers)
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def aclose(self) -> None:
+        """Stop accepting requests, cancel queued ones and wait for running batches."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncDecisionEngine":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Dispatch counters: batches, decisions, largest_batch, queued."""
+        return {
+            "batches": self.batches,
+            "decisions": self.decisions,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    # --- requests --------------------------------------------------------
+
+    async def adecide(self, raw_state: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Decide one raw state.
+
+        Args:
+            raw_state: Raw state dictionary
+            timeout: Seconds to wait, including time spent waiting for queue room;
+                     raises ``asyncio.TimeoutError`` on expiry. None waits indefinitely
+
+        Returns:
+            Result dictionary, as from ``decide()``
+        """
+        self._start()
+        if timeout is None:
+            return await self._submit(raw_state)
+        return await asyncio.wait_for(self._submit(raw_state), timeout)
+
+    async def _submit(self, raw_state: Dict[str, Any]) -> Dict[str, Any]:
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((raw_state, future))
+        # Bu coroutine iptal edilirse (timeout, cancel) future da iptal olur; dispatcher onu atlar
+        return await future
+
+    async def adecide_stream(
+        self,
+        states: Union[AsyncIterable[Dict[str, Any]], Iterable[Dict[str, Any]]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+        Decide a (possibly async) stream of raw states, yielding results in input order.
+
+        At most ``workers * max_batch`` requests are in flight, so a fast
+        source is throttled to the engine's pace.
+
+        Args:
+            states: Async or regular iterable of raw state dictionaries
+            timeout: Per-request timeout, as in ``adecide()``
+            return_exceptions: If True, a failed request yields its exception
+                               instead of raising (the stream continues)
+        """
+        window = self.workers * self.max_batch
+        pending: Deque["asyncio.Task[Dict[str, Any]]"] = deque()
+        loop = asyncio.get_running_loop()
+
+        async def head() -> Any:
+            task = pending.popleft()
+            try:
+                return await task
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        try:
+            if hasattr(states, "__aiter__"):
+                async for raw_state in states:  # type: ignore[union-attr]
+                    pending.append(loop.create_task(self.adecide(raw_state, timeout)))
+                    if len(pending) >= window:
+                        yield await head()
+            else:
+                for raw_state in states:  # type: ignore[union-attr]
+                    pending.append(loop.create_task(self.adecide(raw_state, timeout)))
+                    if len(pending) >= window:
+                        yield await head()
+            while pending:
+                yield await head()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # --- dispatch --------------------------------------------------------
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch: List[_Request] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_delay
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                # Boş slot beklenirken biriken istekler de bu batch'e katılır
+                await self._slots.acquire()
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                batch = [(raw_state, future) for raw_state, future in batch if not future.done()]
+                if not batch:
+                    self._slots.release()
+                    continue
+                task = loop.create_task(self._run(batch))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                batch = []
+        finally:
+            # aclose(): kuyruktan alınmış ama gönderilmemiş istekler beklemede kalmasın
+            for _, future in batch:
+                future.cancel()
+
+    async def _run(self, batch: List[_Request]) -> None:
+        loop = asyncio.get_running_loop()
+        self.batches += 1
+        self.decisions += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        states = [raw_state for raw_state, _ in batch]
+        try:
+            results = await loop.run_in_executor(
+                self._pool,
+                partial(_run_batch, states, self.config, self.resolution, self.trace_level, self.result_detail),
+            )
+        except BrokenExecutor as e:
+            # Ölen process worker'ı: havuz yenilenir, yalnızca bu batch başarısız olur
+            if self._pool is not None and not self._closed:
+                self._pool.shutdown(wait=False)
+                self._pool = self._make_pool()
+            results = [e] * len(batch)
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            self._slots.release()
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+async def adecide(
+    raw_state: Dict[str, Any],
+    profile: Optional[Union[str, EngineConfig]] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    One-off async ``decide()`` on the event loop's default executor.
+
+    Accepts the same keyword arguments as ``decide()`` (including
+    ``trace_level="full"``). Services handling many requests should keep an
+    ``AsyncDecisionEngine`` instead, which adds micro-batching and backpressure.
+    """
+    from ami_engine.api import decide
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(decide, raw_state, profile, **kwargs))
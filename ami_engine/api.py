@@ -8,14 +8,25 @@ from typing import Any, Dict, List, Optional, Union
 
 # Import from package (no sys.path hacks)
 from ami_engine.engine import moral_decision_engine as _moral_decision_engine
+from ami_engine.engine import moral_decision_engine_batch as _moral_decision_engine_batch
+from ami_engine.engine import moral_decision_engine_multi as _moral_decision_engine_multi
 from ami_engine.engine import replay as _replay
+from core.decision_cache import DecisionCache
+from core.engine_config import EngineConfig
 
 
 def decide(
     raw_state: Dict[str, Any],
-    profile: Optional[str] = None,
+    profile: Optional[Union[str, EngineConfig]] = None,
     deterministic: bool = True,
     context: Optional[Dict[str, Any]] = None,
+    trace_level: str = "full",
+    result_detail: str = "full",
+    cache: Optional[DecisionCache] = None,
+    resolution: Optional[List[float]] = None,
+    action_search: str = "exhaustive",
+    stability: bool = False,
+    trace_format: str = "1.0",
 ) -> Dict[str, Any]:
     """
     Make an ethical decision based on raw state.
@@ -26,10 +37,32 @@ def decide(
     Args:
         raw_state: Dictionary containing state variables (risk, severity, etc.)
         profile: Config profile name (e.g., "scenario_test", "production_safe")
-                 If None, uses default "base" profile
+                 or an ``EngineConfig`` from ``load_engine_config()``.
+                 If None, uses default "base" profile. Unknown names raise ValueError
         deterministic: If True, same input produces same output (exact match).
                        See AUDITABILITY.md for determinism contract details (default: True)
         context: Optional context dict (e.g., {"cus_history": [...]})
+        trace_level: "full" (default, steps 0-6), "summary" (steps 0, 5, 6 with a
+                     verifiable trace_hash) or "none" (no trace and no trace_hash)
+        result_detail: "full" (default) or "minimal" (action, escalation,
+                       human_escalation and reason only)
+        cache: Optional ``DecisionCache``; repeated states reuse the cached
+               context-free evaluation while temporal drift and soft clamp still
+               run per call. Without ``quantize`` results are identical to uncached calls
+        resolution: Optional action grid values per dimension (default [0.0, 0.5, 1.0]);
+                    the candidate set has len(resolution) ** 4 + 1 actions
+        action_search: "exhaustive" (default, scores every action) or "adaptive" (decides on
+                       the base grid and, for close calls only, refines locally around the best
+                       candidates within the profile's REFINE_* budget; not combinable with ``cache``)
+        stability: If True, record per-threshold stability intervals (J_MIN, H_MAX, C_MIN,
+                   C_MAX, J_CRITICAL, H_CRITICAL, CONFIDENCE_ESCALATION_FORCE, AS_SOFT_THRESHOLD,
+                   DIVERGENCE_HARD_THRESHOLD) in step 6 and the result as ``stability``:
+                   ``{key: [lo, hi]}``, the values the threshold can take, with every other
+                   threshold fixed, without changing ``raw_action`` or the escalation
+                   level (before temporal drift). Exhaustive search only
+        trace_format: "1.0" (default) or "1.1" (grid-deduplicated: the action grid is
+                      referenced by content hash and steps 3-4 are stored as columns,
+                      see ``ami_engine.trace_codec``). ``trace_hash`` is the same in both
     
     Returns:
         Dictionary containing:
@@ -65,6 +98,94 @@ def decide(
         deterministic=deterministic,
         config_override=config_override,
         context=context,
+        trace_level=trace_level,
+        result_detail=result_detail,
+        cache=cache,
+        resolution=resolution,
+        action_search=action_search,
+        stability=stability,
+        trace_format=trace_format,
+    )
+
+
+def decide_batch(
+    states: List[Dict[str, Any]],
+    profile: Optional[Union[str, EngineConfig]] = None,
+    deterministic: bool = True,
+    context: Optional[Dict[str, Any]] = None,
+    result_detail: str = "full",
+) -> List[Dict[str, Any]]:
+    """
+    Make decisions for many raw states in one vectorized pass.
+
+    Scoring, constraint validation, fail-safe and selection run as NumPy array
+    operations over an N x A (state x action) score tensor. Results are identical
+    to calling ``decide()`` once per state, except that ``trace`` and
+    ``trace_hash`` are omitted (use ``decide()`` when an audit trace is needed).
+
+    Args:
+        states: List of raw state dictionaries
+        profile: Config profile name or ``EngineConfig``, as in ``decide()``
+        deterministic: See ``decide()``
+        context: Optional context dict (e.g., {"cus_history": [...]}); states are
+                 processed in input order, exactly like a sequential ``decide()`` loop
+        result_detail: "full" (default) or "minimal", as in ``decide()``
+
+    Returns:
+        List of result dictionaries, in input order
+
+    Example:
+        >>> from ami_engine import decide_batch
+        >>> results = decide_batch([state_a, state_b], profile="scenario_test")
+        >>> [r["escalation"] for r in results]
+    """
+    config_override = profile if profile else None
+    return _moral_decision_engine_batch(
+        raw_states=states,
+        deterministic=deterministic,
+        config_override=config_override,
+        context=context,
+        result_detail=result_detail,
+    )
+
+
+def decide_multi(
+    raw_state: Dict[str, Any],
+    profiles: List[Optional[Union[str, EngineConfig]]],
+    trace_level: str = "full",
+    result_detail: str = "full",
+    resolution: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Decide one raw state under several profiles (shadow evaluation) in a single pass.
+
+    Scores depend only on the state and the action, so the state is encoded and the
+    action grid is scored once; constraints, fail-safe, selection, confidence,
+    uncertainty, escalation and the soft clamp then run per profile. Each result,
+    including ``trace`` and ``trace_hash``, is identical to
+    ``decide(raw_state, profile=p, ...)`` with the default exhaustive search.
+
+    Args:
+        raw_state: Dictionary containing state variables, as in ``decide()``
+        profiles: Profile names, ``EngineConfig`` objects or None (default "base")
+        trace_level: "full", "summary" or "none", as in ``decide()``
+        result_detail: "full" (default) or "minimal", as in ``decide()``
+        resolution: Optional action grid values per dimension, as in ``decide()``
+
+    Returns:
+        List of result dictionaries, one per profile, in ``profiles`` order
+
+    Example:
+        >>> from ami_engine import decide_multi
+        >>> live, shadow = decide_multi(state, ["production_safe", "high_critical"])
+        >>> live["action"] == shadow["action"]
+    """
+    return _moral_decision_engine_multi(
+        raw_state=raw_state,
+        profiles=[profile if profile else None for profile in profiles],
+        resolution=resolution,
+        trace_level=trace_level,
+        result_detail=result_detail,
     )
 
 
@@ -0,0 +1,255 @@
+"""
+AMI-ENGINE Audit Log - hash-chained, tamper-evident decision log
+
+``AuditLog`` is a ``TraceCollector`` whose JSONL file is an append-only chain.
+Each record links to the one before it:
+
+  {"seq": n, "prev": chain[n-1], "entry_hash": compute_trace_hash(entry),
+   "chain": SHA256(prev || entry_hash), "entry": entry}
+
+``prev`` of the first record is ``GENESIS`` (64 zeros); ``||`` concatenates the
+raw 32-byte digests, all hashes are lowercase hex. Every ``checkpoint_every``
+records (and on ``checkpoint()``) a line ``{"checkpoint": {"size", "root",
+"chain"}}`` commits to all records so far: ``root`` is the RFC 6962 Merkle root
+(``core.merkle``) over leaves ``SHA256(0x00 || chain[n])`` and ``chain`` is the
+head of the chain. Checkpoints are unsigned; keep a copy of them outside the
+log (ticket, WORM storage, a second party) to make rewriting the file evident.
+
+Verification:
+
+  - ``verify_record(record, proof, checkpoint)``: one record, O(log n)
+  - ``verify_range(records, checkpoint, first_proof, last_proof)``: consecutive
+    records, O(len(records) + log n) - the chain links the records in between
+  - ``verify_audit_log(path)``: full scan of chain links, entry hashes and
+    every checkpoint
+
+``AuditLog.proof(seq)`` and ``AuditLog.read(start, stop)`` serve proofs and
+records to verifiers; records are read by byte offset, not by rescanning.
+"""
+
+import hashlib
+import json
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ami_engine.result import compute_trace_hash
+from core.merkle import MerkleTree, leaf_hash, verify_inclusion
+from core.trace_collector import TraceCollector, append_jsonl
+
+GENESIS = "0" * 64
+
+
+def chain_hash(prev: str, entry_hash: str) -> str:
+    """Chain hash of a record: SHA256 over the raw previous chain hash and entry hash."""
+    return hashlib.sha256(bytes.fromhex(prev) + bytes.fromhex(entry_hash)).hexdigest()
+
+
+def _leaf(chain: str) -> bytes:
+    return leaf_hash(bytes.fromhex(chain))
+
+
+def _record_error(record: Dict[str, Any], seq: int, prev: str, check_entry: bool) -> Optional[str]:
+    """Why ``record`` is not a valid record ``seq`` following ``prev`` (None if it is)."""
+    try:
+        if record["seq"] != seq:
+            return f"expected seq {seq}, found {record['seq']}"
+        if record["prev"] != prev:
+            return "prev does not link to the previous record"
+        if check_entry and compute_trace_hash(record["entry"]) != record["entry_hash"]:
+            return "entry_hash does not match the entry"
+        if chain_hash(prev, record["entry_hash"]) != record["chain"]:
+            return "chain hash does not match prev and entry_hash"
+    except (KeyError, TypeError, ValueError) as e:
+        return f"malformed record ({type(e).__name__}: {e})"
+    return None
+
+
+def _scan(path: Path, check_entries: bool) -> Tuple[MerkleTree, array, List[Dict[str, Any]], str]:
+    """Reads a log, checking every link and checkpoint; ValueError names the first bad line."""
+    tree = MerkleTree()
+    offsets = array("Q")
+    checkpoints: List[Dict[str, Any]] = []
+    head = GENESIS
+    offset = 0
+    with open(path, "rb") as f:
+        for lineno, line in enumerate(f, 1):
+            try:
+                row = json.loads(line)
+            except ValueError:
+                raise ValueError(f"Audit log line {lineno}: not a JSON record") from None
+            if "checkpoint" in row:
+                cp = row["checkpoint"]
+                if cp != _checkpoint_of(tree, head):
+                    raise ValueError(f"Audit log line {lineno}: checkpoint does not match the records before it")
+                checkpoints.append(cp)
+            else:
+                error = _record_error(row, len(tree), head, check_entries)
+                if error is not None:
+                    raise ValueError(f"Audit log line {lineno}: {error}")
+                head = row["chain"]
+                tree.append(_leaf(head))
+                offsets.append(offset)
+            offset += len(line)
+    return tree, offsets, checkpoints, head
+
+
+def _checkpoint_of(tree: MerkleTree, head: str) -> Dict[str, Any]:
+    return {"size": len(tree), "root": tree.root().hex(), "chain": head}
+
+
+class AuditLog(TraceCollector):
+    """
+    Append-only, hash-chained audit log (see module docstring for the format).
+
+    ``push(entry)`` appends a chained record and returns it; the ring buffer
+    (``get_recent`` / ``get_all``) keeps the plain entries. An existing file is
+    resumed after checking its chain links and checkpoints. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Union[str, Path],
+        checkpoint_every: int = 1024,
+        max_buffer_size: int = 1000,
+    ) -> None:
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be >= 1")
+        super().__init__(max_buffer_size=max_buffer_size)
+        self._path = Path(jsonl_path)
+        self._checkpoint_every = checkpoint_every
+        self._lock = threading.Lock()
+        if self._path.exists():
+            self._tree, self._offsets, self._checkpoints, self._head = _scan(self._path, check_entries=False)
+        else:
+            self._tree, self._offsets, self._checkpoints, self._head = MerkleTree(), array("Q"), [], GENESIS
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def size(self) -> int:
+        """Number of records in the log (the ring buffer may hold fewer)."""
+        return len(self._tree)
+
+    @property
+    def head(self) -> str:
+        """Chain hash of the last record (``GENESIS`` for an empty log)."""
+        return self._head
+
+    @property
+    def checkpoints(self) -> List[Dict[str, Any]]:
+        return list(self._checkpoints)
+
+    def push(self, entry: Dict[str, Any]) -> Dict[str, Any]:  # type: ignore[override]
+        entry_hash = compute_trace_hash(entry)
+        with self._lock:
+            chain = chain_hash(self._head, entry_hash)
+            record = {"seq": len(self._tree), "prev": self._head, "entry_hash": entry_hash, "chain": chain, "entry": entry}
+            # The record is on disk before the in-memory chain moves on
+            self._offsets.append(append_jsonl(self._path, (record,)))
+            self._tree.append(_leaf(chain))
+            self._head = chain
+            self._buffer.append(entry)
+            if len(self._tree) % self._checkpoint_every == 0:
+                self._write_checkpoint()
+        return record
+
+    def _write_checkpoint(self) -> Dict[str, Any]:
+        checkpoint = _checkpoint_of(self._tree, self._head)
+        if not self._checkpoints or self._checkpoints[-1] != checkpoint:
+            append_jsonl(self._path, ({"checkpoint": checkpoint},))
+            self._checkpoints.append(checkpoint)
+        return checkpoint
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Writes a checkpoint for the records so far (unless the last one already covers them) and returns it."""
+        with self._lock:
+            return self._write_checkpoint()
+
+    def proof(self, seq: int, size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Inclusion proof of record ``seq`` against the checkpoint of ``size`` records
+        (default: the latest checkpoint); ValueError if there is no such checkpoint.
+        """
+        with self._lock:
+            if size is None:
+                if not self._checkpoints:
+                    raise ValueError("Audit log has no checkpoint yet; call checkpoint() first")
+                size = self._checkpoints[-1]["size"]
+            elif not any(cp["size"] == size for cp in self._checkpoints):
+                raise ValueError(f"No checkpoint of size {size}")
+            path = self._tree.proof(seq, size)
+        return {"seq": seq, "size": size, "proof": [p.hex() for p in path]}
+
+    def read(self, start: int, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Records ``start`` .. ``stop - 1`` (default: just ``start``), read from their byte offset.
+        IndexError if ``start`` is not a record; ``stop`` is clamped to the log size and an empty or
+        reversed range (``stop <= start``) returns ``[]``.
+        """
+        if not 0 <= start < len(self._offsets):
+            raise IndexError(f"record {start} out of range for {len(self._offsets)} records")
+        stop = start + 1 if stop is None else min(stop, len(self._offsets))
+        if stop <= start:
+            return []
+        records: List[Dict[str, Any]] = []
+        with open(self._path, "rb") as f:
+            f.seek(self._offsets[start])
+            for line in f:
+                row = json.loads(line)
+                if "checkpoint" in row:
+                    continue
+                records.append(row)
+                if len(records) == stop - start:
+                    break
+        return records
+
+
+def verify_record(record: Dict[str, Any], proof: Dict[str, Any], checkpoint: Dict[str, Any]) -> bool:
+    """One record against a checkpoint: entry hash, chain hash and Merkle inclusion (O(log n))."""
+    seq = record.get("seq")
+    if proof.get("seq") != seq or proof.get("size") != checkpoint.get("size") or not isinstance(seq, int):
+        return False
+    prev = GENESIS if seq == 0 else record.get("prev")
+    if _record_error(record, seq, prev, check_entry=True) is not None:
+        return False
+    try:
+        return verify_inclusion(
+            _leaf(record["chain"]), seq, checkpoint["size"],
+            [bytes.fromhex(p) for p in proof["proof"]], bytes.fromhex(checkpoint["root"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def verify_range(
+    records: Sequence[Dict[str, Any]],
+    checkpoint: Dict[str, Any],
+    first_proof: Dict[str, Any],
+    last_proof: Dict[str, Any],
+) -> bool:
+    """
+    Consecutive records against a checkpoint: the first and last are proven
+    included, the chain links every record in between (O(len(records) + log n)).
+    """
+    if not records or not verify_record(records[0], first_proof, checkpoint):
+        return False
+    prev, seq = records[0]["chain"], records[0]["seq"]
+    for record in records[1:]:
+        seq += 1
+        if _record_error(record, seq, prev, check_entry=True) is not None:
+            return False
+        prev = record["chain"]
+    return len(records) == 1 or verify_record(records[-1], last_proof, checkpoint)
+
+
+def verify_audit_log(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Full scan: every entry hash, chain link and checkpoint. Returns
+    ``{"records", "checkpoints", "root", "chain"}``; ValueError names the first bad line.
+    """
+    tree, _, checkpoints, head = _scan(Path(path), check_entries=True)
+    return {"records": len(tree), "checkpoints": len(checkpoints), "root": tree.root().hex(), "chain": head}
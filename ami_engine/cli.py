@@ -6,6 +6,7 @@ Usage:
     ami-engine dashboard          # Start Streamlit dashboard
     ami-engine realtime [--duration SEC] [--profile PROFILE]  # Run live test
     ami-engine tests             # Run test suite
+    ami-engine serve [--port PORT | --unix PATH] [--max-batch N] [--max-wait-ms MS]  # Local decision server
 """
 
 import argparse
@@ -67,6 +68,32 @@ def cmd_tests(args):
     subprocess.run(cmd)
 
 
+def cmd_serve(args):
+    """Run the local HTTP/JSON decision server."""
+    from ami_engine.server import make_server
+
+    server = make_server(
+        args.host,
+        args.port,
+        args.unix,
+        verbose=args.verbose,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000.0,
+        max_sessions=args.max_sessions,
+    )
+    where = args.unix or "http://%s:%d" % server.server_address[:2]
+    print(f"AMI-ENGINE decision server on {where} (max_batch={args.max_batch}, max_wait={args.max_wait_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+        if args.unix and Path(args.unix).exists():
+            Path(args.unix).unlink()
+
+
 def cmd_demo(args):
     """Run proof-of-concept demo with validation and summary."""
     import time
@@ -243,6 +270,21 @@ def main():
     tests_parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     tests_parser.set_defaults(func=cmd_tests)
 
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Run local HTTP/JSON decision server")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port number (default: 8765)")
+    serve_parser.add_argument("--unix", type=str, help="Serve on a Unix socket path instead of TCP")
+    serve_parser.add_argument("--max-batch", type=int, default=64, help="Largest micro-batch (default: 64)")
+    serve_parser.add_argument(
+        "--max-wait-ms", type=float, default=2.0, help="Max wait to fill a micro-batch in ms (default: 2)"
+    )
+    serve_parser.add_argument(
+        "--max-sessions", type=int, default=10000, help="Server-side sessions kept (default: 10000)"
+    )
+    serve_parser.add_argument("-v", "--verbose", action="store_true", help="Log each request")
+    serve_parser.set_defaults(func=cmd_serve)
+
     # Demo command
     demo_parser = subparsers.add_parser("demo", help="Run proof-of-concept demo with validation")
     demo_parser.add_argument(
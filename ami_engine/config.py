@@ -57,6 +57,9 @@ DELAY_SOFT_MIN = 0.3
 AS_SOFT_THRESHOLD = 0.3
 DIVERGENCE_HARD_THRESHOLD = 0.5
 ESCALATION_HYSTERESIS = 0.02
+# Level 1: False = raw aksiyon soft clamp ile şekillendirilir (Phase 4.6.1); True = restrict_action_space
+# (yukarıdaki soft eşikleri sağlayan geçerli adaylar arasında yeniden seçim, yoksa soft clamp)
+SOFT_SAFE_RESTRICT = False
 
 # Phase 4.6.1 — Adaptive Soft Clamp (Level 1 behavioral shaping)
 SOFT_CLAMP_ALPHA = 0.60
@@ -67,3 +70,12 @@ SOFT_CLAMP_GAMMA = 0.35
 DELTA_CUS_THRESHOLD = 0.15
 CUS_MEAN_WINDOW = 10
 CUS_MEAN_THRESHOLD = 0.65
+
+# Adaptive grid refinement (action_search="adaptive"): yakın kararda en iyi adaylar çevresinde yerel grid.
+# Taban en iyi aday grid kutusunun skor üst sınırına ulaşıyorsa (ör. [0, 1]'i kapsayan grid'ler) incelme yapılmaz.
+# Eşikler scenario_test / clamp_test örnekleminde: [0.2, 0.5, 0.8] grid'inde max_score kararlarının ~%18'i incelir,
+# raw_action'ı değişen kararların ~%95'i bunların içindedir. de_norm yakın kararı ayırt etmez (≈0.9993 sabit).
+REFINE_AS_THRESHOLD = 0.01  # as_norm bunun altındaysa yakın karar
+REFINE_DE_THRESHOLD = 1.0  # de_norm bunun üstündeyse yakın karar (de_norm ≤ 1: varsayılan kapalı)
+REFINE_MAX_LEVELS = 2  # bütçe: en fazla kaç kez yarım adımla inceltilir (0 = kapalı)
+REFINE_TOP_K = 2  # her seviyede çevresi inceltilen en iyi aday sayısı
@@ -2,12 +2,11 @@
 # B.4: Trace raw_state + Replay + regülasyon-grade sertleştirmeler (04_QUALITY_AND_PHASE4_SPEC).
 
 import copy
-import hashlib
-import json
-import random
-from typing import Any, Dict, List, Optional, Union
+import functools
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
-from ami_engine import config as _config
 from ami_engine.config import DEFAULT_WEIGHTS
 
 # Import from parent core package (relative import)
@@ -21,9 +20,7 @@ if str(_core_parent.parent) not in sys.path:
 
 from core import (
     encode_state,
-    generate_actions,
     evaluate_moral,
-    validate_constraints,
     fail_safe,
     select_action,
     TraceLogger,
@@ -31,27 +28,39 @@ from core import (
     compute_confidence,
     compute_uncertainty,
 )
+from core.action_selector import SelectionResult
+from core.confidence import ConfidenceResult
+from core.action_plan import get_action_plan
+from core.action_search import ACTION_SEARCHES, refine_grid, score_upper_bound
+from core.engine_config import EngineConfig, resolve_engine_config
+from core.batch_engine import (
+    BatchScores,
+    combined_scores,
+    encode_states,
+    score_batch,
+    select_indices,
+    validity_mask,
+)
+from core.decision_cache import CachedDecision, DecisionCache
+from core.trace_logger import CompactSteps
 from core.fail_safe import FailSafeResult
 from core.soft_override import compute_escalation_level
 from core.soft_clamp import soft_clamp_action
+from core.stability import compute_stability
+from core.moral_evaluator import rescore_action
+from core.uncertainty import UncertaintyResult, update_uncertainty
 from core.temporal_drift import (
+    DriftState,
     update_cus_history,
     compute_temporal_drift,
     should_preemptively_escalate,
 )
 
 # TRACE_VERSION is imported from ami_engine.trace_types (single source of truth)
-from ami_engine.trace_types import TRACE_VERSION
-
-# Regülasyon-grade: key order + whitespace yok + Unicode stabil (hash tutarlılığı)
-def _trace_to_canonical(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bytes:
-    return json.dumps(
-        trace,
-        sort_keys=True,
-        separators=(",", ":"),
-        ensure_ascii=False,
-    ).encode("utf-8")
-
+from ami_engine.trace_types import RESULT_DETAILS, TRACE_FORMATS, TRACE_LEVEL_STEPS, TRACE_LEVELS, TRACE_VERSION
+# Trace hash (canonical JSON + SHA256) motor çıktısıyla birlikte result modülünde
+from ami_engine.result import LazyEngineResult, TraceSource, compute_trace_digests, compute_trace_hash, diff_trace_steps
+from ami_engine.trace_codec import trace_version
 
 def _get_steps(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """Trace versioned (dict) veya legacy (list) olsun, steps listesini döndürür."""
@@ -62,76 +71,104 @@ def _get_steps(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[
     return []
 
 
-def moral_decision_engine(
-    raw_state: Dict[str, Any],
-    resolution: List[float] | None = None,
-    deterministic: bool = True,
-    config_override: Optional[Union[Dict[str, Any], str]] = None,
-    context: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    """
-    Tek adımda etik karar: ham durum → seçilen aksiyon + tam trace + human_escalation.
-    config_override: dict (J_MIN, H_MAX, ...) veya profile adı (base, production_safe, high_critical).
-    context: opsiyonel; "cus_history" (List[float]) ile Phase 5 temporal drift kullanılır (in-place güncellenir).
-    """
-    if deterministic:
-        random.seed(0)
-
-    if isinstance(config_override, str):
-        try:
-            from ami_engine.config_profiles import get_config
-            config_override = get_config(config_override)
-        except Exception:
-            config_override = {}
-    co = config_override or {}
-    j_min = co.get("J_MIN", _config.J_MIN)
-    h_max = co.get("H_MAX", _config.H_MAX)
-    c_min = co.get("C_MIN", _config.C_MIN)
-    c_max = co.get("C_MAX", _config.C_MAX)
-    j_crit = co.get("J_CRITICAL", _config.J_CRITICAL)
-    h_crit = co.get("H_CRITICAL", _config.H_CRITICAL)
-
-    logger = TraceLogger()
-
-    logger.log(0, "raw_state", copy.deepcopy(raw_state))
+def _check_output_options(trace_level: str, result_detail: str, trace_format: str = TRACE_VERSION) -> None:
+    if trace_level not in TRACE_LEVELS:
+        raise ValueError(f"trace_level must be one of {TRACE_LEVELS}, got {trace_level!r}")
+    if result_detail not in RESULT_DETAILS:
+        raise ValueError(f"result_detail must be one of {RESULT_DETAILS}, got {result_detail!r}")
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"trace_format must be one of {TRACE_FORMATS}, got {trace_format!r}")
 
-    x_t = encode_state(raw_state)
-    logger.log(1, "state_encoded", {"x_ext": list(x_t.x_ext), "x_moral": list(x_t.x_moral)})
-
-    A = generate_actions(x_t, resolution)
-    logger.log(2, "actions_generated", {"count": len(A), "actions": A})
-
-    scored: List[tuple] = []
-    for a in A:
-        scores = evaluate_moral(x_t, a)
-        scored.append((a, scores))
-    logger.log(3, "moral_scores", [{"a": a, "W": s.W, "J": s.J, "H": s.H, "C": s.C} for a, s in scored])
-
-    candidates: List[tuple] = []
-    for a, scores in scored:
-        cv = validate_constraints(scores, j_min=j_min, h_max=h_max, c_min=c_min, c_max=c_max)
-        if cv.valid:
-            candidates.append((a, scores))
-        logger.log(4, "constraint", {"a": a, "valid": cv.valid, "violations": cv.violations})
-
-    worst_J = min(s.J for _, s in scored)
-    worst_H = max(s.H for _, s in scored)
-    fs = fail_safe(MoralScores(W=0, J=worst_J, H=worst_H, C=0), j_crit=j_crit, h_crit=h_crit)
-    logger.log(5, "fail_safe", {"override": fs.override, "human_escalation": fs.human_escalation})
 
-    candidate_scores = [
-        DEFAULT_WEIGHTS.alpha * s.W + DEFAULT_WEIGHTS.beta * s.J
-        - DEFAULT_WEIGHTS.gamma * s.H + DEFAULT_WEIGHTS.delta * s.C
-        for _, s in candidates
-    ]
+def _trace_level_of(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
+    """Kayıtlı trace'in seviyesi; legacy list ve v1.0 dict → full."""
+    if isinstance(trace, dict):
+        return trace.get("level", "full")
+    return "full"
 
-    sel = select_action(candidates, fs, DEFAULT_WEIGHTS)
 
-    if sel.reason in ("fail_safe", "no_valid_fallback") and fs.safe_action is not None:
-        selected_scores = evaluate_moral(x_t, fs.safe_action)
-    else:
-        selected_scores = next((s for a, s in candidates if a == sel.action), None)
+def _constraint_thresholds(cfg: EngineConfig) -> Dict[str, float]:
+    return {"j_min": cfg.j_min, "h_max": cfg.h_max, "c_min": cfg.c_min, "c_max": cfg.c_max}
+
+
+def _constraint_mask(plan: Any, cfg: EngineConfig) -> Any:
+    return plan.constraint_mask(
+        cfg.j_min, cfg.h_max, cfg.c_min, cfg.c_max,
+        cfg.severity_soft_max, cfg.intervention_soft_max, cfg.delay_soft_min,
+    )
+
 
+def _restricted_selection(x_t: Any, plan: Any, cfg: EngineConfig) -> Tuple[Optional[tuple], int]:
+    """
+    SOFT_SAFE_RESTRICT: Level 1'de restrict_action_space (derlenmiş envelope maskesi) — soft eşikleri
+    sağlayan geçerli adaylar arasında select_action. Döndürür: ((aksiyon, MoralScores) | None, aday sayısı).
+    """
+    W, J, H, C = plan.score(x_t)
+    mask = _constraint_mask(plan, cfg)
+    allowed = np.flatnonzero(mask.valid(J, H, C) & mask.envelope).tolist()
+    if not allowed:
+        return None, 0
+    W, J, H = W.tolist(), J.tolist(), H.tolist()
+    candidates = [(list(plan.actions[k]), MoralScores(W=W[k], J=J[k], H=H[k], C=C)) for k in allowed]
+    best = select_action(candidates, FailSafeResult(False, None, False), DEFAULT_WEIGHTS)
+    return next(item for item in candidates if item[0] == best.action), len(candidates)
+
+
+def _assess_decision(
+    fs: FailSafeResult,
+    selected_scores: Optional[MoralScores],
+    candidate_scores: List[float],
+    worst_H: float,
+    cfg: EngineConfig,
+) -> Tuple[Optional[ConfidenceResult], Optional[UncertaintyResult], int]:
+    """
+    Seçim sonrası context'ten bağımsız kısım: confidence → uncertainty → escalation.
+    Sonuç yalnızca kodlanmış state + config'e bağlıdır (DecisionCache bunu saklar).
+    """
+    if selected_scores is None:
+        return None, None, (2 if fs.override else 0)
+    conf = compute_confidence(selected_scores, **_constraint_thresholds(cfg))
+    uncertainty = compute_uncertainty(
+        conf.confidence,
+        conf.constraint_margin,
+        candidate_scores,
+        config=cfg,
+    )
+    escalation = compute_escalation_level(
+        conf.confidence,
+        conf.constraint_margin,
+        worst_H,
+        cfg.h_critical,
+        config=cfg,
+        as_norm=uncertainty.as_norm,
+        divergence=uncertainty.divergence,
+    )
+    return conf, uncertainty, escalation
+
+
+def _finalize_decision(
+    x_t: Any,
+    sel: Any,
+    fs: FailSafeResult,
+    selected_scores: Optional[MoralScores],
+    candidate_scores: List[float],
+    conf: Optional[ConfidenceResult],
+    uncertainty: Optional[UncertaintyResult],
+    escalation: int,
+    worst_H: float,
+    cfg: EngineConfig,
+    context: Optional[Dict[str, Any]],
+    drift_state: Optional[DriftState] = None,
+    plan: Any = None,
+) -> Dict[str, Any]:
+    """
+    Seçim sonrası ortak kuyruk (skaler, batch ve önbellek yolu aynı kodu kullanır → bit-uyum):
+    _assess_decision çıktısı üzerine hysteresis (drift_state) → temporal drift → Level 1 soft clamp.
+    drift_state verilirse context yerine onun ring buffer'ı kullanılır ve previous_escalation güncellenir.
+    cfg.soft_safe_restrict: Level 1'de (plan gerekli) önce restrict_action_space ile yeniden seçim; soft
+    eşikleri sağlayan geçerli aday yoksa soft clamp.
+    Döndürülen dict: step 6 selection_data + motor çıktısı için gereken alanlar.
+    """
     selection_data = {
         "action": sel.action,
         "reason": sel.reason,
@@ -145,13 +182,6 @@ def moral_decision_engine(
             "H": selected_scores.H,
             "C": selected_scores.C,
         }
-        conf = compute_confidence(
-            selected_scores,
-            j_min=j_min,
-            h_max=h_max,
-            c_min=c_min,
-            c_max=c_max,
-        )
         selection_data["confidence"] = conf.confidence
         selection_data["constraint_margin"] = conf.constraint_margin
         selection_data["base_confidence"] = conf.base_confidence
@@ -160,40 +190,35 @@ def moral_decision_engine(
         selection_data["suggest_escalation"] = conf.suggest_escalation
         selection_data["force_escalation"] = conf.force_escalation
         human_escalation = fs.human_escalation or conf.force_escalation
-        uncertainty = compute_uncertainty(
-            conf.confidence,
-            conf.constraint_margin,
-            candidate_scores,
-            config=co,
-        )
         selection_data["uncertainty"] = uncertainty.to_dict()
     else:
-        conf = None
-        uncertainty = None
         human_escalation = fs.human_escalation
 
-    if conf is not None:
+    if drift_state is not None and drift_state.previous_escalation is not None and conf is not None:
         escalation = compute_escalation_level(
             conf.confidence,
             conf.constraint_margin,
             worst_H,
-            h_crit,
-            config=co,
-            as_norm=uncertainty.as_norm if uncertainty else None,
-            divergence=uncertainty.divergence if uncertainty else None,
+            cfg.h_critical,
+            config=cfg,
+            as_norm=uncertainty.as_norm,
+            divergence=uncertainty.divergence,
+            previous_escalation=drift_state.previous_escalation,
         )
-    else:
-        escalation = 2 if fs.override else 0
 
     temporal_drift_data: Optional[Dict[str, Any]] = None
-    if context is not None and uncertainty is not None:
-        window = co.get("CUS_MEAN_WINDOW", _config.CUS_MEAN_WINDOW)
-        delta_thresh = co.get("DELTA_CUS_THRESHOLD", _config.DELTA_CUS_THRESHOLD)
-        mean_thresh = co.get("CUS_MEAN_THRESHOLD", _config.CUS_MEAN_THRESHOLD)
-        hist = context.get("cus_history", [])
-        hist = update_cus_history(hist, uncertainty.cus, window)
-        context["cus_history"] = hist
-        drift = compute_temporal_drift(uncertainty.cus, hist, delta_thresh, mean_thresh)
+    drift = None
+    if uncertainty is not None:
+        if drift_state is not None:
+            drift = drift_state.update(uncertainty.cus, cfg.delta_cus_threshold, cfg.cus_mean_threshold)
+        elif context is not None:
+            hist = context.get("cus_history", [])
+            hist = update_cus_history(hist, uncertainty.cus, cfg.cus_mean_window)
+            context["cus_history"] = hist
+            drift = compute_temporal_drift(
+                uncertainty.cus, hist, cfg.delta_cus_threshold, cfg.cus_mean_threshold,
+            )
+    if drift is not None:
         temporal_drift_data = {
             "delta_cus": drift.delta_cus,
             "cus_mean": drift.cus_mean,
@@ -208,86 +233,544 @@ def moral_decision_engine(
     self_regulation_data: Optional[Dict[str, Any]] = None
     if escalation == 1 and not fs.override and uncertainty is not None:
         confidence_before = conf.confidence
-        alpha = co.get("SOFT_CLAMP_ALPHA", _config.SOFT_CLAMP_ALPHA)
-        beta = co.get("SOFT_CLAMP_BETA", _config.SOFT_CLAMP_BETA)
-        gamma = co.get("SOFT_CLAMP_GAMMA", _config.SOFT_CLAMP_GAMMA)
-        clamped = soft_clamp_action(sel.action, uncertainty.cus, alpha, beta, gamma)
-        final_action = clamped
-        selected_scores = evaluate_moral(x_t, clamped)
-        conf = compute_confidence(
-            selected_scores,
-            j_min=j_min,
-            h_max=h_max,
-            c_min=c_min,
-            c_max=c_max,
-        )
-        uncertainty = compute_uncertainty(
-            conf.confidence,
-            conf.constraint_margin,
-            candidate_scores,
-            config=co,
-        )
+        restricted, filtered_count = _restricted_selection(x_t, plan, cfg) if cfg.soft_safe_restrict else (None, 0)
+        if restricted is not None:
+            final_action, selected_scores = restricted
+        else:
+            final_action = soft_clamp_action(
+                sel.action, uncertainty.cus, cfg.soft_clamp_alpha, cfg.soft_clamp_beta, cfg.soft_clamp_gamma,
+            )
+            # Aday kümesi ve state değişmez: C, DE ve AS yeniden kullanılır; yalnızca aksiyona bağlı kısımlar
+            selected_scores = rescore_action(x_t, final_action, compassion=selected_scores.C)
+        conf = compute_confidence(selected_scores, **_constraint_thresholds(cfg))
+        uncertainty = update_uncertainty(uncertainty, conf.confidence, conf.constraint_margin, config=cfg)
         human_escalation = False
         delta_confidence = conf.confidence - confidence_before
         self_regulation_data = {"delta_confidence": delta_confidence}
-        selection_data = {
-            "action": clamped,
-            "reason": sel.reason,
-            "score": sel.score,
-            "override": False,
-            "scores": {
-                "W": selected_scores.W,
-                "J": selected_scores.J,
-                "H": selected_scores.H,
-                "C": selected_scores.C,
-            },
-            "confidence": conf.confidence,
-            "constraint_margin": conf.constraint_margin,
-            "base_confidence": conf.base_confidence,
-            "margin_factor": conf.margin_factor,
-            "confidence_gradient": conf.confidence_gradient,
-            "suggest_escalation": conf.suggest_escalation,
-            "force_escalation": conf.force_escalation,
-            "uncertainty": uncertainty.to_dict(),
-            "self_regulation": self_regulation_data,
-        }
+        # Step 6 kaydı yerinde güncellenir (anahtar sırası korunur)
+        selection_data["action"] = final_action
+        scores_data = selection_data["scores"]
+        scores_data["W"] = selected_scores.W
+        scores_data["J"] = selected_scores.J
+        scores_data["H"] = selected_scores.H
+        selection_data["confidence"] = conf.confidence
+        selection_data["constraint_margin"] = conf.constraint_margin
+        selection_data["base_confidence"] = conf.base_confidence
+        selection_data["margin_factor"] = conf.margin_factor
+        selection_data["confidence_gradient"] = conf.confidence_gradient
+        selection_data["suggest_escalation"] = conf.suggest_escalation
+        selection_data["force_escalation"] = conf.force_escalation
+        selection_data["uncertainty"] = uncertainty.to_dict()
+        selection_data["self_regulation"] = self_regulation_data
+        if cfg.soft_safe_restrict:
+            selection_data["filtered_candidate_count"] = filtered_count
         soft_safe_applied = True
 
     selection_data["escalation"] = escalation
     selection_data["soft_safe_applied"] = soft_safe_applied
+    if cfg.soft_safe_restrict:
+        selection_data["soft_safe_restrict"] = True
     if temporal_drift_data is not None:
         selection_data["temporal_drift"] = temporal_drift_data
+    if drift_state is not None:
+        drift_state.previous_escalation = escalation
 
-    logger.log(6, "selection", selection_data)
-
-    trace_list = [{"step": e.step, "event_type": e.event_type, "data": e.data} for e in logger.trace]
-    trace_output: Dict[str, Any] = {"version": TRACE_VERSION, "steps": trace_list}
-    out = {
-        "action": final_action,
+    return {
+        "selection_data": selection_data,
+        "final_action": final_action,
         "raw_action": raw_action,
-        "trace": trace_output,
         "human_escalation": human_escalation,
         "reason": sel.reason,
-        "trace_hash": compute_trace_hash(trace_output),
+        "conf": conf,
+        "uncertainty": uncertainty,
+        "escalation": escalation,
+        "soft_safe_applied": soft_safe_applied,
+        "temporal_drift": temporal_drift_data,
+        "self_regulation": self_regulation_data,
+        "selected_scores": selected_scores,
     }
+
+
+def _result_fields(
+    decision: Dict[str, Any],
+    out: Dict[str, Any],
+    result_detail: str = "full",
+) -> Dict[str, Any]:
+    """_finalize_decision çıktısındaki opsiyonel alanları motor çıktısına ekler."""
+    if result_detail == "minimal":
+        out["escalation"] = decision["escalation"]
+        return out
+    conf = decision["conf"]
+    uncertainty = decision["uncertainty"]
+    selected_scores = decision["selected_scores"]
     if conf is not None:
         out["confidence"] = conf.confidence
         out["constraint_margin"] = conf.constraint_margin
         out["confidence_gradient"] = conf.confidence_gradient
     if uncertainty is not None:
         out["uncertainty"] = uncertainty.to_dict()
-    out["escalation"] = escalation
-    out["soft_safe_applied"] = soft_safe_applied
-    if temporal_drift_data is not None:
-        out["temporal_drift"] = temporal_drift_data
-    if self_regulation_data is not None:
-        out["self_regulation"] = self_regulation_data
+    out["escalation"] = decision["escalation"]
+    out["soft_safe_applied"] = decision["soft_safe_applied"]
+    if decision["temporal_drift"] is not None:
+        out["temporal_drift"] = decision["temporal_drift"]
+    if decision["self_regulation"] is not None:
+        out["self_regulation"] = decision["self_regulation"]
     if selected_scores is not None:
         out["J"] = selected_scores.J
         out["H"] = selected_scores.H
     return out
 
 
+def _override_candidate_scores(x_t: Any, plan: Any, cfg: EngineConfig, scores: Optional[tuple] = None) -> List[float]:
+    """Geçerli adayların birleşik skorları (aday sırasıyla), batch çekirdeğiyle tek satır olarak."""
+    W, J, H, C = scores if scores is not None else plan.score(x_t)
+    batch = BatchScores(W=W[None, :], J=J[None, :], H=H[None, :], C=np.array([C]))
+    valid = validity_mask(batch, **_constraint_thresholds(cfg))[0]
+    if not valid.any():
+        return []
+    return combined_scores(batch, DEFAULT_WEIGHTS)[0][valid].tolist()
+
+
+def _state_steps(x_t: Any, plan: Any, cfg: EngineConfig, scores: Optional[tuple] = None) -> CompactSteps:
+    """
+    Full trace step 1–4 kaydı (kodlanmış state, grid, aksiyon başına skorlar ve ihlaller) kolon formunda.
+    Karar bu veriye bağlı değildir; moral_decision_engine bunu trace'e ilk erişimde üretir.
+    """
+    W, J, H, C = scores if scores is not None else plan.score(x_t)
+    return CompactSteps.from_scores(x_t, plan.actions, W, J, H, C, **_constraint_thresholds(cfg))
+
+
+def _evaluate_state(
+    x_t: Any,
+    plan: Any,
+    cfg: EngineConfig,
+    record_steps: bool,
+    scores: Optional[tuple] = None,
+    worst: Optional[Tuple[float, float]] = None,
+) -> CachedDecision:
+    """
+    Kodlanmış state için context'ten bağımsız pipeline: skor → kısıt → fail-safe → seçim → assessment.
+    record_steps=True: step 1–4 trace event verisi de üretilir (_state_steps; önbelleğe yazılan kayıtlar için).
+    scores / worst: aynı state için önceden hesaplanmış plan.score / plan.worst_case (profile'dan bağımsız;
+    moral_decision_engine_multi bunları profile'lar arasında paylaşır).
+    """
+    if record_steps and scores is None:
+        scores = plan.score(x_t)
+
+    # Fail-safe ön kontrolü: worst_J / worst_H kapalı formdan (skorlamadan önce)
+    worst_J, worst_H = worst if worst is not None else plan.worst_case(x_t)
+    fs = fail_safe(MoralScores(W=0, J=worst_J, H=worst_H, C=0), j_crit=cfg.j_critical, h_crit=cfg.h_critical)
+
+    if fs.override:
+        # Override kesin: aday başına MoralScores/validate/select atlanır. Uncertainty yine geçerli
+        # adayların skorlarını ister; bunlar vektörel (bit-uyumlu) maske + skorla üretilir.
+        sel = SelectionResult(action=fs.safe_action, score=None, reason="fail_safe")
+        selected_scores = evaluate_moral(x_t, fs.safe_action)
+        candidate_scores = _override_candidate_scores(x_t, plan, cfg, scores)
+    else:
+        W, J, H, C = scores if scores is not None else plan.score(x_t)
+        # Derlenmiş maske: aksiyon maskesi & vektörel J/H eşikleri (validate_constraints ile aynı sonuç);
+        # MoralScores yalnızca geçerli adaylar için, grid sırasıyla
+        valid = _constraint_mask(plan, cfg).valid(J, H, C)
+        W, J, H = W.tolist(), J.tolist(), H.tolist()
+        candidates = [
+            (list(plan.actions[k]), MoralScores(W=W[k], J=J[k], H=H[k], C=C))
+            for k in np.flatnonzero(valid).tolist()
+        ]
+
+        candidate_scores = [
+            DEFAULT_WEIGHTS.alpha * s.W + DEFAULT_WEIGHTS.beta * s.J
+            - DEFAULT_WEIGHTS.gamma * s.H + DEFAULT_WEIGHTS.delta * s.C
+            for _, s in candidates
+        ]
+
+        sel = select_action(candidates, fs, DEFAULT_WEIGHTS)
+
+        if sel.reason in ("fail_safe", "no_valid_fallback") and fs.safe_action is not None:
+            selected_scores = evaluate_moral(x_t, fs.safe_action)
+        else:
+            selected_scores = next((s for a, s in candidates if a == sel.action), None)
+
+    conf, uncertainty, escalation = _assess_decision(fs, selected_scores, candidate_scores, worst_H, cfg)
+    return CachedDecision(
+        x_t=x_t,
+        sel=sel,
+        fs=fs,
+        selected_scores=selected_scores,
+        candidate_scores=candidate_scores,
+        worst_H=worst_H,
+        conf=conf,
+        uncertainty=uncertainty,
+        escalation=escalation,
+        steps=_state_steps(x_t, plan, cfg, scores) if record_steps else None,
+    )
+
+
+def _refine_state(
+    x_t: Any,
+    plan: Any,
+    cfg: EngineConfig,
+    record_steps: bool,
+) -> Tuple[CachedDecision, Dict[str, Any]]:
+    """
+    action_search="adaptive": önce taban grid (tam tarama, _evaluate_state). Karar yakınsa
+    (as_norm < REFINE_AS_THRESHOLD veya de_norm > REFINE_DE_THRESHOLD) ve taban en iyi aday grid kutusunun
+    skor üst sınırına ulaşmıyorsa (score_upper_bound; ulaşıyorsa hiçbir ara nokta onu geçemez) en iyi
+    REFINE_TOP_K aday çevresinde yarım adımlı yerel grid'ler skorlanır; en fazla REFINE_MAX_LEVELS seviye,
+    en iyi aday değişmezse durur. Seçim tüm skorlanan geçerli adaylar üzerindendir (eşitlikte önce skorlanan
+    kazanır); uncertainty taban grid adaylarından hesaplanır: seçim değişmedikçe sonuç tam taramayla aynıdır.
+    İkinci değer: step 6 "search" kaydı (bütçe + seviyeler; replay aynı incelmeyi yeniden üretir).
+    """
+    ev = _evaluate_state(x_t, plan, cfg, record_steps)
+    search: Dict[str, Any] = {
+        "method": "adaptive",
+        "resolution": list(plan.resolution),
+        "budget": {
+            "REFINE_AS_THRESHOLD": cfg.refine_as_threshold,
+            "REFINE_DE_THRESHOLD": cfg.refine_de_threshold,
+            "REFINE_MAX_LEVELS": cfg.refine_max_levels,
+            "REFINE_TOP_K": cfg.refine_top_k,
+        },
+        "levels": [],
+    }
+    u = ev.uncertainty
+    grid = sorted(set(plan.resolution))
+    if (
+        ev.sel.reason != "max_score"
+        or u is None
+        or cfg.refine_max_levels == 0
+        or len(grid) < 2
+        or not (u.as_norm < cfg.refine_as_threshold or u.de_norm > cfg.refine_de_threshold)
+        or ev.sel.score >= score_upper_bound(x_t, (grid[0], grid[-1]), ev.selected_scores.C, DEFAULT_WEIGHTS)
+    ):
+        return ev, search
+
+    th = _constraint_thresholds(cfg)
+    W, J, H, C = plan.score(x_t)
+    batch = BatchScores(W=W[None, :], J=J[None, :], H=H[None, :], C=np.array([C]))
+    valid = validity_mask(batch, **th)[0]
+    S = combined_scores(batch, DEFAULT_WEIGHTS)[0]
+    # (skor, aksiyon, MoralScores) — taban adaylar grid sırasıyla, incelenenler skorlanma sırasıyla
+    pool: List[tuple] = [
+        (float(S[k]), plan.actions[k], MoralScores(W=float(W[k]), J=float(J[k]), H=float(H[k]), C=C))
+        for k in np.flatnonzero(valid).tolist()
+    ]
+    seen = set(plan.actions)
+    base_step = min(b - a for a, b in zip(grid, grid[1:]))
+    best = max(range(len(pool)), key=lambda k: pool[k][0])
+
+    for level in range(1, cfg.refine_max_levels + 1):
+        step = base_step / 2 ** level
+        ranked = sorted(range(len(pool)), key=lambda k: (-pool[k][0], k))
+        seeds = [pool[k][1] for k in ranked[: cfg.refine_top_k]]
+        new = refine_grid(x_t, seeds, step, seen, (grid[0], grid[-1]), C, DEFAULT_WEIGHTS, **th)
+        for action, scores, ok, score in new:
+            if ok:
+                pool.append((score, tuple(action), scores))
+        new_best = max(range(len(pool)), key=lambda k: pool[k][0])
+        search["levels"].append({
+            "level": level,
+            "step": step,
+            "evaluated": len(new),
+            "best": list(pool[new_best][1]),
+            "score": pool[new_best][0],
+        })
+        if new_best == best:
+            break
+        best = new_best
+
+    score, action, selected_scores = pool[best]
+    sel = SelectionResult(action=list(action), score=score, reason="max_score")
+    # DE normalizasyonu aday sayısına bağlı: uncertainty taban grid'in aday kümesinden (tam taramayla aynı)
+    conf, uncertainty, escalation = _assess_decision(ev.fs, selected_scores, ev.candidate_scores, ev.worst_H, cfg)
+    refined = CachedDecision(
+        x_t=x_t,
+        sel=sel,
+        fs=ev.fs,
+        selected_scores=selected_scores,
+        candidate_scores=ev.candidate_scores,
+        worst_H=ev.worst_H,
+        conf=conf,
+        uncertainty=uncertainty,
+        escalation=escalation,
+        steps=ev.steps,
+    )
+    return refined, search
+
+
+def moral_decision_engine(
+    raw_state: Dict[str, Any],
+    resolution: List[float] | None = None,
+    deterministic: bool = True,
+    config_override: Optional[Union[EngineConfig, Dict[str, Any], str]] = None,
+    context: Optional[Dict[str, Any]] = None,
+    trace_level: str = "full",
+    result_detail: str = "full",
+    cache: Optional[DecisionCache] = None,
+    drift_state: Optional[DriftState] = None,
+    action_search: str = "exhaustive",
+    stability: bool = False,
+    trace_format: str = TRACE_VERSION,
+) -> Dict[str, Any]:
+    """
+    Tek adımda etik karar: ham durum → seçilen aksiyon + tam trace + human_escalation.
+    Pipeline rastgelelik kullanmaz ve modül düzeyinde durum değiştirmez (global RNG'ye dokunmaz);
+    aynı girdi her zaman aynı çıktıyı verir, thread'lerden eşzamanlı çağrılabilir.
+    deterministic: API uyumluluğu için korunur; sonuç her iki değerde de aynıdır.
+    config_override: EngineConfig, dict (J_MIN, H_MAX, ...) veya profile adı (base, production_safe, high_critical).
+                     Profile adı ilk kullanımda doğrulanıp önbelleklenir; bilinmeyen ad ValueError.
+    context: opsiyonel; "cus_history" (List[float]) ile Phase 5 temporal drift kullanılır (in-place güncellenir).
+    trace_level: "full" (step 0–6), "summary" (step 0, 5, 6; hash + replay destekli) veya
+                 "none" (trace ve trace_hash üretilmez).
+    result_detail: "full" veya "minimal" (yalnızca action, escalation, human_escalation, reason).
+    cache: opsiyonel DecisionCache; step 1–5 ve confidence/uncertainty/escalation önbellekten gelir,
+           temporal drift + soft clamp her çağrıda çalışır. quantize'sız önbellekle çıktı (trace_hash dahil)
+           önbelleksiz çağrıyla birebir aynıdır.
+    drift_state: opsiyonel DriftState (DecisionSession); context yerine O(1) ring buffer temporal drift
+                 ve previous_escalation ile escalation hysteresis. context ile birlikte verilemez.
+    action_search: "exhaustive" (varsayılan; tüm grid skorlanır) veya "adaptive" (taban grid; yakın kararda
+                   en iyi adaylar çevresinde profile bütçesiyle (REFINE_*) yerel inceltme).
+                   Step 6'da "search" kaydı tutulur, replay bunu kullanır. "adaptive" cache ile birlikte verilemez.
+    stability: True ise eşik kararlılık aralıkları (core.stability.compute_stability) step 6'ya ve
+               sonuca "stability" olarak eklenir; yalnızca action_search="exhaustive" ile.
+    trace_format: "1.0" (varsayılan) veya "1.1" (grid-deduplicated, ami_engine.trace_codec);
+                  trace_hash her iki formatta aynıdır (v1.0 açılmış form üzerinden).
+    """
+    _check_output_options(trace_level, result_detail, trace_format)
+    if context is not None and drift_state is not None:
+        raise ValueError("context and drift_state are mutually exclusive")
+    if action_search not in ACTION_SEARCHES:
+        raise ValueError(f"action_search must be one of {ACTION_SEARCHES}, got {action_search!r}")
+    if action_search != "exhaustive" and cache is not None:
+        raise ValueError(f"cache is not supported with action_search={action_search!r}")
+    if stability and action_search != "exhaustive":
+        raise ValueError(f"stability is not supported with action_search={action_search!r}")
+
+    cfg = resolve_engine_config(config_override)
+
+    logger = TraceLogger(steps=TRACE_LEVEL_STEPS[trace_level])
+
+    if logger.wants(0):
+        logger.log(0, "raw_state", copy.deepcopy(raw_state))
+
+    x_t = encode_state(raw_state)
+    record_steps = any(logger.wants(step) for step in (1, 2, 3, 4))
+    search: Optional[Dict[str, Any]] = None
+
+    if action_search == "adaptive":
+        ev, search = _refine_state(x_t, get_action_plan(resolution), cfg, record_steps)
+        sel = ev.sel
+        steps = ev.steps
+    elif cache is None:
+        # Step 1–4 kararı etkilemez: full trace'te trace'e ilk erişimde üretilir
+        plan = get_action_plan(resolution)
+        ev = _evaluate_state(x_t, plan, cfg, False)
+        sel = ev.sel
+        steps = functools.partial(_state_steps, x_t, plan, cfg) if record_steps else None
+    else:
+        plan = get_action_plan(resolution)
+        x_t = cache.prepare_state(x_t)
+        key = cache.make_key(x_t, cfg.fingerprint, plan.resolution)
+        ev = cache.get(key, with_steps=record_steps)
+        if ev is None:
+            ev = _evaluate_state(x_t, plan, cfg, record_steps)
+            cache.put(key, ev)
+        # Önbellekteki nesneler çağırana (action, trace) paylaşılmaz
+        sel = SelectionResult(action=list(ev.sel.action), score=ev.sel.score, reason=ev.sel.reason)
+        steps = ev.steps if record_steps else None
+
+    return _decision_output(
+        logger, ev, sel, steps, cfg, context, drift_state,
+        get_action_plan(resolution) if cfg.soft_safe_restrict else None,
+        search, trace_level, result_detail, cache.quantize if cache is not None else None,
+        compute_stability(ev.x_t, get_action_plan(resolution), cfg) if stability else None,
+        trace_format,
+    )
+
+
+def _decision_output(
+    logger: TraceLogger,
+    ev: CachedDecision,
+    sel: Any,
+    steps: Union[CompactSteps, Callable[[], CompactSteps], None],
+    cfg: EngineConfig,
+    context: Optional[Dict[str, Any]],
+    drift_state: Optional[DriftState],
+    restrict_plan: Any,
+    search: Optional[Dict[str, Any]],
+    trace_level: str,
+    result_detail: str,
+    quantize: Any = None,
+    stability: Optional[Dict[str, List[float]]] = None,
+    trace_format: str = TRACE_VERSION,
+) -> Dict[str, Any]:
+    """
+    Değerlendirilmiş state → step 1–6 trace kaydı + _finalize_decision + motor çıktısı (tek karar).
+    steps: step 1–4 kaydı (CompactSteps) veya onu üreten fonksiyon (trace'e ilk erişimde çağrılır).
+    "trace" / "trace_hash" LazyEngineResult içinde ilk erişimde TraceSource'tan üretilir.
+    """
+    split = len(logger)
+
+    fs = ev.fs
+    logger.log(5, "fail_safe", {"override": fs.override, "human_escalation": fs.human_escalation})
+
+    decision = _finalize_decision(
+        ev.x_t, sel, fs, ev.selected_scores, ev.candidate_scores,
+        ev.conf, ev.uncertainty, ev.escalation, ev.worst_H, cfg, context, drift_state,
+        plan=restrict_plan,
+    )
+    if search is not None:
+        decision["selection_data"]["search"] = search
+    if stability is not None:
+        decision["selection_data"]["stability"] = stability
+
+    logger.log(6, "selection", decision["selection_data"])
+
+    traced = trace_level != "none"
+    if traced:
+        # Step 6 ile paylaşılan nesneler kopyalanır: çağıranın değişikliği geç üretilen trace/hash'e yansımaz
+        decision["final_action"] = list(decision["final_action"])
+        for key in ("temporal_drift", "self_regulation"):
+            if decision[key] is not None:
+                decision[key] = dict(decision[key])
+    if result_detail == "minimal":
+        out = {"action": decision["final_action"]}
+    else:
+        out = {"action": decision["final_action"], "raw_action": decision["raw_action"]}
+    if traced:
+        out["trace"] = None
+    out["human_escalation"] = decision["human_escalation"]
+    out["reason"] = decision["reason"]
+    if traced:
+        out["trace_hash"] = None
+    out = _result_fields(decision, out, result_detail)
+    if stability is not None and result_detail != "minimal":
+        out["stability"] = {key: list(interval) for key, interval in stability.items()}
+    source = TraceSource(
+        logger.trace, TRACE_VERSION, trace_level, quantize, split=split, steps=steps, trace_format=trace_format,
+    ) if traced else None
+    return LazyEngineResult(out, source)
+
+
+def moral_decision_engine_multi(
+    raw_state: Dict[str, Any],
+    profiles: Sequence[Union[EngineConfig, Dict[str, Any], str, None]],
+    resolution: List[float] | None = None,
+    trace_level: str = "full",
+    result_detail: str = "full",
+) -> List[Dict[str, Any]]:
+    """
+    Aynı state için birden çok profile (shadow değerlendirme) tek skorlama geçişiyle.
+    W/J/H/C yalnızca state ve aksiyona bağlıdır: state bir kez kodlanır, grid bir kez skorlanır ve
+    worst_J/worst_H bir kez hesaplanır; kısıt, fail-safe, confidence, uncertainty, escalation ve soft clamp
+    her profile için ayrı çalışır. Sonuçlar (trace_hash dahil) profile başına moral_decision_engine ile
+    birebir aynıdır, profiles sırasıyla döner. Temporal drift (context/drift_state) desteklenmez.
+    """
+    _check_output_options(trace_level, result_detail)
+    cfgs = [resolve_engine_config(profile) for profile in profiles]
+    x_t = encode_state(raw_state)
+    plan = get_action_plan(resolution)
+    scores = plan.score(x_t)
+    worst = plan.worst_case(x_t)
+    steps_wanted = TRACE_LEVEL_STEPS[trace_level]
+
+    results: List[Dict[str, Any]] = []
+    for cfg in cfgs:
+        logger = TraceLogger(steps=steps_wanted)
+        if logger.wants(0):
+            logger.log(0, "raw_state", copy.deepcopy(raw_state))
+        record_steps = any(logger.wants(step) for step in (1, 2, 3, 4))
+        ev = _evaluate_state(x_t, plan, cfg, False, scores=scores, worst=worst)
+        steps = functools.partial(_state_steps, x_t, plan, cfg, scores) if record_steps else None
+        results.append(_decision_output(
+            logger, ev, ev.sel, steps, cfg, None, None,
+            plan if cfg.soft_safe_restrict else None, None, trace_level, result_detail,
+        ))
+    return results
+
+
+def moral_decision_engine_batch(
+    raw_states: Sequence[Dict[str, Any]],
+    resolution: List[float] | None = None,
+    deterministic: bool = True,
+    config_override: Optional[Union[EngineConfig, Dict[str, Any], str]] = None,
+    context: Optional[Dict[str, Any]] = None,
+    result_detail: str = "full",
+    drift_state: Optional[DriftState] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Çok sayıda ham durum için vektörel karar (NumPy, N × A skor tensörü).
+    Skorlama, kısıt doğrulama, fail-safe ve seçim tek seferde dizi işlemleriyle yapılır;
+    confidence/uncertainty/escalation/soft clamp kuyruğu skaler yolla aynı kodu kullanır.
+    action, raw_action, escalation ve human_escalation skaler motorla bit-düzeyinde aynıdır.
+    Çıktıda trace ve trace_hash yoktur (denetim için tek karar moral_decision_engine ile üretilir).
+    context verilirse satırlar girdi sırasıyla işlenir (cus_history sıralı döngüyle birebir).
+    result_detail: "full" veya "minimal" (moral_decision_engine ile aynı anlamda).
+    drift_state: opsiyonel DriftState; satırlar sırayla bir DecisionSession akışı gibi işlenir. context ile birlikte verilemez.
+    """
+    _check_output_options("none", result_detail)
+    if context is not None and drift_state is not None:
+        raise ValueError("context and drift_state are mutually exclusive")
+
+    cfg = resolve_engine_config(config_override)
+    th = _constraint_thresholds(cfg)
+    if not raw_states:
+        return []
+
+    states, X = encode_states(raw_states)
+    plan = get_action_plan(resolution)
+    A = plan.actions
+    scores = score_batch(X, plan)
+    valid = validity_mask(scores, **th)
+    S = combined_scores(scores, DEFAULT_WEIGHTS)
+    best_idx, has_valid = select_indices(S, valid)
+    worst_J = scores.J.min(axis=1)
+    worst_H = scores.H.max(axis=1)
+
+    results: List[Dict[str, Any]] = []
+    for row, x_t in enumerate(states):
+        w_h = float(worst_H[row])
+        fs = fail_safe(
+            MoralScores(W=0, J=float(worst_J[row]), H=w_h, C=0), j_crit=cfg.j_critical, h_crit=cfg.h_critical,
+        )
+        candidate_scores = S[row][valid[row]].tolist()
+        if fs.override and fs.safe_action is not None:
+            sel = SelectionResult(action=fs.safe_action, score=None, reason="fail_safe")
+        elif not has_valid[row]:
+            fallback = fs.safe_action if fs.safe_action else [0.0, 0.5, 0.0, 1.0]
+            sel = SelectionResult(action=fallback, score=None, reason="no_valid_fallback")
+        else:
+            idx = int(best_idx[row])
+            sel = SelectionResult(action=list(A[idx]), score=float(S[row, idx]), reason="max_score")
+
+        if sel.reason in ("fail_safe", "no_valid_fallback") and fs.safe_action is not None:
+            selected_scores = evaluate_moral(x_t, fs.safe_action)
+        elif sel.reason == "max_score":
+            idx = int(best_idx[row])
+            selected_scores = MoralScores(
+                W=float(scores.W[row, idx]),
+                J=float(scores.J[row, idx]),
+                H=float(scores.H[row, idx]),
+                C=float(scores.C[row]),
+            )
+        else:
+            selected_scores = None
+
+        conf, uncertainty, escalation = _assess_decision(fs, selected_scores, candidate_scores, w_h, cfg)
+        decision = _finalize_decision(
+            x_t, sel, fs, selected_scores, candidate_scores, conf, uncertainty, escalation, w_h, cfg, context,
+            drift_state, plan=plan,
+        )
+        if result_detail == "minimal":
+            out = {"action": decision["final_action"]}
+        else:
+            out = {"action": decision["final_action"], "raw_action": decision["raw_action"]}
+        out["human_escalation"] = decision["human_escalation"]
+        out["reason"] = decision["reason"]
+        results.append(_result_fields(decision, out, result_detail))
+    return results
+
+
 def extract_raw_state(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any] | None:
     """Trace'ten replay girdisi olan raw_state'i çıkarır (step 0, event_type='raw_state')."""
     steps = _get_steps(trace)
@@ -325,28 +808,49 @@ def extract_fail_safe_data(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -
     return None
 
 
-def compute_trace_hash(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
-    """Trace'in deterministik SHA256 hash'i; sort_keys+separators ile regülasyon-grade."""
-    return hashlib.sha256(_trace_to_canonical(trace)).hexdigest()
-
-
 def replay(
     trace: Union[Dict[str, Any], List[Dict[str, Any]]],
     validate: bool = True,
     verify_hash: bool = False,
     validate_ethics: bool = False,
+    verify_steps: Union[bool, Iterable[int]] = False,
 ) -> Dict[str, Any]:
     """
     Kayıtlı trace'ten raw_state alıp motoru tekrar çalıştırır (deterministic=True ile).
+    Trace seviyesi (full/summary), DecisionCache quantize adımı, aksiyon arama yöntemi (step 6
+    "search": yöntem, resolution, adaptive için REFINE_* bütçesi), SOFT_SAFE_RESTRICT ve kararlılık
+    aralıkları (step 6 "stability") ve trace formatı (v1.0 / v1.1) korunur;
+    hash doğrulaması aynı seviyedeki trace ile yapılır.
     validate=True: yeni action == trace'teki action.
     verify_hash=True: yeni trace hash == orijinal trace hash.
+    verify_steps=True: step yaprak hash'leri (Merkle) tek tek karşılaştırılır, farklı pozisyonlar hatada listelenir;
+    step numaraları verilirse (ör. [6]) yalnızca bu event'ler serileştirilip karşılaştırılır.
     validate_ethics=True: yeni selection/fail_safe data (scores, override) == orijinal.
     """
     raw_state = extract_raw_state(trace)
     if raw_state is None:
         raise ValueError("Trace'te raw_state yok (step 0, event_type='raw_state' gerekli)")
 
-    result = moral_decision_engine(raw_state, deterministic=True)
+    quantize = trace.get("quantize") if isinstance(trace, dict) else None
+    cache = DecisionCache(maxsize=1, quantize=quantize) if quantize is not None else None
+    selection = extract_selection_data(trace) or {}
+    search = selection.get("search")
+    search_options: Dict[str, Any] = {}
+    override: Dict[str, Any] = {}
+    if search is not None:
+        search_options = {"action_search": search["method"], "resolution": search["resolution"]}
+        override.update(search.get("budget", {}))
+    if selection.get("soft_safe_restrict"):
+        override["SOFT_SAFE_RESTRICT"] = True
+    if override:
+        search_options["config_override"] = override
+    if "stability" in selection:
+        search_options["stability"] = True
+    if trace_version(trace) != TRACE_VERSION:
+        search_options["trace_format"] = trace_version(trace)
+    result = moral_decision_engine(
+        raw_state, deterministic=True, trace_level=_trace_level_of(trace), cache=cache, **search_options,
+    )
 
     if validate:
         orig_action = extract_action(trace)
@@ -356,8 +860,20 @@ def replay(
                 "Replay determinizm ihlali: yeni action trace'teki action ile aynı değil."
             )
 
+    orig_digests = None
+    if verify_steps is True:
+        # Tek geçiş: step yaprakları + trace_hash (verify_hash aynı özeti kullanır)
+        orig_digests = compute_trace_digests(trace)
+        differing = diff_trace_steps(orig_digests, result.digests())
+    elif verify_steps:
+        differing = diff_trace_steps(trace, result["trace"], steps=verify_steps)
+    if verify_steps:
+        assert not differing, (
+            f"Replay bütünlük ihlali: trace pozisyonları {differing} orijinalden farklı."
+        )
+
     if verify_hash:
-        orig_hash = compute_trace_hash(trace)
+        orig_hash = orig_digests.trace_hash if orig_digests is not None else compute_trace_hash(trace)
         new_hash = result.get("trace_hash") or compute_trace_hash(result["trace"])
         assert new_hash == orig_hash, (
             "Replay bütünlük ihlali: yeni trace hash'i orijinal ile aynı değil."
@@ -0,0 +1,449 @@
+"""
+AMI-ENGINE Parallel API - many independent decisions on a worker pool
+
+The engine keeps all state local to a call (no global RNG reseeding, no
+module-level mutation; shared caches are lock-protected), so independent
+decisions can run concurrently.
+
+Two executors are available:
+  - ``"process"`` (default): a ``ProcessPoolExecutor``; scales with cores on
+    GIL builds. Each worker resolves the config and compiles the action plan
+    once at start-up, then receives chunks of states.
+  - ``"thread"``: a ``ThreadPoolExecutor``; cheaper to start, can share a
+    ``DecisionCache``, scales with cores only on free-threaded builds.
+
+Failures never abort the batch: a state that raises, a chunk that times out
+or a worker process that dies yields an error entry
+(``{"error": message, "error_type": name}``) at that position instead.
+
+``decide_many_shared()`` uses the compact array transport
+(``ami_engine.transport``) instead of pickled dicts.
+"""
+
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ami_engine.engine import _check_output_options, moral_decision_engine
+from ami_engine.transport import (
+    RESULT_COLUMNS,
+    STATE_COLUMNS,
+    BatchResults,
+    SharedBatch,
+    SharedBatchSpec,
+    pack_states,
+    row_to_state,
+    write_error,
+    write_result,
+)
+from core.action_plan import get_action_plan
+from core.decision_cache import DecisionCache
+from core.engine_config import EngineConfig, resolve_engine_config
+
+EXECUTORS = ("process", "thread")
+
+# Process worker'ı başına ön-ısıtılmış ayarlar (_init_worker doldurur)
+_WORKER: Dict[str, Any] = {}
+
+
+def _default_workers() -> int:
+    return min(32, os.cpu_count() or 1)
+
+
+def _error_entry(exc: BaseException) -> Dict[str, Any]:
+    return {"error": str(exc) or type(exc).__name__, "error_type": type(exc).__name__}
+
+
+def _decide_chunk(
+    chunk: List[Dict[str, Any]],
+    cfg: EngineConfig,
+    resolution: Optional[List[float]],
+    trace_level: str,
+    result_detail: str,
+    cache: Optional[DecisionCache],
+) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for raw_state in chunk:
+        try:
+            out.append(moral_decision_engine(
+                raw_state,
+                resolution=resolution,
+                config_override=cfg,
+                trace_level=trace_level,
+                result_detail=result_detail,
+                cache=cache,
+            ))
+        except Exception as e:
+            out.append(_error_entry(e))
+    return out
+
+
+def _init_worker(
+    cfg: EngineConfig,
+    resolution: Optional[List[float]],
+    trace_level: str,
+    result_detail: str,
+) -> None:
+    # Config (pickle ile yeniden doğrulanmış) ve aksiyon tabloları worker başına bir kez
+    get_action_plan(resolution)
+    _WORKER.update(cfg=cfg, resolution=resolution, trace_level=trace_level, result_detail=result_detail)
+
+
+def _run_worker_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    w = _WORKER
+    return _decide_chunk(chunk, w["cfg"], w["resolution"], w["trace_level"], w["result_detail"], None)
+
+
+def _decide_rows(
+    states: np.ndarray,
+    results: np.ndarray,
+    rows: range,
+    cfg: EngineConfig,
+    resolution: Optional[List[float]],
+) -> List[Optional[Dict[str, Any]]]:
+    # Satırları yerinde yazar; yalnızca satır başına hata kaydı (çoğunlukla None) döner
+    errors: List[Optional[Dict[str, Any]]] = []
+    for i in rows:
+        try:
+            result = moral_decision_engine(
+                row_to_state(states[i]), resolution=resolution, config_override=cfg, trace_level="none",
+            )
+            write_result(results[i], result)
+            errors.append(None)
+        except Exception as e:
+            write_error(results[i])
+            errors.append(_error_entry(e))
+    return errors
+
+
+def _init_shared_worker(
+    cfg: EngineConfig,
+    resolution: Optional[List[float]],
+    spec: SharedBatchSpec,
+) -> None:
+    get_action_plan(resolution)
+    _WORKER.update(cfg=cfg, resolution=resolution, batch=SharedBatch.attach(spec))
+
+
+def _run_worker_rows(rows: range) -> List[Optional[Dict[str, Any]]]:
+    w = _WORKER
+    batch = w["batch"]
+    return _decide_rows(batch.states, batch.results, rows, w["cfg"], w["resolution"])
+
+
+def _worker_processes(pool: Executor) -> List[Any]:
+    # ProcessPoolExecutor, takılı bir worker'ı durdurmak için public API sunmaz (shutdown onu bekler ya da
+    # çalışır bırakır); süreç tablosu yalnızca özel _processes alanındadır. ThreadPoolExecutor'da yoktur.
+    processes = getattr(pool, "_processes", None)
+    return list(processes.values()) if processes else []
+
+
+def _terminate(pool: Executor, futures: Iterable[Future] = ()) -> None:
+    """
+    Havuzu bekleme olmadan kapatır; process worker'ları (takılı olanlar dahil) sonlandırılır.
+    futures: henüz başlamamışsa iptal edilecek işler (cancel_futures Python 3.9+; 3.8'de kuyruk bununla boşalır).
+    """
+    processes = _worker_processes(pool)
+    for future in futures:
+        future.cancel()
+    if sys.version_info >= (3, 9):
+        pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        pool.shutdown(wait=False)
+    for p in processes:
+        if p.is_alive():
+            p.terminate()
+
+
+def decide_many(
+    states: Iterable[Dict[str, Any]],
+    profile: Optional[Union[str, Dict[str, Any], EngineConfig]] = None,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: str = "process",
+    timeout: Optional[float] = None,
+    resolution: Optional[List[float]] = None,
+    trace_level: str = "full",
+    result_detail: str = "full",
+    cache: Optional[DecisionCache] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Decide many independent raw states on a worker pool.
+
+    Each successful result is identical to ``decide(state, profile, ...)`` for
+    the same state (same action, escalation, trace and trace_hash). States are
+    treated as independent: there is no shared ``context``; use a
+    ``DecisionSession`` per stream when temporal drift is needed.
+
+    Args:
+        states: Raw state dictionaries
+        profile: Profile name, override dict or ``EngineConfig`` (resolved once;
+                 unknown names raise ValueError before any work starts)
+        workers: Pool size (default: ``min(32, os.cpu_count())``); 1 runs inline
+        chunk_size: States per task (default: about four tasks per worker)
+        executor: ``"process"`` (default) or ``"thread"``
+        timeout: Seconds to wait for a chunk once it is next in input order;
+                 on expiry every state of the chunk gets a ``TimeoutError`` entry
+                 (process workers are restarted). None waits indefinitely.
+        resolution: Action grid resolution (default: ``ACTION_GRID_RESOLUTION``)
+        trace_level: As in ``decide()``
+        result_detail: As in ``decide()``
+        cache: Optional ``DecisionCache`` shared by all workers (``"thread"`` only)
+
+    Returns:
+        List of result dictionaries in input order; failed states are
+        ``{"error": message, "error_type": name}`` entries
+    """
+    return list(iter_decide_many(
+        states, profile,
+        workers=workers, chunk_size=chunk_size, executor=executor, timeout=timeout,
+        resolution=resolution, trace_level=trace_level, result_detail=result_detail, cache=cache,
+    ))
+
+
+def iter_decide_many(
+    states: Iterable[Dict[str, Any]],
+    profile: Optional[Union[str, Dict[str, Any], EngineConfig]] = None,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: str = "process",
+    timeout: Optional[float] = None,
+    resolution: Optional[List[float]] = None,
+    trace_level: str = "full",
+    result_detail: str = "full",
+    cache: Optional[DecisionCache] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming form of ``decide_many()``: yields results in input order as soon
+    as each chunk completes, keeping at most two chunks per worker in flight.
+
+    Arguments are validated eagerly (before the first ``next()``).
+    """
+    _check_output_options(trace_level, result_detail)
+    _check_pool_options(executor, workers, chunk_size, timeout)
+    if cache is not None and executor == "process":
+        raise ValueError("cache cannot be shared across processes; use executor='thread'")
+    cfg = resolve_engine_config(profile)
+    items = list(states)
+
+    n = workers or _default_workers()
+    if n == 1 or len(items) <= 1:
+        return iter(_decide_chunk(items, cfg, resolution, trace_level, result_detail, cache))
+
+    size = chunk_size or _default_chunk_size(len(items), n)
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    return _dispatch(
+        chunks, n, executor, timeout,
+        lambda chunk: _decide_chunk(chunk, cfg, resolution, trace_level, result_detail, cache),
+        _run_worker_chunk, _init_worker, (cfg, resolution, trace_level, result_detail),
+    )
+
+
+def decide_many_shared(
+    states: Union[Sequence[Dict[str, Any]], np.ndarray, SharedBatch],
+    profile: Optional[Union[str, Dict[str, Any], EngineConfig]] = None,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: str = "process",
+    timeout: Optional[float] = None,
+    resolution: Optional[List[float]] = None,
+) -> BatchResults:
+    """
+    Decide a batch through the compact array transport (``ami_engine.transport``).
+
+    States are packed into an (N, 9) float64 array and results written into an
+    (N, 14) array; with ``executor="process"`` both live in shared memory, so
+    workers read and write rows in place and only row ranges are pickled.
+    Decisions are identical to ``decide(state, profile)``; full traces are
+    produced on demand with ``BatchResults.trace(i)``.
+
+    Args:
+        states: Raw state dicts, an (N, 9) array in ``STATE_COLUMNS`` order, or a
+                ``SharedBatch`` whose ``states`` are already packed (results are
+                then written into ``batch.results`` and returned as views; release
+                them before closing the batch)
+        profile, workers, chunk_size, executor, timeout, resolution: As in ``decide_many()``
+
+    Returns:
+        ``BatchResults``; failed rows carry ``FLAG_ERROR`` and index to
+        ``{"error": message, "error_type": name}``
+    """
+    _check_pool_options(executor, workers, chunk_size, timeout)
+    cfg = resolve_engine_config(profile)
+    state_arr = result_arr = None
+    if isinstance(states, SharedBatch):
+        batch: Optional[SharedBatch] = states
+        owned = False
+    else:
+        packed = _as_state_array(states)
+        batch = SharedBatch(len(packed)) if executor == "process" and len(packed) > 1 else None
+        owned = batch is not None
+        if batch is not None:
+            batch.states[:] = packed
+    try:
+        if batch is not None:
+            state_arr, result_arr = batch.states, batch.results
+        else:
+            state_arr = packed
+            result_arr = np.empty((len(packed), len(RESULT_COLUMNS)), dtype=np.float64)
+        errors: Dict[int, Dict[str, Any]] = {}
+        n = workers or _default_workers()
+        rows = len(state_arr)
+        if n == 1 or rows <= 1:
+            entries: Iterable[Optional[Dict[str, Any]]] = _decide_rows(state_arr, result_arr, range(rows), cfg, resolution)
+        else:
+            size = chunk_size or _default_chunk_size(rows, n)
+            chunks = [range(i, min(i + size, rows)) for i in range(0, rows, size)]
+            entries = _dispatch(
+                chunks, n, executor, timeout,
+                lambda part: _decide_rows(state_arr, result_arr, part, cfg, resolution),
+                _run_worker_rows, _init_shared_worker, (cfg, resolution, batch.spec if batch is not None else None),
+            )
+        for i, entry in enumerate(entries):
+            if entry is not None:
+                write_error(result_arr[i])
+                errors[i] = entry
+        if owned:
+            state_arr, result_arr = state_arr.copy(), result_arr.copy()
+        return BatchResults(state_arr, result_arr, cfg, resolution, errors)
+    finally:
+        if owned:
+            state_arr = result_arr = None  # type: ignore[assignment]
+            batch.close()
+            batch.unlink()
+
+
+def _as_state_array(states: Union[Sequence[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+    if isinstance(states, np.ndarray):
+        if states.ndim != 2 or states.shape[1] != len(STATE_COLUMNS):
+            raise ValueError(f"state array must have shape (N, {len(STATE_COLUMNS)}), got {states.shape}")
+        return np.ascontiguousarray(states, dtype=np.float64)
+    return pack_states(list(states))
+
+
+def _check_pool_options(
+    executor: str,
+    workers: Optional[int],
+    chunk_size: Optional[int],
+    timeout: Optional[float],
+) -> None:
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers!r}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size!r}")
+    if timeout is not None and not timeout > 0:
+        raise ValueError(f"timeout must be positive or None, got {timeout!r}")
+
+
+def _default_chunk_size(items: int, workers: int) -> int:
+    # Worker başına yaklaşık dört görev: yük dengesi ile görev başı ek yük arasında denge
+    return max(1, math.ceil(items / (workers * 4)))
+
+
+def _dispatch(chunks, n, executor, timeout, local_task, worker_task, initializer, initargs) -> Iterator[Any]:
+    """Chunk'ları thread havuzunda local_task ile veya process havuzunda worker_task ile çalıştırır."""
+    n = min(n, len(chunks))
+    if executor == "thread":
+        def make_pool() -> Executor:
+            return ThreadPoolExecutor(max_workers=n)
+
+        def submit(pool: Executor, chunk: Any) -> Future:
+            return pool.submit(local_task, chunk)
+    else:
+        def make_pool() -> Executor:
+            return ProcessPoolExecutor(max_workers=n, initializer=initializer, initargs=initargs)
+
+        def submit(pool: Executor, chunk: Any) -> Future:
+            return pool.submit(worker_task, chunk)
+
+    return _stream(chunks, make_pool, submit, n * 2, timeout, restart=executor == "process")
+
+
+def _stream(chunks, make_pool, submit, max_in_flight, timeout, restart) -> Iterator[Dict[str, Any]]:
+    """
+    Chunk'ları sırayla dağıtır, sonuçları giriş sırasıyla verir.
+    Kırılan havuz (ölen worker) yeniden kurulur; baştaki chunk bir kez tek başına denenir,
+    yine kırarsa hata kaydı alır. Zaman aşımında process havuzu sonlandırılıp yeniden kurulur.
+    """
+    pool = make_pool()
+    pending: Deque[Tuple[List[Dict[str, Any]], Future]] = deque()
+    next_chunk = 0
+
+    def send(chunk: List[Dict[str, Any]]) -> Future:
+        # Havuz bu arada kırılmış olabilir: hata, chunk başa gelince BrokenExecutor dalında ele alınır
+        try:
+            return submit(pool, chunk)
+        except BrokenExecutor as e:
+            future: Future = Future()
+            future.set_exception(e)
+            return future
+
+    def fill() -> None:
+        nonlocal next_chunk
+        while next_chunk < len(chunks) and len(pending) < max_in_flight:
+            pending.append((chunks[next_chunk], send(chunks[next_chunk])))
+            next_chunk += 1
+
+    def rebuild(resubmit: bool = True) -> None:
+        # Baştaki hariç uçuştaki chunk'lar yeni havuza tekrar gönderilir
+        nonlocal pool
+        _terminate(pool, (future for _, future in pending))
+        pool = make_pool()
+        if resubmit:
+            for i in range(1, len(pending)):
+                pending[i] = (pending[i][0], send(pending[i][0]))
+
+    def failed(chunk: List[Dict[str, Any]], exc: BaseException) -> List[Dict[str, Any]]:
+        return [_error_entry(exc) for _ in chunk]
+
+    def expired(chunk: List[Dict[str, Any]]) -> TimeoutError:
+        return TimeoutError(f"chunk of {len(chunk)} states exceeded {timeout}s")
+
+    abandoned = False
+    try:
+        fill()
+        while pending:
+            chunk, future = pending[0]
+            try:
+                part = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                part = failed(chunk, expired(chunk))
+                if restart:
+                    rebuild()
+                else:
+                    future.cancel()
+                    abandoned = True
+            except BrokenExecutor:
+                # Suçlu chunk'ı ayırmak için baştaki chunk yeni havuzda tek başına denenir
+                rebuild(resubmit=False)
+                try:
+                    part = submit(pool, chunk).result(timeout=timeout)
+                except BrokenExecutor as e:
+                    part = failed(chunk, e)
+                    rebuild(resubmit=False)
+                except FutureTimeoutError:
+                    part = failed(chunk, expired(chunk))
+                    rebuild(resubmit=False)
+                for i in range(1, len(pending)):
+                    pending[i] = (pending[i][0], send(pending[i][0]))
+            except Exception as e:
+                part = failed(chunk, e)
+            pending.popleft()
+            fill()
+            yield from part
+    finally:
+        if pending or abandoned:
+            _terminate(pool, (future for _, future in pending))
+        else:
+            pool.shutdown(wait=True)
@@ -0,0 +1,333 @@
+# AMI-ENGINE — Motor çıktısı: trace ve trace_hash ilk erişimde üretilir.
+# Trace'i okumayan çağıranlar (karar alanlarına bakan servisler) trace dict'ini ve SHA256'yı hiç ödemez.
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ami_engine.trace_codec import decode_trace, encode_trace
+from ami_engine.trace_types import TRACE_VERSION_COMPACT
+from core.merkle import inclusion_proof, leaf_hash, merkle_root, verify_inclusion
+
+_LAZY_KEYS = ("trace", "trace_hash")
+
+# Regülasyon-grade: key order + whitespace yok + Unicode stabil (hash tutarlılığı).
+# json.dumps(sort_keys=True, separators=(",", ":"), ensure_ascii=False) ile aynı çıktı; encoder her çağrıda kurulmaz.
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _trace_to_canonical(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bytes:
+    return _CANONICAL(trace).encode("utf-8")
+
+
+def compute_trace_hash(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
+    """
+    Trace'in deterministik SHA256 hash'i; sort_keys+separators ile regülasyon-grade.
+    Hash her zaman v1.0 (açılmış) canonical form üzerindendir: v1.1 trace önce decode_trace ile açılır.
+    """
+    return hashlib.sha256(_trace_to_canonical(decode_trace(trace))).hexdigest()
+
+
+class TraceDigests(NamedTuple):
+    """
+    Trace'in tek geçişte hesaplanan özetleri (hex). trace_hash compute_trace_hash ile aynıdır;
+    header ("steps" dışındaki alanlar) ve her step event'i birer Merkle yaprağıdır: [header, *steps] -> root.
+    """
+
+    trace_hash: str
+    root: str
+    header: str
+    steps: Tuple[str, ...]
+
+
+def _split_trace(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    # v1.0 forma açılmış (header alanları, step event'leri); legacy list trace'in header'ı None
+    trace = decode_trace(trace)
+    if isinstance(trace, list):
+        return None, trace
+    return {k: v for k, v in trace.items() if k != "steps"}, trace["steps"]
+
+
+def _leaves(header: Optional[Dict[str, Any]], parts: Sequence[bytes]) -> List[bytes]:
+    # Yapraklar: header (legacy trace için {}) + step event'leri, canonical byte'lar üzerinden
+    return [leaf_hash(_trace_to_canonical(header or {}))] + [leaf_hash(p) for p in parts]
+
+
+def _leaf_hex(obj: Any) -> str:
+    return leaf_hash(_trace_to_canonical(obj)).hex()
+
+
+def compute_trace_digests(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> TraceDigests:
+    """
+    trace_hash + step başına yaprak hash'leri + Merkle kökü; her event bir kez serileştirilir.
+    Tam trace'in canonical JSON'u event'lerin canonical byte'larından birleştirilir (compute_trace_hash ile aynı SHA256).
+    """
+    header, events = _split_trace(trace)
+    parts = [_trace_to_canonical(e) for e in events]
+    body = b"[" + b",".join(parts) + b"]"
+    if header is None:
+        canonical = body
+    else:
+        fields = dict(header, steps=None)
+        canonical = b"{" + b",".join(
+            _trace_to_canonical(k) + b":" + (body if k == "steps" else _trace_to_canonical(fields[k]))
+            for k in sorted(fields)
+        ) + b"}"
+    leaves = _leaves(header, parts)
+    return TraceDigests(
+        trace_hash=hashlib.sha256(canonical).hexdigest(),
+        root=merkle_root(leaves).hex(),
+        header=leaves[0].hex(),
+        steps=tuple(leaf.hex() for leaf in leaves[1:]),
+    )
+
+
+def compute_trace_root(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
+    """Trace'in Merkle kökü (hex)."""
+    return compute_trace_digests(trace).root
+
+
+def compute_step_digests(
+    trace: Union[Dict[str, Any], List[Dict[str, Any]]],
+    steps: Optional[Iterable[int]] = None,
+) -> Dict[int, str]:
+    """
+    Trace pozisyonu -> yaprak hash'i; steps verilirse yalnızca bu step numaralı event'ler
+    serileştirilir (ör. steps=[6]: yalnızca selection).
+    """
+    _, events = _split_trace(trace)
+    wanted = frozenset(steps) if steps is not None else None
+    return {
+        i: _leaf_hex(e) for i, e in enumerate(events)
+        if wanted is None or e.get("step") in wanted
+    }
+
+
+def diff_trace_steps(
+    a: Union[Dict[str, Any], List[Dict[str, Any]], TraceDigests],
+    b: Union[Dict[str, Any], List[Dict[str, Any]], TraceDigests],
+    steps: Optional[Iterable[int]] = None,
+) -> List[int]:
+    """
+    Yaprak hash'i farklı olan trace pozisyonları (sıralı). TraceDigests verilirse tekrar serileştirilmez;
+    steps verilirse yalnızca bu step numaralı event'ler karşılaştırılır (pozisyon listesi trace'lerden gelir).
+    Uzunluk farkında fazla pozisyonlar da farklı sayılır.
+    """
+    def digests(t: Any) -> Dict[int, str]:
+        if isinstance(t, TraceDigests):
+            if steps is not None:
+                raise ValueError("diff_trace_steps(steps=...) requires traces, not TraceDigests")
+            return dict(enumerate(t.steps))
+        return compute_step_digests(t, steps)
+
+    da, db = digests(a), digests(b)
+    return sorted(i for i in da.keys() | db.keys() if da.get(i) != db.get(i))
+
+
+def trace_step_proof(trace: Union[Dict[str, Any], List[Dict[str, Any]]], position: int) -> Dict[str, Any]:
+    """
+    trace["steps"][position] için inclusion proof: {"position", "size", "proof", "root"} (hex).
+    verify_trace_step ile event, trace'in geri kalanı olmadan köke karşı doğrulanır.
+    """
+    header, events = _split_trace(trace)
+    if not 0 <= position < len(events):
+        raise IndexError(f"Trace step position {position} out of range for {len(events)} steps")
+    leaves = _leaves(header, [_trace_to_canonical(e) for e in events])
+    return {
+        "position": position,
+        "size": len(leaves),
+        "proof": [p.hex() for p in inclusion_proof(leaves, position + 1)],
+        "root": merkle_root(leaves).hex(),
+    }
+
+
+def verify_trace_step(event: Dict[str, Any], proof: Dict[str, Any], root: Optional[str] = None) -> bool:
+    """v1.0 step event'i proof'a (ve verilirse beklenen köke) karşı doğrular."""
+    root = root if root is not None else proof["root"]
+    return verify_inclusion(
+        leaf_hash(_trace_to_canonical(event)),
+        proof["position"] + 1,
+        proof["size"],
+        [bytes.fromhex(p) for p in proof["proof"]],
+        bytes.fromhex(root),
+    )
+
+
+class TraceSource:
+    """
+    Trace'in kompakt kaydı: TraceLogger event'leri + (full trace için) step 1–4'ün CompactSteps kaydı
+    ya da onu üreten fonksiyon. steps'in event'leri events[:split]'ten sonra yer alır.
+    """
+
+    __slots__ = ("events", "split", "steps", "version", "level", "quantize", "trace_format")
+
+    def __init__(
+        self,
+        events: Sequence[Any],
+        version: str,
+        level: str = "full",
+        quantize: Any = None,
+        split: int = 0,
+        steps: Any = None,
+        trace_format: Optional[str] = None,
+    ) -> None:
+        self.events = events
+        self.split = split
+        self.steps = steps
+        self.version = version
+        self.level = level
+        self.quantize = quantize
+        self.trace_format = trace_format
+
+    def build(self) -> Dict[str, Any]:
+        """Versioned trace dict (motorun eskiden eager ürettiğiyle aynı yapı ve anahtar sırası)."""
+        events = self.events
+        steps = [{"step": e.step, "event_type": e.event_type, "data": e.data} for e in events[:self.split]]
+        compact = self.steps() if callable(self.steps) else self.steps
+        if compact is not None:
+            steps.extend({"step": s, "event_type": t, "data": d} for s, t, d in compact.events())
+        steps.extend({"step": e.step, "event_type": e.event_type, "data": e.data} for e in events[self.split:])
+        trace: Dict[str, Any] = {"version": self.version, "steps": steps}
+        if self.level != "full":
+            trace["level"] = self.level
+        if self.quantize is not None:
+            trace["quantize"] = self.quantize
+        return trace
+
+
+class LazyEngineResult(dict):
+    """
+    moral_decision_engine çıktısı: trace_types.EngineResult sözleşmesindeki anahtarlar, aynı sırayla.
+    "trace" ve "trace_hash" ilk erişimde (okuma, iterasyon, items/values, ==, repr, kopya, pickle, JSON)
+    TraceSource'tan birlikte üretilir ve önbelleklenir; hash, çağıran trace'i değiştirmeden önceki
+    trace üzerinden hesaplanır. Üretilen değerler eager hesaplamayla birebir aynıdır.
+    digests() step yaprak hash'lerini ve Merkle kökünü (TraceDigests) aynı karar-anı trace'inden verir.
+    """
+
+    __slots__ = ("_source", "_digests")
+
+    def __init__(self, fields: Dict[str, Any], source: Optional[TraceSource] = None) -> None:
+        dict.__init__(self, fields)
+        self._source = source
+        self._digests: Optional[TraceDigests] = None
+
+    def _materialize(self, digests: bool = False) -> None:
+        source = self._source
+        if source is None:
+            return
+        trace = source.build()
+        if digests:
+            self._digests = compute_trace_digests(trace)
+            trace_hash = self._digests.trace_hash
+        else:
+            trace_hash = compute_trace_hash(trace)
+        if source.trace_format == TRACE_VERSION_COMPACT:
+            trace = encode_trace(trace)
+        dict.__setitem__(self, "trace", trace)
+        dict.__setitem__(self, "trace_hash", trace_hash)
+        self._source = None
+
+    def digests(self) -> TraceDigests:
+        """
+        trace'in TraceDigests'i (trace yoksa KeyError). Trace henüz üretilmediyse trace_hash ile aynı
+        geçişte hesaplanır ve önbelleklenir; trace zaten okunmuşsa o anki trace'ten hesaplanır.
+        """
+        if self._digests is not None:
+            return self._digests
+        if self._source is not None:
+            self._materialize(digests=True)
+            return self._digests  # type: ignore[return-value]
+        return compute_trace_digests(dict.__getitem__(self, "trace"))
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._source is not None and key in _LAZY_KEYS:
+            self._materialize()
+        return dict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if self._source is not None and key in _LAZY_KEYS:
+            self._materialize()
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if self._source is not None and key in _LAZY_KEYS:
+            self._materialize()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        if self._source is not None and key in _LAZY_KEYS:
+            self._materialize()
+        dict.__delitem__(self, key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if self._source is not None and key in _LAZY_KEYS:
+            self._materialize()
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if self._source is not None and key in _LAZY_KEYS:
+            self._materialize()
+        return dict.setdefault(self, key, default)
+
+    # Tüm değerleri okuyan / değiştiren işlemler önce materialize eder
+    def __iter__(self):
+        # dict(r), {**r}, dict.update(r) bu override nedeniyle keys() + __getitem__ yolunu kullanır
+        return dict.__iter__(self)
+
+    def items(self):
+        self._materialize()
+        return dict.items(self)
+
+    def values(self):
+        self._materialize()
+        return dict.values(self)
+
+    def popitem(self) -> Any:
+        self._materialize()
+        return dict.popitem(self)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._materialize()
+        dict.update(self, *args, **kwargs)
+
+    def clear(self) -> None:
+        self._source = None
+        self._digests = None
+        dict.clear(self)
+
+    def copy(self) -> Dict[str, Any]:
+        self._materialize()
+        return dict.copy(self)
+
+    def __eq__(self, other: Any) -> bool:
+        self._materialize()
+        if isinstance(other, LazyEngineResult):
+            other._materialize()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __or__(self, other: Any) -> Any:
+        self._materialize()
+        return dict.__or__(self, other)
+
+    def __ror__(self, other: Any) -> Any:
+        self._materialize()
+        return dict.__ror__(self, other)
+
+    def __ior__(self, other: Any) -> "LazyEngineResult":
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        self._materialize()
+        return dict.__repr__(self)
+
+    def __reduce__(self) -> Any:
+        # Process sınırını geçerken (parallel) trace materialize edilip düz alanlarla gönderilir
+        self._materialize()
+        return (LazyEngineResult, (dict(dict.items(self)),))
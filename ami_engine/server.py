@@ -0,0 +1,458 @@
+"""
+AMI-ENGINE Decision Server - one warm engine process behind HTTP/JSON
+
+``ami-engine serve`` runs a local decision service (TCP or Unix socket) so
+integrations do not each import the library and pay its cold start.
+
+Requests go through a ``MicroBatcher``:
+  - concurrent requests are collected into micro-batches (bounded by
+    ``max_batch`` and ``max_wait``) and decided in one vectorized pass per
+    (profile, session, output options) group; a session's requests are split
+    only into consecutive runs, so its steps keep their arrival order;
+  - identical in-flight stateless requests (same state, profile and output
+    options) are coalesced into a single computation (single-flight); session
+    requests are never coalesced, since each one advances the session;
+  - sessions keep their temporal state (CUS window, previous escalation)
+    server-side, exactly like a ``DecisionSession``.
+
+Endpoints:
+    POST   /decide          {"state": {...}, "profile"?, "session"?, "trace_level"?, "result_detail"?,
+                             "trace_format"?}
+    POST   /decide_batch    {"states": [...], ...same options...} -> {"results": [...]}
+    GET    /health, /stats
+    GET    /sessions/<id>   session snapshot
+    DELETE /sessions/<id>   forget a session
+"""
+
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ami_engine.engine import _check_output_options, moral_decision_engine, moral_decision_engine_batch
+from ami_engine.trace_codec import encode_trace
+from ami_engine.trace_types import TRACE_VERSION
+from core.action_plan import get_action_plan
+from core.engine_config import EngineConfig, resolve_engine_config
+from core.temporal_drift import DriftState
+
+DEFAULT_PORT = 8765
+
+_GroupKey = Tuple[str, Optional[str], str, str, int]
+
+
+class _Request:
+    __slots__ = ("key", "state", "config", "session", "trace_level", "result_detail", "future")
+
+    def __init__(self, key, state, config, session, trace_level, result_detail) -> None:
+        self.key = key
+        self.state = state
+        self.config = config
+        self.session = session
+        self.trace_level = trace_level
+        self.result_detail = result_detail
+        self.future: "Future[Dict[str, Any]]" = Future()
+
+
+class MicroBatcher:
+    """
+    Collects decision requests from many threads and decides them in micro-batches.
+
+    A single dispatcher thread owns evaluation, so requests of one session are
+    decided in arrival order. Results equal ``decide(state, profile,
+    trace_level=..., result_detail=...)``; session requests equal
+    ``DecisionSession(profile).decide(state)`` in arrival order.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch: int = 64,
+        max_wait: float = 0.002,
+        max_sessions: int = 10000,
+        resolution: Optional[List[float]] = None,
+    ) -> None:
+        """
+        Args:
+            max_batch: Largest micro-batch
+            max_wait: Seconds to wait for more requests after the first one arrives
+            max_sessions: Sessions kept server-side (least recently used are dropped)
+            resolution: Action grid resolution (default: ``ACTION_GRID_RESOLUTION``)
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch!r}")
+        if max_wait < 0:
+            raise ValueError(f"max_wait must be >= 0, got {max_wait!r}")
+        if max_sessions < 1:
+            raise ValueError(f"max_sessions must be >= 1, got {max_sessions!r}")
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_sessions = max_sessions
+        self.resolution = resolution
+        get_action_plan(resolution)  # aksiyon tabloları ilk istekten önce derlenir
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[Any, ...], Future] = {}
+        self._sessions: "OrderedDict[str, Tuple[EngineConfig, DriftState]]" = OrderedDict()
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._thread = threading.Thread(target=self._loop, name="ami-engine-batcher", daemon=True)
+        self._thread.start()
+
+    # --- submission ------------------------------------------------------
+
+    def submit(
+        self,
+        state: Dict[str, Any],
+        profile: Optional[Union[str, Dict[str, Any], EngineConfig]] = None,
+        session: Optional[str] = None,
+        trace_level: str = "none",
+        result_detail: str = "full",
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Queue one request; identical in-flight requests without a session share one Future.
+        Session requests always get their own Future (each is one step of the session).
+        """
+        _check_output_options(trace_level, result_detail)
+        if not isinstance(state, dict):
+            raise ValueError(f"state must be an object, got {type(state).__name__}")
+        if session is not None and not isinstance(session, str):
+            raise ValueError(f"session must be a string, got {type(session).__name__}")
+        cfg = resolve_engine_config(profile)
+        # Session sonucu sıraya bağlıdır (CUS penceresi her istekte ilerler): single-flight yalnızca session'sız
+        key = None if session is not None else (
+            json.dumps(state, sort_keys=True, separators=(",", ":")),
+            cfg.fingerprint, trace_level, result_detail,
+        )
+        with self._lock:
+            if session is not None:
+                # Session ilk istekte profile'a bağlanır
+                bound = self._sessions.get(session)
+                if bound is None:
+                    self._bind_session(session, cfg)
+                elif bound[0].fingerprint != cfg.fingerprint:
+                    raise ValueError(f"session {session!r} is bound to another profile")
+            self.requests += 1
+            existing = self._inflight.get(key) if key is not None else None
+            if existing is not None:
+                self.coalesced += 1
+                return existing
+            request = _Request(key, state, cfg, session, trace_level, result_detail)
+            if key is not None:
+                self._inflight[key] = request.future
+        self._queue.put(request)
+        return request.future
+
+    def decide(self, state: Dict[str, Any], timeout: Optional[float] = None, **options: Any) -> Dict[str, Any]:
+        """Blocking ``submit(...).result(timeout)``."""
+        return self.submit(state, **options).result(timeout)
+
+    # --- sessions / stats ------------------------------------------------
+
+    def session_snapshot(self, session: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            bound = self._sessions.get(session)
+            if bound is None:
+                return None
+            cfg, drift = bound
+            return {
+                "profile": cfg.name,
+                "fingerprint": cfg.fingerprint,
+                "cus_history": drift.history(),
+                "previous_escalation": drift.previous_escalation,
+            }
+
+    def drop_session(self, session: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "largest_batch": self.largest_batch,
+                "queued": self._queue.qsize(),
+                "inflight": len(self._inflight),
+                "sessions": len(self._sessions),
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the dispatcher after the queued requests are decided."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # --- dispatch --------------------------------------------------------
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run(batch)
+            if stop:
+                return
+
+    def _bind_session(self, session: str, cfg: EngineConfig) -> Tuple[EngineConfig, DriftState]:
+        bound = (cfg, DriftState(cfg.cus_mean_window))
+        self._sessions[session] = bound
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return bound
+
+    def _session_drift(self, session: str, cfg: EngineConfig) -> DriftState:
+        with self._lock:
+            bound = self._sessions.get(session)
+            if bound is None:
+                # Kuyruktayken silinmiş/taşmış session: boş durumla yeniden başlar
+                bound = self._bind_session(session, cfg)
+            else:
+                self._sessions.move_to_end(session)
+            return bound[1]
+
+    def _run(self, batch: List[_Request]) -> None:
+        with self._lock:
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+        # Aynı (config, session, çıktı seçenekleri) grubu tek vektörel geçişte; grup içi sıra geliş sırasıdır.
+        # Session'da seçenekler değişince yeni ardışık dizi açılır: adımlar yine geliş sırasıyla işlenir.
+        groups: "OrderedDict[_GroupKey, List[_Request]]" = OrderedDict()
+        runs: Dict[str, _GroupKey] = {}
+        for r in batch:
+            key = (r.config.fingerprint, r.session, r.trace_level, r.result_detail, 0)
+            if r.session is not None:
+                last = runs.get(r.session)
+                if last is not None:
+                    key = key[:4] + (last[4] + (last[:4] != key[:4]),)
+                runs[r.session] = key
+            groups.setdefault(key, []).append(r)
+        for requests in groups.values():
+            head = requests[0]
+            drift = self._session_drift(head.session, head.config) if head.session is not None else None
+            try:
+                results: List[Any] = self._decide(requests, drift)
+            except Exception:
+                results = []
+                for r in requests:
+                    try:
+                        results.append(self._decide([r], drift)[0])
+                    except Exception as e:
+                        results.append(e)
+            with self._lock:
+                for r in requests:
+                    self._inflight.pop(r.key, None)
+            for r, result in zip(requests, results):
+                if isinstance(result, BaseException):
+                    r.future.set_exception(result)
+                else:
+                    r.future.set_result(result)
+
+    def _decide(self, requests: List[_Request], drift: Optional[DriftState]) -> List[Dict[str, Any]]:
+        head = requests[0]
+        if head.trace_level == "none":
+            return moral_decision_engine_batch(
+                [r.state for r in requests],
+                resolution=self.resolution,
+                config_override=head.config,
+                result_detail=head.result_detail,
+                drift_state=drift,
+            )
+        return [
+            moral_decision_engine(
+                r.state,
+                resolution=self.resolution,
+                config_override=head.config,
+                trace_level=head.trace_level,
+                result_detail=head.result_detail,
+                drift_state=drift,
+            )
+            for r in requests
+        ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ami-engine"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def address_string(self) -> str:
+        # Unix socket istemcilerinin adresi yoktur
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        return payload
+
+    @staticmethod
+    def _options(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "profile": payload.get("profile"),
+            "session": payload.get("session"),
+            "trace_level": payload.get("trace_level", "none"),
+            "result_detail": payload.get("result_detail", "full"),
+        }
+
+    def do_GET(self) -> None:
+        batcher: MicroBatcher = self.server.batcher  # type: ignore[attr-defined]
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send(200, batcher.stats())
+        elif self.path.startswith("/sessions/"):
+            snapshot = batcher.session_snapshot(self.path[len("/sessions/"):])
+            if snapshot is None:
+                self._send(404, {"error": "unknown session"})
+            else:
+                self._send(200, snapshot)
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_DELETE(self) -> None:
+        batcher: MicroBatcher = self.server.batcher  # type: ignore[attr-defined]
+        if self.path.startswith("/sessions/") and batcher.drop_session(self.path[len("/sessions/"):]):
+            self._send(200, {"deleted": True})
+        else:
+            self._send(404, {"error": "unknown session"})
+
+    def do_POST(self) -> None:
+        batcher: MicroBatcher = self.server.batcher  # type: ignore[attr-defined]
+        if self.path not in ("/decide", "/decide_batch"):
+            self._send(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            payload = self._read_json()
+            options = self._options(payload)
+            trace_format = payload.get("trace_format", TRACE_VERSION)
+            # Profile ve çıktı seçenekleri tüm istek için bir kez doğrulanır (hatalıysa 400)
+            _check_output_options(options["trace_level"], options["result_detail"], trace_format)
+            resolve_engine_config(options["profile"])
+            if self.path == "/decide":
+                future = batcher.submit(payload.get("state"), **options)
+            else:
+                states = payload.get("states")
+                if not isinstance(states, list):
+                    raise ValueError("states must be a list")
+        except (ValueError, TypeError) as e:
+            self._send(400, _error(e))
+            return
+        if self.path == "/decide":
+            try:
+                self._send(200, _formatted(future.result(), trace_format))
+            except Exception as e:
+                self._send(500, _error(e))
+            return
+        futures: List[Any] = []
+        for state in states:
+            try:
+                futures.append(batcher.submit(state, **options))
+            except (ValueError, TypeError) as e:
+                futures.append(e)
+        results = []
+        for f in futures:
+            try:
+                if isinstance(f, Exception):
+                    raise f
+                results.append(_formatted(f.result(), trace_format))
+            except Exception as e:
+                results.append(_error(e))
+        self._send(200, {"results": results})
+
+
+def _formatted(result: Dict[str, Any], trace_format: str) -> Dict[str, Any]:
+    # Birleştirilen istekler aynı sonuç nesnesini paylaşır: kodlanmış trace kopyaya yazılır
+    if trace_format == TRACE_VERSION or "trace" not in result:
+        return result
+    return dict(result, trace=encode_trace(result["trace"]))
+
+
+def _error(exc: BaseException) -> Dict[str, Any]:
+    return {"error": str(exc), "error_type": type(exc).__name__}
+
+
+class DecisionHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a ``MicroBatcher``."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], batcher: MicroBatcher, verbose: bool = False) -> None:
+        self.batcher = batcher
+        self.verbose = verbose
+        super().__init__(address, _Handler)
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class DecisionUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Same service on a Unix domain socket."""
+
+        daemon_threads = True
+
+        def __init__(self, path: str, batcher: MicroBatcher, verbose: bool = False) -> None:
+            self.batcher = batcher
+            self.verbose = verbose
+            if os.path.exists(path):
+                os.unlink(path)
+            super().__init__(path, _Handler)
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[str] = None,
+    *,
+    batcher: Optional[MicroBatcher] = None,
+    verbose: bool = False,
+    **batcher_options: Any,
+) -> socketserver.BaseServer:
+    """
+    Build (but do not start) a decision server; call ``serve_forever()`` on it.
+
+    Args:
+        host, port: TCP address (port 0 picks a free port)
+        unix_socket: Serve on this Unix socket path instead of TCP
+        batcher: Existing ``MicroBatcher`` (default: a new one from ``batcher_options``)
+        verbose: Log each request to stderr
+    """
+    batcher = batcher or MicroBatcher(**batcher_options)
+    if unix_socket is not None:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise ValueError("Unix sockets are not supported on this platform")
+        return DecisionUnixServer(unix_socket, batcher, verbose)
+    return DecisionHTTPServer((host, port), batcher, verbose)
+
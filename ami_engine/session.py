@@ -0,0 +1,96 @@
+"""
+AMI-ENGINE Decision Sessions - stateful per-stream decisions
+
+A ``DecisionSession`` owns the temporal state of one decision stream: a
+fixed-size CUS ring buffer with a running sum (``core.temporal_drift.DriftState``)
+and the previous escalation level used for escalation hysteresis. It replaces
+passing ``context={"cus_history": [...]}`` around by hand.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ami_engine.engine import _check_output_options, moral_decision_engine
+from core.decision_cache import DecisionCache
+from core.engine_config import EngineConfig, resolve_engine_config
+from core.temporal_drift import DriftState
+
+
+class DecisionSession:
+    """
+    One live decision stream.
+
+    The config is resolved once at construction (unknown profile names raise
+    ``ValueError`` here, not on the first decision). Each ``decide()`` updates
+    the CUS window in O(1) and feeds the previous escalation level into
+    ``compute_escalation_level`` so downgrades follow the configured hysteresis.
+
+    Differences from the ``context`` dict path:
+      - escalation hysteresis is applied (``context`` never had a previous level);
+      - once the window is full, ``cus_mean`` comes from a running sum and may
+        differ from re-summing the list in the last ulp.
+
+    Example:
+        >>> from ami_engine import DecisionSession
+        >>> session = DecisionSession("scenario_test", trace_level="none")
+        >>> for state in stream:
+        ...     result = session.decide(state)
+    """
+
+    __slots__ = ("config", "drift", "resolution", "trace_level", "result_detail", "cache")
+
+    def __init__(
+        self,
+        profile: Optional[Union[str, Dict[str, Any], EngineConfig]] = None,
+        *,
+        resolution: Optional[List[float]] = None,
+        trace_level: str = "full",
+        result_detail: str = "full",
+        cache: Optional[DecisionCache] = None,
+        cus_history: Iterable[float] = (),
+        previous_escalation: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            profile: Profile name, override dict or ``EngineConfig`` (default: base thresholds)
+            resolution: Action grid resolution (default: ``ACTION_GRID_RESOLUTION``)
+            trace_level: As in ``decide()``
+            result_detail: As in ``decide()``
+            cache: Optional shared ``DecisionCache``
+            cus_history: Initial CUS values (e.g. restored from ``snapshot()``)
+            previous_escalation: Initial previous escalation level (0, 1, 2 or None)
+        """
+        _check_output_options(trace_level, result_detail)
+        self.config = resolve_engine_config(profile)
+        self.drift = DriftState(self.config.cus_mean_window, cus_history, previous_escalation)
+        self.resolution = resolution
+        self.trace_level = trace_level
+        self.result_detail = result_detail
+        self.cache = cache
+
+    @property
+    def previous_escalation(self) -> Optional[int]:
+        """Escalation level of the last decision (None before the first one)."""
+        return self.drift.previous_escalation
+
+    def decide(self, raw_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Decide for the next state of this stream (same result format as ``decide()``)."""
+        return moral_decision_engine(
+            raw_state,
+            resolution=self.resolution,
+            config_override=self.config,
+            trace_level=self.trace_level,
+            result_detail=self.result_detail,
+            cache=self.cache,
+            drift_state=self.drift,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable temporal state; pass back as ``cus_history`` / ``previous_escalation`` to restore."""
+        return {
+            "cus_history": self.drift.history(),
+            "previous_escalation": self.drift.previous_escalation,
+        }
+
+    def reset(self) -> None:
+        """Forget the CUS window and the previous escalation level."""
+        self.drift.reset()
@@ -0,0 +1,237 @@
+"""
+AMI-ENGINE Trace Codec - grid-deduplicated trace encoding (schema v1.1)
+
+A v1.0 full trace repeats the action grid in step 2 and every action vector
+again in each step 3 score entry and step 4 constraint event. Schema v1.1
+stores the static part once, content-addressed:
+
+  - step 2 ``actions_generated``: ``{"count", "grid", "resolution"}`` where
+    ``grid`` is the SHA256 of the canonical JSON action list (``grid_digest``)
+    and ``resolution`` rebuilds it with ``get_action_plan``
+  - step 3 ``moral_scores``: columns ``{"i"?, "W", "J", "H", "C"}``; ``i`` lists
+    grid indices and is omitted when every grid action is scored in order,
+    ``C`` is a scalar when equal for all actions (it only depends on the state)
+  - step 4: one ``constraints`` event ``{"violations", "flags"}`` with a
+    bitmask per step 3 entry (bit ``1 << k`` is the violation ``flags[k]``)
+
+Steps 0, 1, 5 and 6 are unchanged. ``GridRegistry`` maps digests to action
+grids; grids not in the registry are rebuilt from ``resolution`` and checked
+against the digest. ``trace_hash`` is always computed over the expanded v1.0
+canonical form, so a trace hashes the same in either encoding.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ami_engine.trace_types import TRACE_VERSION, TRACE_VERSION_COMPACT
+from core.action_plan import get_action_plan
+from core.trace_logger import VIOLATION_FLAGS
+
+
+Grid = Tuple[Tuple[float, ...], ...]
+
+_FLAG_NAMES = [name for _, name in VIOLATION_FLAGS]
+_FLAG_BITS = {name: bit for bit, name in VIOLATION_FLAGS}
+
+
+def grid_digest(actions: Sequence[Sequence[float]]) -> str:
+    """SHA256 of the canonical JSON action list (same rules as ``compute_trace_hash``)."""
+    payload = json.dumps([list(a) for a in actions], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GridRegistry:
+    """
+    Content-addressed store of action grids (digest -> actions), thread-safe.
+
+    ``resolve(digest, resolution)`` returns a registered grid or rebuilds it
+    from the resolution (the compiled action plan) and registers it when the
+    digest matches. ``save()`` / ``load()`` persist grids that cannot be
+    rebuilt from a resolution next to exported traces.
+    """
+
+    def __init__(self) -> None:
+        self._grids: Dict[str, Grid] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._grids)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._grids
+
+    def register(self, actions: Sequence[Sequence[float]]) -> str:
+        """Store a grid; returns its digest."""
+        grid = tuple(tuple(float(v) for v in a) for a in actions)
+        digest = grid_digest(grid)
+        with self._lock:
+            self._grids.setdefault(digest, grid)
+        return digest
+
+    def resolve(self, digest: str, resolution: Optional[Sequence[float]] = None) -> Grid:
+        """Grid for ``digest``; ValueError if unknown and not rebuildable from ``resolution``."""
+        grid = self._grids.get(digest)
+        if grid is not None:
+            return grid
+        if resolution is not None:
+            actions = get_action_plan(resolution).actions
+            if self.register(actions) == digest:
+                return actions
+        raise ValueError(f"Unknown action grid {digest!r}")
+
+    def to_dict(self) -> Dict[str, List[List[float]]]:
+        with self._lock:
+            return {digest: [list(a) for a in grid] for digest, grid in self._grids.items()}
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()) + "\n", encoding="utf-8")
+
+    def load(self, path: Union[str, Path]) -> int:
+        """Load saved grids (each checked against its digest); returns the number loaded."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        for digest, actions in data.items():
+            if self.register(actions) != digest:
+                raise ValueError(f"Action grid digest mismatch for {digest!r}")
+        return len(data)
+
+
+DEFAULT_GRID_REGISTRY = GridRegistry()
+
+
+def trace_version(trace: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
+    """Schema version of a trace (legacy list traces are v1.0)."""
+    if isinstance(trace, dict):
+        return trace.get("version", TRACE_VERSION)
+    return TRACE_VERSION
+
+
+def _grid_resolution(actions: Sequence[Sequence[float]]) -> Optional[List[float]]:
+    """Resolution that get_action_plan expands to exactly this grid (None if there is none)."""
+    n = len(actions) - 1
+    r = round(n ** 0.25) if n > 0 else 0
+    if r < 1 or r ** 4 != n:
+        return None
+    resolution = [actions[i * r ** 3][0] for i in range(r)]
+    if [list(a) for a in get_action_plan(resolution).actions] != [list(a) for a in actions]:
+        return None
+    return resolution
+
+
+def encode_trace(trace: Dict[str, Any], registry: Optional[GridRegistry] = None) -> Dict[str, Any]:
+    """
+    v1.0 trace -> v1.1 (summary traces and v1.1 input pass through with the new version).
+    The action grid is registered in ``registry`` (default: process-wide registry).
+    Raises ValueError if steps 2-4 are not in the engine's v1.0 layout.
+    """
+    if trace_version(trace) == TRACE_VERSION_COMPACT:
+        return trace
+    if not isinstance(trace, dict):
+        raise ValueError("encode_trace requires a versioned (dict) trace")
+    registry = registry or DEFAULT_GRID_REGISTRY
+    steps = trace["steps"]
+    generated = next((e for e in steps if e["step"] == 2), None)
+    out = dict(trace, version=TRACE_VERSION_COMPACT)
+    if generated is None:
+        return out
+
+    grid: Sequence[Sequence[float]] = generated["data"]["actions"]
+    resolution = _grid_resolution(grid)
+    step2: Dict[str, Any] = {"count": generated["data"]["count"]}
+    step2["grid"] = registry.register(grid)
+    if resolution is not None:
+        step2["resolution"] = list(resolution)
+
+    scores = [e["data"] for e in steps if e["step"] == 3]
+    entries = scores[0] if scores else []
+    constraints = [e["data"] for e in steps if e["step"] == 4]
+    if len(scores) > 1 or len(constraints) != len(entries):
+        raise ValueError("Steps 3-4 do not match the v1.0 engine layout")
+    columns: Dict[str, Any] = {}
+    if len(entries) != len(grid) or any(list(e["a"]) != list(a) for e, a in zip(entries, grid)):
+        # Grid'in alt kümesi veya farklı sıra: tekrarlanan aksiyonlarda ilk indeks
+        index = {tuple(a): k for k, a in reversed(list(enumerate(grid)))}
+        try:
+            columns["i"] = [index[tuple(e["a"])] for e in entries]
+        except KeyError as e:
+            raise ValueError(f"Action {list(e.args[0])} is not in the trace's grid") from None
+    for key in ("W", "J", "H"):
+        columns[key] = [e[key] for e in entries]
+    cs = [e["C"] for e in entries]
+    columns["C"] = cs[0] if cs and all(c == cs[0] for c in cs) else cs
+
+    masks = []
+    for entry, c in zip(entries, constraints):
+        if list(c["a"]) != list(entry["a"]):
+            raise ValueError("Step 4 constraint order differs from step 3")
+        try:
+            mask = sum(_FLAG_BITS[name] for name in c["violations"])
+        except KeyError as e:
+            raise ValueError(f"Unknown violation {e.args[0]!r}") from None
+        if [name for name in _FLAG_NAMES if mask & _FLAG_BITS[name]] != list(c["violations"]) or c["valid"] != (mask == 0):
+            raise ValueError("Step 4 constraint event is not representable in v1.1")
+        masks.append(mask)
+
+    encoded: List[Dict[str, Any]] = []
+    for event in steps:
+        step = event["step"]
+        if step == 2:
+            encoded.append({"step": 2, "event_type": event["event_type"], "data": step2})
+        elif step == 3:
+            encoded.append({"step": 3, "event_type": event["event_type"], "data": columns})
+        elif step == 4:
+            if masks is not None:
+                encoded.append({"step": 4, "event_type": "constraints", "data": {
+                    "violations": masks, "flags": list(_FLAG_NAMES),
+                }})
+                masks = None
+        else:
+            encoded.append(event)
+    out["steps"] = encoded
+    return out
+
+
+def decode_trace(trace: Union[Dict[str, Any], List[Dict[str, Any]]], registry: Optional[GridRegistry] = None) -> Any:
+    """v1.1 trace -> the equivalent v1.0 trace (v1.0 / legacy input is returned as is)."""
+    if trace_version(trace) != TRACE_VERSION_COMPACT:
+        return trace
+    registry = registry or DEFAULT_GRID_REGISTRY
+    steps = trace["steps"]
+    generated = next((e for e in steps if e["step"] == 2), None)
+    out = dict(trace, version=TRACE_VERSION)
+    if generated is None:
+        return out
+
+    data = generated["data"]
+    grid = registry.resolve(data["grid"], data.get("resolution"))
+    columns = next(e["data"] for e in steps if e["step"] == 3)
+    indices = columns.get("i", range(len(grid)))
+    actions = [list(grid[k]) for k in indices]
+    C = columns["C"]
+    cs = C if isinstance(C, list) else [C] * len(actions)
+
+    decoded: List[Dict[str, Any]] = []
+    for event in steps:
+        step = event["step"]
+        if step == 2:
+            step2 = {"count": data["count"], "actions": actions}
+            decoded.append({"step": 2, "event_type": event["event_type"], "data": step2})
+        elif step == 3:
+            decoded.append({"step": 3, "event_type": event["event_type"], "data": [
+                {"a": a, "W": w, "J": j, "H": h, "C": c}
+                for a, w, j, h, c in zip(actions, columns["W"], columns["J"], columns["H"], cs)
+            ]})
+        elif step == 4:
+            flags = [(1 << k, name) for k, name in enumerate(event["data"]["flags"])]
+            decoded.extend(
+                {"step": 4, "event_type": "constraint", "data": {
+                    "a": a, "valid": mask == 0, "violations": [name for bit, name in flags if mask & bit],
+                }}
+                for a, mask in zip(actions, event["data"]["violations"])
+            )
+        else:
+            decoded.append(event)
+    out["steps"] = decoded
+    return out
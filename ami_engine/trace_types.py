@@ -9,8 +9,42 @@ from typing import Any, Dict, List, Optional, TypedDict
 # Trace Schema Version
 TRACE_VERSION = "1.0"
 
+# Trace encodings (engine trace_format):
+# - "1.0": default schema, steps 2-4 list every action vector
+# - "1.1": grid-deduplicated (ami_engine.trace_codec); the action grid is referenced by
+#          content hash, steps 3-4 are columns. trace_hash is computed over the v1.0 form.
+TRACE_VERSION_COMPACT = "1.1"
+TRACE_FORMATS = (TRACE_VERSION, TRACE_VERSION_COMPACT)
+
+# Trace verbosity (engine trace_level):
+# - "full":    steps 0-6 (default, schema v1.0 as before)
+# - "summary": steps 0 (raw_state), 5 (fail_safe), 6 (selection); hashed and replayable
+# - "none":    no trace, no trace_hash
+TRACE_LEVELS = ("none", "summary", "full")
+
+# Pipeline steps kept at each trace level (None = all steps)
+TRACE_LEVEL_STEPS = {
+    "none": (),
+    "summary": (0, 5, 6),
+    "full": None,
+}
+
+# Result detail (engine result_detail):
+# - "full":    all result fields (default)
+# - "minimal": action, escalation, human_escalation, reason (+ trace/trace_hash if traced)
+RESULT_DETAILS = ("minimal", "full")
+
 # Required for backward compatibility
-__all__ = ["TRACE_VERSION", "DecisionTrace", "EngineResult"]
+__all__ = [
+    "TRACE_VERSION",
+    "TRACE_VERSION_COMPACT",
+    "TRACE_FORMATS",
+    "TRACE_LEVELS",
+    "TRACE_LEVEL_STEPS",
+    "RESULT_DETAILS",
+    "DecisionTrace",
+    "EngineResult",
+]
 
 
 class DecisionTrace(TypedDict, total=False):
@@ -0,0 +1,272 @@
+"""
+AMI-ENGINE Transport - compact array layout for batched decisions
+
+Batches sent to worker processes are dominated by pickling raw_state and
+result dicts. This module defines a fixed-width float64 layout instead:
+
+  - states:  (N, 9) rows in ``STATE_COLUMNS`` order (the encoded ``State``:
+    x_ext followed by x_moral, missing/invalid values already defaulted)
+  - results: (N, 14) rows in ``RESULT_COLUMNS`` order: action[4],
+    raw_action[4], level, flags, confidence, cus, J, H
+
+``SharedBatch`` places both arrays in ``multiprocessing.shared_memory`` so
+workers read states and write results in place; only the block names and
+row ranges cross the process boundary. ``BatchResults`` is the parent-side
+view: compact per-row dicts, column views and lazily produced full traces.
+"""
+
+import math
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.engine_config import EngineConfig
+from core.state_encoder import encode_state
+
+STATE_COLUMNS: Tuple[str, ...] = (
+    "physical", "social", "context", "risk",
+    "compassion", "justice", "harm_sens", "responsibility", "empathy",
+)
+RESULT_COLUMNS: Tuple[str, ...] = (
+    "action_0", "action_1", "action_2", "action_3",
+    "raw_action_0", "raw_action_1", "raw_action_2", "raw_action_3",
+    "level", "flags", "confidence", "cus", "J", "H",
+)
+
+ACTION = slice(0, 4)
+RAW_ACTION = slice(4, 8)
+LEVEL, FLAGS, CONFIDENCE, CUS, J, H = 8, 9, 10, 11, 12, 13
+
+# flags sütunu bit alanı (float64 içinde tam sayı olarak saklanır)
+FLAG_HUMAN_ESCALATION = 1
+FLAG_FAIL_SAFE = 2  # reason == "fail_safe"
+FLAG_NO_VALID_FALLBACK = 4  # reason == "no_valid_fallback"
+FLAG_SOFT_SAFE_APPLIED = 8
+FLAG_ERROR = 16
+
+
+def pack_states(
+    states: Sequence[Dict[str, Any]],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Encode raw state dicts into an (N, 9) float64 array.
+
+    Values go through ``encode_state`` (clamped, missing/invalid -> default),
+    so deciding from a packed row is identical to deciding from the raw dict.
+    """
+    n = len(states)
+    if out is None:
+        out = np.empty((n, len(STATE_COLUMNS)), dtype=np.float64)
+    elif out.shape != (n, len(STATE_COLUMNS)):
+        raise ValueError(f"out must have shape {(n, len(STATE_COLUMNS))}, got {out.shape}")
+    for i, raw_state in enumerate(states):
+        x = encode_state(raw_state)
+        out[i] = x.x_ext + x.x_moral
+    return out
+
+
+def row_to_state(row: np.ndarray) -> Dict[str, float]:
+    """Packed state row -> raw_state dict accepted by the engine."""
+    return dict(zip(STATE_COLUMNS, row.tolist()))
+
+
+def write_result(row: np.ndarray, result: Dict[str, Any]) -> None:
+    """Store an engine result (result_detail="full") into one result row."""
+    reason = result["reason"]
+    flags = FLAG_HUMAN_ESCALATION if result["human_escalation"] else 0
+    if reason == "fail_safe":
+        flags |= FLAG_FAIL_SAFE
+    elif reason == "no_valid_fallback":
+        flags |= FLAG_NO_VALID_FALLBACK
+    if result.get("soft_safe_applied"):
+        flags |= FLAG_SOFT_SAFE_APPLIED
+    uncertainty = result.get("uncertainty")
+    row[ACTION] = result["action"]
+    row[RAW_ACTION] = result["raw_action"]
+    row[LEVEL] = result["escalation"]
+    row[FLAGS] = flags
+    row[CONFIDENCE] = result.get("confidence", math.nan)
+    row[CUS] = uncertainty["cus"] if uncertainty is not None else math.nan
+    row[J] = result.get("J", math.nan)
+    row[H] = result.get("H", math.nan)
+
+
+def write_error(row: np.ndarray) -> None:
+    row[:] = math.nan
+    row[FLAGS] = FLAG_ERROR
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def read_result(row: np.ndarray) -> Dict[str, Any]:
+    """One result row -> compact result dict (``{"error": ...}`` rows excluded)."""
+    values = row.tolist()
+    flags = int(values[FLAGS])
+    if flags & FLAG_FAIL_SAFE:
+        reason = "fail_safe"
+    elif flags & FLAG_NO_VALID_FALLBACK:
+        reason = "no_valid_fallback"
+    else:
+        reason = "max_score"
+    return {
+        "action": values[ACTION],
+        "raw_action": values[RAW_ACTION],
+        "escalation": int(values[LEVEL]),
+        "human_escalation": bool(flags & FLAG_HUMAN_ESCALATION),
+        "reason": reason,
+        "soft_safe_applied": bool(flags & FLAG_SOFT_SAFE_APPLIED),
+        "confidence": _optional(values[CONFIDENCE]),
+        "cus": _optional(values[CUS]),
+        "J": _optional(values[J]),
+        "H": _optional(values[H]),
+    }
+
+
+SharedBatchSpec = Tuple[str, str, int]
+
+
+class SharedBatch:
+    """
+    State and result arrays in two ``multiprocessing.shared_memory`` blocks.
+
+    The creating process owns the blocks: use it as a context manager (or
+    call ``close()`` then ``unlink()``). Workers call ``SharedBatch.attach(spec)``
+    with the picklable ``spec`` and only ``close()``.
+
+    Example:
+        >>> with SharedBatch(len(states)) as batch:
+        ...     pack_states(states, out=batch.states)
+        ...     decide_many_shared(batch, "scenario_test", workers=8)
+        ...     actions = batch.results[:, ACTION].copy()
+    """
+
+    __slots__ = ("n", "owner", "_state_shm", "_result_shm", "states", "results")
+
+    def __init__(self, n: int, *, _spec: Optional[SharedBatchSpec] = None) -> None:
+        if isinstance(n, bool) or not isinstance(n, int) or n < 0:
+            raise ValueError(f"n must be a non-negative integer, got {n!r}")
+        self.n = n
+        self.owner = _spec is None
+        # shared_memory sıfır boyutlu blok kabul etmez; boş batch için 1 satırlık yer ayrılır
+        rows = max(n, 1)
+        if _spec is None:
+            self._state_shm = shared_memory.SharedMemory(create=True, size=rows * len(STATE_COLUMNS) * 8)
+            self._result_shm = shared_memory.SharedMemory(create=True, size=rows * len(RESULT_COLUMNS) * 8)
+        else:
+            self._state_shm = _attach(_spec[0])
+            self._result_shm = _attach(_spec[1])
+        self.states = np.ndarray((n, len(STATE_COLUMNS)), dtype=np.float64, buffer=self._state_shm.buf)
+        self.results = np.ndarray((n, len(RESULT_COLUMNS)), dtype=np.float64, buffer=self._result_shm.buf)
+
+    @classmethod
+    def attach(cls, spec: SharedBatchSpec) -> "SharedBatch":
+        """Open an existing batch (worker side) from ``spec``."""
+        return cls(spec[2], _spec=spec)
+
+    @property
+    def spec(self) -> SharedBatchSpec:
+        """Picklable handle: (state block name, result block name, rows)."""
+        return (self._state_shm.name, self._result_shm.name, self.n)
+
+    def close(self) -> None:
+        """
+        Release this process' mapping. Raises ``BufferError`` while other views
+        of the arrays (e.g. a ``BatchResults`` returned for this batch) are alive.
+        """
+        self.states = self.results = None  # type: ignore[assignment]
+        self._state_shm.close()
+        self._result_shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the blocks (owner only, after ``close()``)."""
+        self._state_shm.unlink()
+        self._result_shm.unlink()
+
+    def __enter__(self) -> "SharedBatch":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        try:
+            self.close()
+        finally:
+            if self.owner:
+                self.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Pool worker'ları sahibin resource tracker'ını paylaşır; attach'in tekrar kaydı etkisizdir,
+    # bloklar sahibin unlink() çağrısıyla silinir
+    return shared_memory.SharedMemory(name=name)
+
+
+class BatchResults(Sequence[Dict[str, Any]]):
+    """
+    Parent-side view of a decided batch.
+
+    Indexing returns compact result dicts (``read_result``) or, for failed
+    rows, ``{"error": message, "error_type": name}``. ``column()`` exposes the
+    raw arrays without conversion. ``trace(i)`` re-runs the engine on the
+    packed row and returns the full ``decide()`` result; its decision fields
+    equal the compact row and its ``raw_state`` step records the packed values.
+    """
+
+    def __init__(
+        self,
+        states: np.ndarray,
+        results: np.ndarray,
+        config: EngineConfig,
+        resolution: Optional[List[float]] = None,
+        errors: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> None:
+        self.states = states
+        self.results = results
+        self.config = config
+        self.resolution = resolution
+        self.errors: Dict[int, Dict[str, Any]] = errors or {}
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("BatchResults index out of range")
+        if int(self.results[i, FLAGS]) & FLAG_ERROR:
+            return dict(self.errors.get(i, {"error": "failed", "error_type": "Error"}))
+        return read_result(self.results[i])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name: str) -> np.ndarray:
+        """Array view of one result field: "action", "raw_action" or a ``RESULT_COLUMNS`` name."""
+        if name == "action":
+            return self.results[:, ACTION]
+        if name == "raw_action":
+            return self.results[:, RAW_ACTION]
+        if name in RESULT_COLUMNS:
+            return self.results[:, RESULT_COLUMNS.index(name)]
+        raise KeyError(name)
+
+    def trace(
+        self,
+        i: int,
+        trace_level: str = "full",
+    ) -> Dict[str, Any]:
+        """Full engine result (with trace and trace_hash) for row ``i``, computed on demand."""
+        from ami_engine.engine import moral_decision_engine
+
+        return moral_decision_engine(
+            row_to_state(self.states[i]),
+            resolution=self.resolution,
+            config_override=self.config,
+            trace_level=trace_level,
+        )
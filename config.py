@@ -54,10 +54,15 @@ __all__ = [
     "AS_SOFT_THRESHOLD",
     "DIVERGENCE_HARD_THRESHOLD",
     "ESCALATION_HYSTERESIS",
+    "SOFT_SAFE_RESTRICT",
     "SOFT_CLAMP_ALPHA",
     "SOFT_CLAMP_BETA",
     "SOFT_CLAMP_GAMMA",
     "DELTA_CUS_THRESHOLD",
     "CUS_MEAN_WINDOW",
     "CUS_MEAN_THRESHOLD",
+    "REFINE_AS_THRESHOLD",
+    "REFINE_DE_THRESHOLD",
+    "REFINE_MAX_LEVELS",
+    "REFINE_TOP_K",
 ]
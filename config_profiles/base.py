@@ -17,7 +17,12 @@ DEFAULT_CONFIG = {
     "AS_SOFT_THRESHOLD": _cfg.AS_SOFT_THRESHOLD,
     "DIVERGENCE_HARD_THRESHOLD": _cfg.DIVERGENCE_HARD_THRESHOLD,
     "ESCALATION_HYSTERESIS": _cfg.ESCALATION_HYSTERESIS,
+    "SOFT_SAFE_RESTRICT": _cfg.SOFT_SAFE_RESTRICT,
     "SOFT_CLAMP_ALPHA": getattr(_cfg, "SOFT_CLAMP_ALPHA", 0.60),
     "SOFT_CLAMP_BETA": getattr(_cfg, "SOFT_CLAMP_BETA", 0.50),
     "SOFT_CLAMP_GAMMA": getattr(_cfg, "SOFT_CLAMP_GAMMA", 0.35),
+    "REFINE_AS_THRESHOLD": _cfg.REFINE_AS_THRESHOLD,
+    "REFINE_DE_THRESHOLD": _cfg.REFINE_DE_THRESHOLD,
+    "REFINE_MAX_LEVELS": _cfg.REFINE_MAX_LEVELS,
+    "REFINE_TOP_K": _cfg.REFINE_TOP_K,
 }
@@ -16,4 +16,7 @@ CONFIG = {
     "DELAY_SOFT_MIN": 0.35,
     "AS_SOFT_THRESHOLD": 0.35,
     "DIVERGENCE_HARD_THRESHOLD": 0.52,
+    # Yakın kararlarda daha derin adaptive inceltme (action_search="adaptive")
+    "REFINE_MAX_LEVELS": 3,
+    "REFINE_TOP_K": 3,
 }
@@ -1,26 +1,32 @@
 # AMI-ENGINE — Action Generator (Phase 2 spec §1.2)
 # Verilen state için aday aksiyon kümesi üretir; kural tabanlı, deterministik.
 
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from config import ACTION_GRID_RESOLUTION
+from .action_plan import get_action_plan
 from .state_encoder import State
 
+if TYPE_CHECKING:
+    from .action_pruning import GridPruning
+
 
 def generate_actions(
     x_t: State,
     resolution: List[float] | None = None,
+    pruning: "GridPruning | None" = None,
 ) -> List[List[float]]:
     """
     Grid tabanlı aday aksiyon listesi. Her a = [severity, compassion, intervention, delay] ∈ [0,1]^4.
     'Hiçbir şey yapma' [0,0,0,1] her zaman dahil.
+    Grid resolution başına bir kez derlenir (core.action_plan); her çağrı taze liste kopyası alır.
+    pruning (core.action_pruning.load_pruning): yalnızca en az bir state'te geçerli olabilen aksiyonlar
+    (grid sırası); artifact'ın grid'i resolution ile aynı olmalı.
     """
-    grid = resolution or ACTION_GRID_RESOLUTION
-    A: List[List[float]] = []
-    for severity in grid:
-        for compassion in grid:
-            for intervention in grid:
-                for delay in grid:
-                    A.append([float(severity), float(compassion), float(intervention), float(delay)])
-    A.append([0.0, 0.0, 0.0, 1.0])
-    return A
+    plan = get_action_plan(resolution)
+    if pruning is None:
+        return plan.action_lists()
+    if pruning.resolution != plan.resolution:
+        raise ValueError(
+            f"pruning artifact is for resolution {list(pruning.resolution)}, not {list(plan.resolution)}"
+        )
+    return pruning.candidate_actions()
@@ -0,0 +1,269 @@
+# AMI-ENGINE — Derlenmiş aksiyon planı (Phase 2 spec §1.2–§1.3).
+# Grid (resolution tuple) başına bir kez: aksiyon listesi + state'ten bağımsız katsayı tabloları.
+
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from config import ACTION_GRID_RESOLUTION
+from .moral_evaluator import compute_compassion
+from .soft_override import restrict_action_space
+from .state_encoder import State
+
+# Her grid'e eklenen "hiçbir şey yapma" aksiyonu
+NO_OP_ACTION: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)
+
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+    a.setflags(write=False)
+    return a
+
+
+def _action_tables(m: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """(A, 4) aksiyon matrisinden aksiyona bağlı alt terimler (ActionPlan tabloları, aynı sırayla)."""
+    s, c, i, d = m[:, 0], m[:, 1], m[:, 2], m[:, 3]
+    return (
+        s.copy(),
+        i.copy(),
+        # W: harm_contribution'ın aksiyon kısmı ve 0.4 * intervention_benefit
+        0.4 * s + 0.3 * (1.0 - c),
+        0.4 * (0.5 * i * (1.0 - d)),
+        # J: min(compliance_severity, compliance_compassion)
+        np.minimum(1.0 - 0.5 * s, 0.5 + 0.5 * c),
+        # H: physical + psychological
+        0.5 * s * (1.0 - c) + 0.3 * (1.0 - c) * i,
+    )
+
+
+def _score_tables(
+    state: State,
+    severity: np.ndarray,
+    intervention: np.ndarray,
+    w_harm: np.ndarray,
+    w_benefit: np.ndarray,
+    j_action: np.ndarray,
+    h_action: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aksiyon tablolarına state terimleri evaluate_moral'daki işlem sırasıyla eklenir → (W, J, H)."""
+    social, context, risk = state.x_ext[1], state.x_ext[2], state.x_ext[3]
+    W = np.maximum(0.0, np.minimum(1.0, 1.0 - 0.6 * (w_harm + 0.3 * risk) + w_benefit))
+    if risk > 0.5:
+        compliance_context = 1.0 - 0.5 * np.maximum(0.0, context - intervention)
+        J = np.minimum(j_action, compliance_context)
+    else:
+        J = np.minimum(j_action, 1.0)
+    J = np.maximum(0.0, np.minimum(1.0, J))
+    H = np.maximum(0.0, np.minimum(1.0, h_action + 0.2 * social * severity))
+    return W, J, H
+
+
+class ActionPlan:
+    """
+    Bir resolution için derlenmiş aksiyon grid'i.
+    Tablolar moral_evaluator formüllerinin aksiyona bağlı alt terimleridir; state'e bağlı
+    terimler aynı işlem sırasıyla eklenir, sonuçlar evaluate_moral ile bit-düzeyinde aynıdır:
+      W = clip(1 - 0.6 * (w_harm + 0.3*risk) + w_benefit)
+      J = clip(min(j_action, compliance_context(context, intervention)))   (risk > 0.5)
+      H = clip(h_action + (0.2*social) * severity)
+    """
+
+    __slots__ = (
+        "resolution",
+        "actions",
+        "matrix",
+        "severity",
+        "intervention",
+        "w_harm",
+        "w_benefit",
+        "j_action",
+        "h_action",
+        "_h_envelope",
+        "_j_envelope",
+        "_j_floor",
+        "_feasible",
+        "_masks",
+    )
+
+    def __init__(self, resolution: Tuple[float, ...]) -> None:
+        self.resolution = resolution
+        actions: List[Tuple[float, ...]] = []
+        for severity in resolution:
+            for compassion in resolution:
+                for intervention in resolution:
+                    for delay in resolution:
+                        actions.append((severity, compassion, intervention, delay))
+        actions.append(NO_OP_ACTION)
+        self.actions: Tuple[Tuple[float, ...], ...] = tuple(actions)
+
+        m = np.array(actions, dtype=np.float64).reshape(-1, 4)
+        self.matrix = _readonly(m)
+        tables = _action_tables(m)
+        self.severity, self.intervention, self.w_harm, self.w_benefit, self.j_action, self.h_action = (
+            _readonly(t) for t in tables
+        )
+
+        # worst_case tabloları: aynı severity'li aksiyonlarda H'nin state terimi ortak → grup başına max h_action;
+        # aynı intervention'lı aksiyonlarda compliance_context ortak → grup başına min j_action
+        h_groups: dict = {}
+        j_groups: dict = {}
+        for sev, iv, h, j in zip(
+            self.severity.tolist(), self.intervention.tolist(), self.h_action.tolist(), self.j_action.tolist()
+        ):
+            h_groups[sev] = max(h_groups.get(sev, h), h)
+            j_groups[iv] = min(j_groups.get(iv, j), j)
+        self._h_envelope: Tuple[Tuple[float, float], ...] = tuple(h_groups.items())
+        self._j_envelope: Tuple[Tuple[float, float], ...] = tuple(j_groups.items())
+        self._j_floor = float(self.j_action.min())
+        self._feasible: dict = {}
+        self._masks: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def action_lists(self) -> List[List[float]]:
+        """generate_actions uyumlu taze list-of-lists (çağıran değiştirebilir)."""
+        return [list(a) for a in self.actions]
+
+    def score(self, state: State) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """Tek state için (W, J, H) dizileri (A,) ve state'e bağlı C."""
+        W, J, H = _score_tables(
+            state, self.severity, self.intervention, self.w_harm, self.w_benefit, self.j_action, self.h_action
+        )
+        return W, J, H, compute_compassion(state, NO_OP_ACTION)
+
+    def worst_case(self, state: State) -> Tuple[float, float]:
+        """
+        Skorlama yapmadan (min J, max H) — fail_safe'in ihtiyaç duyduğu en kötü durum.
+        H aksiyonda severity ile, J (risk > 0.5 iken) intervention ile parçalı doğrusal: her grup içinde
+        state terimi aynı float'tır ve toplama/min/clip monoton olduğundan grup uç değeri yeterlidir.
+        Sonuç score() dizilerinin J.min()/H.max() değeriyle bit-düzeyinde aynıdır; maliyet O(len(resolution)).
+        """
+        social, context, risk = state.x_ext[1], state.x_ext[2], state.x_ext[3]
+        k = 0.2 * social
+        h = max(h_max + k * severity for severity, h_max in self._h_envelope)
+        if risk > 0.5:
+            j = min(
+                min(j_min, 1.0 - 0.5 * max(0.0, context - intervention))
+                for intervention, j_min in self._j_envelope
+            )
+        else:
+            j = min(self._j_floor, 1.0)
+        return max(0.0, min(1.0, j)), max(0.0, min(1.0, h))
+
+    def state_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tüm state kutusu [0,1]^9 üzerinde aksiyon başına (J üst sınırı, H alt sınırı), (A,) dizileri.
+        compliance_context ≤ 1 (risk ≤ 0.5 iken tam 1) ve 0.2*social*severity ≥ 0 (social = 0 iken tam 0);
+        min/toplama/clip monoton olduğundan sınırlar kesin ve ulaşılabilirdir.
+        """
+        j_upper = np.maximum(0.0, np.minimum(1.0, np.minimum(self.j_action, 1.0)))
+        h_lower = np.maximum(0.0, np.minimum(1.0, self.h_action))
+        return j_upper, h_lower
+
+    def feasible_indices(self, j_min: float, h_max: float) -> Tuple[int, ...]:
+        """
+        En az bir state'te J >= j_min ve H <= h_max sağlayabilen aksiyonların indeksleri (grid sırası).
+        Dışarıda kalanlar hiçbir state'te geçerli aday olamaz; eşik çifti başına bir kez hesaplanır.
+        """
+        key = (j_min, h_max)
+        live = self._feasible.get(key)
+        if live is None:
+            j_upper, h_lower = self.state_bounds()
+            live = tuple(np.flatnonzero((j_upper >= j_min) & (h_lower <= h_max)).tolist())
+            self._feasible[key] = live
+        return live
+
+    def constraint_mask(
+        self,
+        j_min: float,
+        h_max: float,
+        c_min: float,
+        c_max: float,
+        severity_soft_max: float,
+        intervention_soft_max: float,
+        delay_soft_min: float,
+    ) -> "ConstraintMask":
+        """Profile eşikleri için derlenmiş kısıt maskesi (eşik kümesi başına bir kez)."""
+        key = (j_min, h_max, c_min, c_max, severity_soft_max, intervention_soft_max, delay_soft_min)
+        mask = self._masks.get(key)
+        if mask is None:
+            feasible = np.zeros(len(self.actions), dtype=bool)
+            feasible[list(self.feasible_indices(j_min, h_max))] = True
+            # Envelope kuralının tek kaynağı restrict_action_space (ikinci eleman: aksiyon indeksi)
+            kept = restrict_action_space(
+                [(list(a), k) for k, a in enumerate(self.actions)],
+                severity_soft_max, intervention_soft_max, delay_soft_min,
+            )
+            envelope = np.zeros(len(self.actions), dtype=bool)
+            envelope[[k for _, k in kept]] = True
+            mask = ConstraintMask(
+                j_min=j_min,
+                h_max=h_max,
+                c_min=c_min,
+                c_max=c_max,
+                feasible=_readonly(feasible),
+                envelope=_readonly(envelope),
+            )
+            self._masks[key] = mask
+        return mask
+
+    def score_matrix(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(N, 9) kodlanmış state matrisi için (W, J, H) tensörleri (N, A)."""
+        social = X[:, 1][:, None]
+        context = X[:, 2][:, None]
+        risk = X[:, 3][:, None]
+        W = np.maximum(0.0, np.minimum(1.0, 1.0 - 0.6 * (self.w_harm + 0.3 * risk) + self.w_benefit))
+        compliance_context = np.where(
+            risk > 0.5,
+            1.0 - 0.5 * np.maximum(0.0, context - self.intervention),
+            1.0,
+        )
+        J = np.maximum(0.0, np.minimum(1.0, np.minimum(self.j_action, compliance_context)))
+        H = np.maximum(0.0, np.minimum(1.0, self.h_action + 0.2 * social * self.severity))
+        return W, J, H
+
+
+class ConstraintMask:
+    """
+    validate_constraints'ın grid üzerinde derlenmiş hali.
+    Aksiyona bağlı kısım maskelerde: feasible (J/H eşiği en az bir state'te sağlanabilir, core.action_pruning)
+    ve envelope (restrict_action_space: severity ≤ max, intervention ≤ max, delay ≥ min). State'e bağlı kısım
+    J/H dizileri üzerinde vektörel karşılaştırma; C yalnızca state'e bağlı olduğundan tek skaler test.
+    Sonuç validate_constraints(...).valid ile aksiyon başına aynıdır.
+    """
+
+    __slots__ = ("j_min", "h_max", "c_min", "c_max", "feasible", "envelope")
+
+    def __init__(
+        self,
+        j_min: float,
+        h_max: float,
+        c_min: float,
+        c_max: float,
+        feasible: np.ndarray,
+        envelope: np.ndarray,
+    ) -> None:
+        self.j_min = j_min
+        self.h_max = h_max
+        self.c_min = c_min
+        self.c_max = c_max
+        self.feasible = feasible
+        self.envelope = envelope
+
+    def valid(self, J: np.ndarray, H: np.ndarray, C: float) -> np.ndarray:
+        """(A,) geçerlilik maskesi: feasible & (J >= j_min) & (H <= h_max), C bandı dışında hepsi False."""
+        if C < self.c_min or C > self.c_max:
+            return np.zeros(len(self.feasible), dtype=bool)
+        return self.feasible & (J >= self.j_min) & (H <= self.h_max)
+
+
+@lru_cache(maxsize=32)
+def _compile(resolution: Tuple[float, ...]) -> ActionPlan:
+    return ActionPlan(resolution)
+
+
+def get_action_plan(resolution: Sequence[float] | None = None) -> ActionPlan:
+    """Resolution tuple'ına göre process genelinde önbelleklenmiş ActionPlan."""
+    grid = resolution or ACTION_GRID_RESOLUTION
+    return _compile(tuple(float(v) for v in grid))
@@ -0,0 +1,186 @@
+# AMI-ENGINE — Offline aksiyon grid budama (Phase 2 spec §1.2–§1.6).
+# Bir grid + profile için tüm state kutusu [0,1]^9 üzerinde hiç geçerli olamayan (infeasible) ve hiç
+# seçilemeyen (dominated) aksiyonları kanıtlar; sürümlü aday kümesi + doğrulanabilir kanıt artifact'ı üretir.
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from config import DEFAULT_WEIGHTS, ScoringWeights
+from .action_plan import get_action_plan
+from .engine_config import EngineConfig, resolve_engine_config
+
+PRUNING_FORMAT = "ami-engine.action-pruning"
+PRUNING_VERSION = 1
+
+
+@dataclass(frozen=True)
+class GridPruning:
+    """
+    analyze_action_grid çıktısı.
+    live: en az bir state'te geçerli olabilen aksiyon indeksleri (grid sırası) — budanmış aday kümesi.
+    infeasible: hiçbir state'te geçerli olamayanlar; kanıt = J üst sınırı < J_MIN veya H alt sınırı > H_MAX.
+    dominated: geçerli olabilen ama hiç seçilemeyenler; kanıt = daha önce gelen, her state'te W/J ≥, H ≤,
+    C = olan aksiyon (by). Uncertainty tüm geçerli adayların skorunu kullandığından bunlar live'da kalır.
+    """
+    resolution: Tuple[float, ...]
+    profile: str
+    j_min: float
+    h_max: float
+    actions: Tuple[Tuple[float, ...], ...]
+    live: Tuple[int, ...]
+    infeasible: Tuple[Dict[str, Any], ...]
+    dominated: Tuple[Dict[str, Any], ...]
+
+    def candidate_actions(self) -> List[List[float]]:
+        """Budanmış aday kümesi (generate_actions uyumlu taze list-of-lists)."""
+        return [list(self.actions[k]) for k in self.live]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON artifact; digest içerik üzerinden (format/version/grid/eşikler/kanıtlar)."""
+        body = {
+            "format": PRUNING_FORMAT,
+            "version": PRUNING_VERSION,
+            "resolution": list(self.resolution),
+            "profile": self.profile,
+            "J_MIN": self.j_min,
+            "H_MAX": self.h_max,
+            "total": len(self.actions),
+            "live": list(self.live),
+            "infeasible": [dict(entry) for entry in self.infeasible],
+            "dominated": [dict(entry) for entry in self.dominated],
+        }
+        body["digest"] = _digest(body)
+        return body
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GridPruning":
+        """Artifact'ı yükler; format, sürüm ve digest uyuşmazsa ValueError."""
+        if data.get("format") != PRUNING_FORMAT:
+            raise ValueError(f"Not an action pruning artifact: format={data.get('format')!r}")
+        if data.get("version") != PRUNING_VERSION:
+            raise ValueError(f"Unsupported action pruning version {data.get('version')!r} (expected {PRUNING_VERSION})")
+        body = {k: v for k, v in data.items() if k != "digest"}
+        if data.get("digest") != _digest(body):
+            raise ValueError("Action pruning artifact digest mismatch")
+        resolution = tuple(float(v) for v in data["resolution"])
+        return cls(
+            resolution=resolution,
+            profile=data["profile"],
+            j_min=data["J_MIN"],
+            h_max=data["H_MAX"],
+            actions=get_action_plan(resolution).actions,
+            live=tuple(data["live"]),
+            infeasible=tuple(data["infeasible"]),
+            dominated=tuple(data["dominated"]),
+        )
+
+
+def _digest(body: Dict[str, Any]) -> str:
+    payload = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _dominator(actions: Sequence[Tuple[float, ...]], first: Dict[Tuple[float, ...], int], k: int, low: float) -> Optional[int]:
+    """
+    W, J, H aksiyonda monoton: severity ↓ → W ↑, J ↑, H ↓ (social ≥ 0); delay ↓ → W ↑ (J, H bağımsız).
+    (min severity, aynı compassion/intervention, min delay) aksiyonu her state'te en az o kadar iyi ve
+    grid'de daha önce gelir (severity en dış, delay en iç boyut); eşitlikte select_action onu seçer.
+    """
+    _, c, i, _ = actions[k]
+    j = first.get((low, c, i, low))
+    return j if j is not None and j < k else None
+
+
+def analyze_action_grid(
+    resolution: Optional[Sequence[float]] = None,
+    config: Union[str, Dict[str, Any], EngineConfig, None] = None,
+    weights: ScoringWeights = DEFAULT_WEIGHTS,
+) -> GridPruning:
+    """
+    Grid (+ no-op) ve profile için aksiyonları sınıflandırır. Karar değişmez: infeasible aksiyonlar hiçbir
+    state'te aday olamaz; dominated aksiyonlar aday olabilir ama argmax olamaz.
+    Dominance, ağırlıkların ≥ 0 olmasına dayanır (Score = α*W + β*J - γ*H + δ*C).
+    """
+    if min(weights.alpha, weights.beta, weights.gamma, weights.delta) < 0:
+        raise ValueError("analyze_action_grid requires non-negative scoring weights")
+    cfg = resolve_engine_config(config)
+    plan = get_action_plan(resolution)
+    grid = plan.resolution
+    if any(not 0.0 <= v <= 1.0 for v in grid):
+        raise ValueError(f"analyze_action_grid requires resolution values in [0, 1], got {list(grid)}")
+
+    j_upper, h_lower = plan.state_bounds()
+    live = plan.feasible_indices(cfg.j_min, cfg.h_max)
+    live_set = set(live)
+    infeasible = []
+    for k, action in enumerate(plan.actions):
+        if k in live_set:
+            continue
+        violations = []
+        if j_upper[k] < cfg.j_min:
+            violations.append("J_below_min")
+        if h_lower[k] > cfg.h_max:
+            violations.append("H_above_max")
+        infeasible.append({
+            "index": k,
+            "action": list(action),
+            "j_upper": float(j_upper[k]),
+            "h_lower": float(h_lower[k]),
+            "violations": violations,
+        })
+
+    first: Dict[Tuple[float, ...], int] = {}
+    for k, action in enumerate(plan.actions):
+        first.setdefault(action, k)
+    dominated = []
+    for k in live:
+        j = _dominator(plan.actions, first, k, min(grid))
+        if j is not None:
+            dominated.append({"index": k, "action": list(plan.actions[k]), "by": j})
+
+    return GridPruning(
+        resolution=grid,
+        profile=cfg.name,
+        j_min=cfg.j_min,
+        h_max=cfg.h_max,
+        actions=plan.actions,
+        live=live,
+        infeasible=tuple(infeasible),
+        dominated=tuple(dominated),
+    )
+
+
+def verify_pruning(pruning: GridPruning) -> None:
+    """
+    Kanıtları yeniden kontrol eder (AssertionError ile):
+    - her infeasible aksiyonun sınırı state kutusu sınırlarından yeniden hesaplanır ve eşiği ihlal eder;
+    - her dominated aksiyonun dominatörü daha önce gelir, yalnızca severity/delay'de ≤ farklıdır ve budanmamıştır;
+    - live ∪ infeasible grid'i tam ve ayrık olarak örter.
+    """
+    plan = get_action_plan(pruning.resolution)
+    assert plan.actions == pruning.actions, "grid mismatch"
+    j_upper, h_lower = plan.state_bounds()
+    infeasible = {entry["index"] for entry in pruning.infeasible}
+    assert not infeasible & set(pruning.live), "action both live and infeasible"
+    assert sorted(infeasible | set(pruning.live)) == list(range(len(plan))), "pruning does not cover the grid"
+    assert list(pruning.live) == sorted(pruning.live), "live actions out of grid order"
+    for entry in pruning.infeasible:
+        k = entry["index"]
+        assert entry["j_upper"] == float(j_upper[k]) and entry["h_lower"] == float(h_lower[k]), f"bound mismatch at {k}"
+        assert entry["j_upper"] < pruning.j_min or entry["h_lower"] > pruning.h_max, f"action {k} is feasible"
+    for entry in pruning.dominated:
+        k, j = entry["index"], entry["by"]
+        assert j < k and j in pruning.live, f"invalid dominator for {k}"
+        (s, c, i, d), (s2, c2, i2, d2) = plan.actions[k], plan.actions[j]
+        assert (c2, i2) == (c, i) and s2 <= s and d2 <= d, f"dominator of {k} is not a severity/delay reduction"
+
+
+def save_pruning(pruning: GridPruning, path: Union[str, Path]) -> None:
+    Path(path).write_text(json.dumps(pruning.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+def load_pruning(path: Union[str, Path]) -> GridPruning:
+    return GridPruning.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
@@ -0,0 +1,72 @@
+# AMI-ENGINE — Adaptive aksiyon araması (Phase 2 spec §1.2–§1.6): taban grid kutusunun skor üst sınırı
+# ve en iyi adaylar çevresinde yerel grid inceltmesi.
+
+from typing import List, Sequence, Tuple
+
+from config import ScoringWeights
+from .constraint_validator import validate_constraints
+from .moral_evaluator import compute_harm, compute_justice, compute_wellbeing, rescore_action
+from .state_encoder import State
+
+ACTION_SEARCHES: Tuple[str, ...] = ("exhaustive", "adaptive")
+
+
+def score_upper_bound(
+    state: State,
+    bounds: Tuple[float, float],
+    compassion: float,
+    weights: ScoringWeights,
+) -> float:
+    """
+    [lo, hi]^4 aksiyon kutusunda birleşik skorun üst sınırı, köşe aksiyonlardan:
+      W, J: severity ↓, compassion ↑, intervention ↑ (W ayrıca delay ↓); H: severity ↑, compassion ↓, intervention ↑.
+    Float işlemleri monoton olduğundan kutudaki (grid'de olsun olmasın) hiçbir aksiyonun skoru bunu geçemez.
+    """
+    lo, hi = bounds
+    best = [lo, hi, hi, lo]
+    return (
+        weights.alpha * compute_wellbeing(state, best)
+        + weights.beta * compute_justice(state, best)
+        - weights.gamma * compute_harm(state, [lo, hi, lo, lo])
+        + weights.delta * compassion
+    )
+
+
+def refine_grid(
+    state: State,
+    seeds: Sequence[Sequence[float]],
+    step: float,
+    seen: set,
+    bounds: Tuple[float, float],
+    compassion: float,
+    weights: ScoringWeights,
+    j_min: float,
+    h_max: float,
+    c_min: float,
+    c_max: float,
+) -> List[tuple]:
+    """
+    Adaptive refinement'ın bir seviyesi: her seed aksiyonun etrafında her boyutta {-step, 0, +step}
+    komşuları (3^4 yerel grid). bounds (taban grid'in min/max'ı) dışındaki noktalar atlanır; böylece grid
+    köşeleri uç noktalar olarak kalır ve worst_J/worst_H değişmez. seen'de olmayanlar skorlanır ve seen'e eklenir.
+    Sıra deterministiktir (seed sırası, sonra komşu sırası). Döndürür: (aksiyon, MoralScores, valid, skor | None).
+    """
+    offsets = (-step, 0.0, step)
+    lo, hi = bounds
+    out: List[tuple] = []
+    a, b, g, d = weights.alpha, weights.beta, weights.gamma, weights.delta
+    for seed in seeds:
+        for ds in offsets:
+            for dc in offsets:
+                for di in offsets:
+                    for dd in offsets:
+                        action = [seed[0] + ds, seed[1] + dc, seed[2] + di, seed[3] + dd]
+                        key = tuple(action)
+                        if key in seen or any(not lo <= v <= hi for v in action):
+                            continue
+                        seen.add(key)
+                        scores = rescore_action(state, action, compassion=compassion)
+                        cv = validate_constraints(scores, j_min=j_min, h_max=h_max, c_min=c_min, c_max=c_max)
+                        score = a * scores.W + b * scores.J - g * scores.H + d * scores.C if cv.valid else None
+                        out.append((action, scores, cv.valid, score))
+    return out
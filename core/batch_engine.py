@@ -0,0 +1,94 @@
+# AMI-ENGINE — Vektörel batch değerlendirme (Phase 2 spec §1.1–§1.6, NumPy).
+# N state × A aksiyon skor tensörü; aritmetik sırası skaler modüllerle birebir (bit-uyumlu).
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from config import COMPASSION_ALPHA, COMPASSION_BETA, COMPASSION_GAMMA, ScoringWeights
+from .action_plan import ActionPlan
+from .moral_evaluator import _sigmoid
+from .state_encoder import State, encode_state
+
+# Kodlanmış state matrisi sütunları: x_ext (4) + x_moral (5)
+STATE_WIDTH = 9
+_COL_PHYSICAL = 0
+_COL_RESPONSIBILITY = 7
+_COL_EMPATHY = 8
+
+
+@dataclass
+class BatchScores:
+    """N × A skor tensörü; C yalnızca state'e bağlı olduğu için (N,)."""
+    W: np.ndarray
+    J: np.ndarray
+    H: np.ndarray
+    C: np.ndarray
+
+
+def encode_states(raw_states: Sequence[Dict[str, Any]]) -> Tuple[List[State], np.ndarray]:
+    """Ham state listesini encode_state ile kodlar; (State listesi, (N, 9) float64 matris) döndürür."""
+    states = [encode_state(raw) for raw in raw_states]
+    X = np.empty((len(states), STATE_WIDTH), dtype=np.float64)
+    for row, s in enumerate(states):
+        X[row, :4] = s.x_ext
+        X[row, 4:] = s.x_moral
+    return states, X
+
+
+def state_from_row(row: np.ndarray) -> State:
+    """(9,) satırdan State üretir (değerler zaten [0,1] clamp edilmiş kabul edilir)."""
+    values = [float(v) for v in row]
+    return State(x_ext=tuple(values[:4]), x_moral=tuple(values[4:]))
+
+
+def score_batch(X: np.ndarray, plan: ActionPlan) -> BatchScores:
+    """
+    moral_evaluator formüllerinin tensör karşılığı (ActionPlan katsayı tabloları üzerinden).
+    İşlem sırası skaler koddakiyle aynıdır; float64 sonuçlar evaluate_moral ile bit-düzeyinde eşleşir.
+    """
+    W, J, H = plan.score_matrix(X)
+
+    # C (compute_compassion) — state'e bağlı; sigmoid skaler math.exp ile (bit-uyum)
+    vulnerability = 1.0 - X[:, _COL_PHYSICAL]
+    raw = (
+        COMPASSION_ALPHA * X[:, _COL_EMPATHY]
+        + COMPASSION_BETA * vulnerability
+        - COMPASSION_GAMMA * X[:, _COL_RESPONSIBILITY]
+    )
+    C = np.array([_sigmoid(2.0 * (float(r) - 0.5)) for r in raw], dtype=np.float64)
+
+    return BatchScores(W=W, J=J, H=H, C=C)
+
+
+def validity_mask(
+    scores: BatchScores,
+    j_min: float,
+    h_max: float,
+    c_min: float,
+    c_max: float,
+) -> np.ndarray:
+    """validate_constraints'in tensör karşılığı: (N, A) bool, True = tüm kısıtlar sağlanıyor."""
+    c = scores.C[:, None]
+    c_ok = ~((c < c_min) | (c > c_max))
+    return ~(scores.J < j_min) & ~(scores.H > h_max) & c_ok
+
+
+def combined_scores(scores: BatchScores, weights: ScoringWeights) -> np.ndarray:
+    """Score = α*W + β*J − γ*H + δ*C, (N, A)."""
+    return (
+        weights.alpha * scores.W
+        + weights.beta * scores.J
+        - weights.gamma * scores.H
+        + weights.delta * scores.C[:, None]
+    )
+
+
+def select_indices(S: np.ndarray, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Geçerli adaylar arasında argmax (eşitlikte ilk indeks, select_action'daki max() ile aynı).
+    Returns: (seçilen indeks (N,), en az bir geçerli aday var mı (N,)).
+    """
+    masked = np.where(valid, S, -np.inf)
+    return np.argmax(masked, axis=1), valid.any(axis=1)
@@ -0,0 +1,222 @@
+# AMI-ENGINE — Karar memoization önbelleği (LRU + TTL).
+# Anahtar: kodlanmış State (opsiyonel quantize) + EngineConfig fingerprint + grid resolution.
+# Değer: context'ten bağımsız değerlendirme (step 1–5 + confidence/uncertainty/escalation);
+# temporal drift ve soft clamp her çağrıda yeniden çalışır (cus_history semantiği birebir).
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .action_selector import SelectionResult
+from .confidence import ConfidenceResult
+from .fail_safe import FailSafeResult
+from .moral_evaluator import MoralScores
+from .state_encoder import State
+from .trace_logger import CompactSteps
+from .uncertainty import UncertaintyResult
+
+# Kalıcı dosya formatı; skor formülleri veya kayıt yapısı değişirse artırılır (eski dosyalar reddedilir)
+# 2: step 1–4 kolon formunda (CompactSteps)
+CACHE_FORMAT_VERSION = 2
+
+CacheKey = Tuple[Tuple[float, ...], str, Tuple[float, ...]]
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    """
+    Bir kodlanmış state için context'ten bağımsız pipeline çıktısı.
+    steps: step 1–4 kaydı (CompactSteps, salt okunur); yalnızca full trace ile üretilmişse dolu.
+    """
+
+    x_t: State
+    sel: SelectionResult
+    fs: FailSafeResult
+    selected_scores: Optional[MoralScores]
+    candidate_scores: List[float]
+    worst_H: float
+    conf: Optional[ConfidenceResult]
+    uncertainty: Optional[UncertaintyResult]
+    escalation: int
+    steps: Optional[CompactSteps] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "x_t": {"x_ext": list(self.x_t.x_ext), "x_moral": list(self.x_t.x_moral)},
+            "sel": asdict(self.sel),
+            "fs": asdict(self.fs),
+            "selected_scores": asdict(self.selected_scores) if self.selected_scores is not None else None,
+            "candidate_scores": list(self.candidate_scores),
+            "worst_H": self.worst_H,
+            "conf": asdict(self.conf) if self.conf is not None else None,
+            "uncertainty": self.uncertainty.to_dict() if self.uncertainty is not None else None,
+            "escalation": self.escalation,
+            "steps": self.steps.to_dict() if self.steps is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "CachedDecision":
+        return cls(
+            x_t=State(x_ext=tuple(d["x_t"]["x_ext"]), x_moral=tuple(d["x_t"]["x_moral"])),
+            sel=SelectionResult(**d["sel"]),
+            fs=FailSafeResult(**d["fs"]),
+            selected_scores=MoralScores(**d["selected_scores"]) if d["selected_scores"] is not None else None,
+            candidate_scores=list(d["candidate_scores"]),
+            worst_H=d["worst_H"],
+            conf=ConfidenceResult(**d["conf"]) if d["conf"] is not None else None,
+            uncertainty=UncertaintyResult(**d["uncertainty"]) if d["uncertainty"] is not None else None,
+            escalation=d["escalation"],
+            steps=CompactSteps.from_dict(d["steps"]) if d["steps"] is not None else None,
+        )
+
+
+class DecisionCache:
+    """
+    Opt-in LRU/TTL karar önbelleği (moral_decision_engine(cache=...)).
+    quantize: verilirse state değerleri bu adıma yuvarlanır ve karar yuvarlanmış state için verilir
+              (sonuç önbellek içeriğinden ve geliş sırasından bağımsızdır; trace'e "quantize" yazılır).
+    ttl: saniye; None → süresiz. clock: zaman kaynağı (persist edilen kayıtlar için duvar saati).
+    Thread-safe: tüm okuma/yazmalar tek kilit altında; kayıtlar değiştirilmediği için paylaşılabilir.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        quantize: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer, got {maxsize!r}")
+        if ttl is not None and not ttl > 0:
+            raise ValueError(f"ttl must be positive or None, got {ttl!r}")
+        if quantize is not None and not 0 < quantize <= 1:
+            raise ValueError(f"quantize must be in (0, 1] or None, got {quantize!r}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.quantize = quantize
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, CachedDecision]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def prepare_state(self, state: State) -> State:
+        """quantize ayarlıysa state'i ızgaraya yuvarlar ([0, 1] içinde kalır)."""
+        q = self.quantize
+        if q is None:
+            return state
+        return State(
+            x_ext=tuple(min(1.0, max(0.0, round(v / q) * q)) for v in state.x_ext),
+            x_moral=tuple(min(1.0, max(0.0, round(v / q) * q)) for v in state.x_moral),
+        )
+
+    @staticmethod
+    def make_key(state: State, fingerprint: str, resolution: Tuple[float, ...]) -> CacheKey:
+        return (tuple(state.x_ext) + tuple(state.x_moral), fingerprint, tuple(resolution))
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and self._clock() - stored_at > self.ttl
+
+    def get(self, key: CacheKey, with_steps: bool = False) -> Optional[CachedDecision]:
+        """Kayıt varsa (ve süresi dolmamışsa) döndürür; with_steps=True iken step 1–4'süz kayıt miss sayılır."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, decision = item
+            if self._expired(stored_at):
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if with_steps and decision.steps is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decision
+
+    def put(self, key: CacheKey, decision: CachedDecision) -> None:
+        with self._lock:
+            self._store(key, self._clock(), decision)
+
+    def _store(self, key: CacheKey, stored_at: float, decision: CachedDecision) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (stored_at, decision)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path: Union[str, Path]) -> int:
+        """Kayıtları LRU sırasıyla JSON'a yazar (atomik replace). Yazılan kayıt sayısını döndürür."""
+        with self._lock:
+            items = list(self._entries.items())
+        entries = []
+        for (state, fingerprint, resolution), (stored_at, decision) in items:
+            if self._expired(stored_at):
+                continue
+            entries.append({
+                "state": list(state),
+                "fingerprint": fingerprint,
+                "resolution": list(resolution),
+                "stored_at": stored_at,
+                "decision": decision.to_dict(),
+            })
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return len(entries)
+
+    def load(self, path: Union[str, Path]) -> int:
+        """save() çıktısını yükler (süresi dolanlar atlanır). Yüklenen kayıt sayısını döndürür."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != CACHE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported decision cache format {data.get('format')!r} (expected {CACHE_FORMAT_VERSION})"
+            )
+        loaded = 0
+        for e in data.get("entries", []):
+            if self._expired(e["stored_at"]):
+                continue
+            key = (tuple(e["state"]), e["fingerprint"], tuple(e["resolution"]))
+            decision = CachedDecision.from_dict(e["decision"])
+            with self._lock:
+                self._store(key, e["stored_at"], decision)
+            loaded += 1
+        return loaded
@@ -0,0 +1,284 @@
+# AMI-ENGINE — Derlenmiş, dondurulmuş engine config (Phase 4.6 profile'ları).
+# Profile başına bir kez doğrulanır; ad ve fingerprint ile önbelleklenir. Sıcak yolda dict/proxy araması yok.
+
+import hashlib
+import json
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import config as _config
+
+# (attribute, config_override anahtarı) — sıra fingerprint ve to_dict için sabittir
+_FLOAT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("j_min", "J_MIN"),
+    ("h_max", "H_MAX"),
+    ("c_min", "C_MIN"),
+    ("c_max", "C_MAX"),
+    ("j_critical", "J_CRITICAL"),
+    ("h_critical", "H_CRITICAL"),
+    ("confidence_escalation_force", "CONFIDENCE_ESCALATION_FORCE"),
+    ("escalation_hysteresis", "ESCALATION_HYSTERESIS"),
+    ("as_soft_threshold", "AS_SOFT_THRESHOLD"),
+    ("divergence_hard_threshold", "DIVERGENCE_HARD_THRESHOLD"),
+    ("severity_soft_max", "SEVERITY_SOFT_MAX"),
+    ("intervention_soft_max", "INTERVENTION_SOFT_MAX"),
+    ("delay_soft_min", "DELAY_SOFT_MIN"),
+    ("soft_clamp_alpha", "SOFT_CLAMP_ALPHA"),
+    ("soft_clamp_beta", "SOFT_CLAMP_BETA"),
+    ("soft_clamp_gamma", "SOFT_CLAMP_GAMMA"),
+    ("uncertainty_margin_k", "UNCERTAINTY_MARGIN_K"),
+    ("uncertainty_as_lambda", "UNCERTAINTY_AS_LAMBDA"),
+    ("delta_cus_threshold", "DELTA_CUS_THRESHOLD"),
+    ("cus_mean_threshold", "CUS_MEAN_THRESHOLD"),
+    ("refine_as_threshold", "REFINE_AS_THRESHOLD"),
+    ("refine_de_threshold", "REFINE_DE_THRESHOLD"),
+)
+_WEIGHTS_FIELD = ("cus_weights", "CUS_WEIGHTS")
+_WINDOW_FIELD = ("cus_mean_window", "CUS_MEAN_WINDOW")
+# (attribute, anahtar, alt sınır) — negatif olmayan tam sayılar
+_INT_FIELDS: Tuple[Tuple[str, str, int], ...] = (
+    ("refine_max_levels", "REFINE_MAX_LEVELS", 0),
+    ("refine_top_k", "REFINE_TOP_K", 1),
+)
+_BOOL_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("soft_safe_restrict", "SOFT_SAFE_RESTRICT"),
+)
+
+CONFIG_KEYS: Tuple[str, ...] = (
+    tuple(key for _, key in _FLOAT_FIELDS)
+    + (_WEIGHTS_FIELD[1], _WINDOW_FIELD[1])
+    + tuple(key for _, key, _ in _INT_FIELDS)
+    + tuple(key for _, key in _BOOL_FIELDS)
+)
+
+# Dict override'ları için fingerprint önbelleği (profile'lar ayrıca ad ile tutulur)
+_FINGERPRINT_CACHE_MAX = 256
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """
+    Pipeline eşiklerinin doğrulanmış, değiştirilemez görünümü.
+    from_mapping ile config_override dict'inden (eksik anahtarlar config.py varsayılanı) üretilir;
+    fingerprint yalnızca değerlerden hesaplanır (name hariç), aynı değerli config'ler aynı fingerprint'i taşır.
+    """
+
+    __slots__ = tuple(attr for attr, _ in _FLOAT_FIELDS) + (
+        _WEIGHTS_FIELD[0],
+        _WINDOW_FIELD[0],
+    ) + tuple(attr for attr, _, _ in _INT_FIELDS) + tuple(attr for attr, _ in _BOOL_FIELDS) + (
+        "name",
+        "fingerprint",
+    )
+
+    j_min: float
+    h_max: float
+    c_min: float
+    c_max: float
+    j_critical: float
+    h_critical: float
+    confidence_escalation_force: float
+    escalation_hysteresis: float
+    as_soft_threshold: float
+    divergence_hard_threshold: float
+    severity_soft_max: float
+    intervention_soft_max: float
+    delay_soft_min: float
+    soft_clamp_alpha: float
+    soft_clamp_beta: float
+    soft_clamp_gamma: float
+    uncertainty_margin_k: float
+    uncertainty_as_lambda: float
+    delta_cus_threshold: float
+    cus_mean_threshold: float
+    refine_as_threshold: float
+    refine_de_threshold: float
+    cus_weights: Tuple[float, float, float]
+    cus_mean_window: int
+    refine_max_levels: int
+    refine_top_k: int
+    soft_safe_restrict: bool
+    name: Optional[str]
+    fingerprint: str
+
+    @classmethod
+    def from_mapping(
+        cls,
+        values: Optional[Mapping[str, Any]] = None,
+        name: Optional[str] = None,
+    ) -> "EngineConfig":
+        """config_override dict'inden EngineConfig; geçersiz değerde ValueError. Bilinmeyen anahtarlar yok sayılır."""
+        values = values or {}
+        kwargs: Dict[str, Any] = {}
+        for attr, key in _FLOAT_FIELDS:
+            kwargs[attr] = _as_float(key, values.get(key, getattr(_config, key)))
+        kwargs[_WEIGHTS_FIELD[0]] = _as_weights(values.get(_WEIGHTS_FIELD[1], _config.CUS_WEIGHTS))
+        kwargs[_WINDOW_FIELD[0]] = _as_window(values.get(_WINDOW_FIELD[1], _config.CUS_MEAN_WINDOW))
+        for attr, key, minimum in _INT_FIELDS:
+            kwargs[attr] = _as_int(key, values.get(key, getattr(_config, key)), minimum)
+        for attr, key in _BOOL_FIELDS:
+            kwargs[attr] = _as_bool(key, values.get(key, getattr(_config, key)))
+        if kwargs["c_min"] > kwargs["c_max"]:
+            raise ValueError(f"C_MIN ({kwargs['c_min']}) must not exceed C_MAX ({kwargs['c_max']})")
+        return cls(name=name, fingerprint=_fingerprint(kwargs), **kwargs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """config_override uyumlu dict (büyük harf anahtarlar)."""
+        out: Dict[str, Any] = {key: getattr(self, attr) for attr, key in _FLOAT_FIELDS}
+        out[_WEIGHTS_FIELD[1]] = self.cus_weights
+        out[_WINDOW_FIELD[1]] = self.cus_mean_window
+        for attr, key, _ in _INT_FIELDS:
+            out[key] = getattr(self, attr)
+        for attr, key in _BOOL_FIELDS:
+            out[key] = getattr(self, attr)
+        return out
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Dict[str, Any], Optional[str]]]:
+        # frozen + __slots__: pickle değerlerden yeniden kurar (process worker'lara aktarım)
+        return (_restore, (self.to_dict(), self.name))
+
+
+def _restore(values: Dict[str, Any], name: Optional[str]) -> EngineConfig:
+    return EngineConfig.from_mapping(values, name=name)
+
+
+def _as_float(key: str, value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{key} must be a number, got {value!r}")
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{key} must be finite, got {value!r}")
+    return value
+
+
+def _as_weights(value: Any) -> Tuple[float, float, float]:
+    try:
+        weights = tuple(_as_float("CUS_WEIGHTS", w) for w in value)
+    except TypeError:
+        raise ValueError(f"CUS_WEIGHTS must be a sequence of 3 numbers, got {value!r}") from None
+    if len(weights) != 3:
+        raise ValueError(f"CUS_WEIGHTS must have 3 elements, got {len(weights)}")
+    return weights  # type: ignore[return-value]
+
+
+def _as_window(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"CUS_MEAN_WINDOW must be a non-negative integer, got {value!r}")
+    return value
+
+
+def _as_int(key: str, value: Any, minimum: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{key} must be an integer >= {minimum}, got {value!r}")
+    return value
+
+
+def _as_bool(key: str, value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise ValueError(f"{key} must be a boolean, got {value!r}")
+    return value
+
+
+def _fingerprint(fields: Dict[str, Any]) -> str:
+    payload = {key: fields[attr] for attr, key in _FLOAT_FIELDS}
+    payload[_WEIGHTS_FIELD[1]] = list(fields[_WEIGHTS_FIELD[0]])
+    payload[_WINDOW_FIELD[1]] = fields[_WINDOW_FIELD[0]]
+    for attr, key, _ in _INT_FIELDS:
+        payload[key] = fields[attr]
+    for attr, key in _BOOL_FIELDS:
+        payload[key] = fields[attr]
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_DEFAULT: Optional[EngineConfig] = None
+_BY_NAME: Dict[str, EngineConfig] = {}
+_BY_FINGERPRINT: Dict[str, EngineConfig] = {}
+# Dict override'ın ham içeriği → EngineConfig: tekrarlanan dict'ler doğrulama ve hash'leme olmadan çözülür
+_BY_ITEMS: Dict[tuple, EngineConfig] = {}
+# Önbellek yazımları için (okuma kilitsiz; EngineConfig değiştirilemez olduğundan yarış zararsız)
+_LOCK = threading.Lock()
+
+
+def default_engine_config() -> EngineConfig:
+    """config.py varsayılanlarından EngineConfig (process genelinde tek örnek)."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        cfg = EngineConfig.from_mapping({})
+        with _LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = cfg
+    return _DEFAULT
+
+
+def load_engine_config(profile: str) -> EngineConfig:
+    """Profile adı → EngineConfig (ilk çağrıda doğrulanır, sonra önbellekten). Bilinmeyen ad: ValueError."""
+    name = (profile or "").strip().lower()
+    cached = _BY_NAME.get(name)
+    if cached is not None:
+        return cached
+    from config_profiles import PROFILES
+
+    if name not in PROFILES:
+        raise ValueError(f"Unknown config profile {profile!r}; available: {sorted(PROFILES)}")
+    cfg = EngineConfig.from_mapping(PROFILES[name], name=name)
+    with _LOCK:
+        return _BY_NAME.setdefault(name, cfg)
+
+
+def _items_key(mapping: Mapping[str, Any]) -> Optional[tuple]:
+    """
+    Dict override için ucuz önbellek anahtarı: (anahtar, tip, değer) üçlüleri, dict sırasıyla (farklı sıra
+    yalnızca ayrı bir kayıt açar). Tipler anahtardadır: 1, 1.0 ve True eşit hash'lenir ama doğrulamada farklıdır.
+    Hash'lenemeyen içerik: None (önbelleksiz çözülür).
+    """
+    try:
+        key = tuple(
+            (k, type(v), tuple((type(x), x) for x in v)) if isinstance(v, (list, tuple)) else (k, type(v), v)
+            for k, v in mapping.items()
+        )
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def resolve_engine_config(
+    config_override: Optional[Union[EngineConfig, Mapping[str, Any], str]] = None,
+) -> EngineConfig:
+    """
+    config_override (None, profile adı, dict veya EngineConfig) → EngineConfig.
+    Dict'ler fingerprint ile önbelleklenir; aynı değerler aynı örneği döndürür. Aynı içerikli dict tekrar
+    verildiğinde doğrulama ve fingerprint atlanır (ham içerik anahtarlı önbellek).
+    """
+    if isinstance(config_override, EngineConfig):
+        return config_override
+    if config_override is None:
+        return default_engine_config()
+    if isinstance(config_override, str):
+        return load_engine_config(config_override)
+    if not isinstance(config_override, Mapping):
+        raise TypeError(
+            f"config_override must be a profile name, mapping or EngineConfig, got {type(config_override).__name__}"
+        )
+    if not config_override:
+        return default_engine_config()
+    items = _items_key(config_override)
+    if items is not None:
+        cached = _BY_ITEMS.get(items)
+        if cached is not None:
+            return cached
+    cfg = EngineConfig.from_mapping(config_override)
+    with _LOCK:
+        cached = _BY_FINGERPRINT.get(cfg.fingerprint)
+        if cached is None:
+            if len(_BY_FINGERPRINT) >= _FINGERPRINT_CACHE_MAX:
+                _BY_FINGERPRINT.pop(next(iter(_BY_FINGERPRINT)))
+            _BY_FINGERPRINT[cfg.fingerprint] = cached = cfg
+        if items is not None:
+            if len(_BY_ITEMS) >= _FINGERPRINT_CACHE_MAX:
+                _BY_ITEMS.pop(next(iter(_BY_ITEMS)))
+            _BY_ITEMS[items] = cached
+    return cached
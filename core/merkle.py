@@ -0,0 +1,156 @@
+# AMI-ENGINE — Merkle ağacı (RFC 6962 / Certificate Transparency düzeni).
+# Yaprak: SHA256(0x00 || veri), iç düğüm: SHA256(0x01 || sol || sağ); n yaprak en büyük 2^k < n noktasından
+# bölünür. Tek bir yaprak, kardeş hash'lerinden oluşan inclusion proof ile kökten bağımsız doğrulanır.
+
+import hashlib
+import json
+from typing import Any, Iterable, List, Optional, Sequence
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def canonical_json(obj: Any) -> bytes:
+    """Hash'lenen byte dizisi: anahtarlar sıralı, boşluksuz ayraçlar, ASCII kaçışsız UTF-8."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def _split(n: int) -> int:
+    # n'den küçük en büyük 2'nin kuvveti (n >= 2)
+    k = 1
+    while k * 2 < n:
+        k *= 2
+    return k
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """Yaprak hash'lerinden (leaf_hash çıktıları) kök; boş ağacın kökü SHA256("")."""
+    n = len(leaves)
+    if n == 0:
+        return hashlib.sha256(b"").digest()
+    if n == 1:
+        return leaves[0]
+    k = _split(n)
+    return node_hash(merkle_root(leaves[:k]), merkle_root(leaves[k:]))
+
+
+def inclusion_proof(leaves: Sequence[bytes], index: int) -> List[bytes]:
+    """index'teki yaprağın kökle bağını kanıtlayan kardeş hash'leri (yapraktan köke doğru)."""
+    n = len(leaves)
+    if not 0 <= index < n:
+        raise IndexError(f"leaf index {index} out of range for {n} leaves")
+    if n == 1:
+        return []
+    k = _split(n)
+    if index < k:
+        return inclusion_proof(leaves[:k], index) + [merkle_root(leaves[k:])]
+    return inclusion_proof(leaves[k:], index - k) + [merkle_root(leaves[:k])]
+
+
+def root_from_proof(leaf: bytes, index: int, size: int, proof: Sequence[bytes]) -> bytes:
+    """Yaprak hash'i + inclusion proof'tan kök (RFC 9162 §2.1.3.2); proof boyutla uyuşmazsa ValueError."""
+    if not 0 <= index < size:
+        raise ValueError(f"leaf index {index} out of range for {size} leaves")
+    fn, sn = index, size - 1
+    r = leaf
+    for p in proof:
+        if sn == 0:
+            raise ValueError("inclusion proof is too long")
+        if fn % 2 == 1 or fn == sn:
+            r = node_hash(p, r)
+            if fn % 2 == 0:
+                while fn % 2 == 0 and fn != 0:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    if sn != 0:
+        raise ValueError("inclusion proof is too short")
+    return r
+
+
+def verify_inclusion(leaf: bytes, index: int, size: int, proof: Sequence[bytes], root: bytes) -> bool:
+    try:
+        return root_from_proof(leaf, index, size, proof) == root
+    except ValueError:
+        return False
+
+
+class MerkleTree:
+    """
+    Eklemeli Merkle ağacı (append-only log). Hizalı tam (2^k) alt ağaç kökleri seviye başına bytearray'de
+    tutulur; append amortize O(1), herhangi bir geçmiş boyut için root / proof O(log n) düğüm hash'i.
+    Kök ve proof'lar merkle_root / inclusion_proof ile birebir aynıdır.
+    """
+
+    __slots__ = ("_levels",)
+
+    def __init__(self, leaves: Iterable[bytes] = ()) -> None:
+        self._levels: List[bytearray] = [bytearray()]
+        for leaf in leaves:
+            self.append(leaf)
+
+    def __len__(self) -> int:
+        return len(self._levels[0]) // 32
+
+    def append(self, leaf: bytes) -> None:
+        node, level = leaf, 0
+        while True:
+            buf = self._levels[level]
+            buf += node
+            if (len(buf) // 32) % 2:
+                return
+            node = node_hash(bytes(buf[-64:-32]), bytes(buf[-32:]))
+            level += 1
+            if level == len(self._levels):
+                self._levels.append(bytearray())
+
+    def _subtree(self, start: int, size: int) -> bytes:
+        # RFC 6962 bölünmesinde tam alt ağaçlar 2^k hizalıdır -> önbellekten
+        if size & (size - 1) == 0:
+            k = size.bit_length() - 1
+            i = (start >> k) * 32
+            return bytes(self._levels[k][i:i + 32])
+        k = _split(size)
+        return node_hash(self._subtree(start, k), self._subtree(start + k, size - k))
+
+    def _size(self, size: Optional[int]) -> int:
+        n = len(self)
+        if size is None:
+            return n
+        if not 0 <= size <= n:
+            raise ValueError(f"tree size {size} out of range for {n} leaves")
+        return size
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        """İlk size yaprağın (varsayılan: tümü) kökü."""
+        size = self._size(size)
+        return self._subtree(0, size) if size else hashlib.sha256(b"").digest()
+
+    def proof(self, index: int, size: Optional[int] = None) -> List[bytes]:
+        """İlk size yapraklık ağaçta index için inclusion proof."""
+        size = self._size(size)
+        if not 0 <= index < size:
+            raise IndexError(f"leaf index {index} out of range for {size} leaves")
+        path: List[bytes] = []
+        start = 0
+        while size > 1:
+            k = _split(size)
+            if index < k:
+                path.append(self._subtree(start + k, size - k))
+                size = k
+            else:
+                path.append(self._subtree(start, k))
+                start, index, size = start + k, index - k, size - k
+        path.reverse()
+        return path
@@ -3,7 +3,7 @@
 
 from dataclasses import dataclass
 from math import exp
-from typing import List
+from typing import List, Optional
 
 from config import COMPASSION_ALPHA, COMPASSION_BETA, COMPASSION_GAMMA
 from .state_encoder import State
@@ -78,3 +78,16 @@ def evaluate_moral(state: State, a: List[float]) -> MoralScores:
         H=compute_harm(state, a),
         C=compute_compassion(state, a),
     )
+
+
+def rescore_action(state: State, a: List[float], compassion: Optional[float] = None) -> MoralScores:
+    """
+    Aynı state'te yeni aksiyon için skorlar (Level 1 soft clamp). C yalnızca state'e bağlıdır:
+    verilirse yeniden hesaplanmaz; W, J, H aksiyona göre evaluate_moral ile aynı formülle hesaplanır.
+    """
+    return MoralScores(
+        W=compute_wellbeing(state, a),
+        J=compute_justice(state, a),
+        H=compute_harm(state, a),
+        C=compute_compassion(state, a) if compassion is None else compassion,
+    )
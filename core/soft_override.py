@@ -1,9 +1,9 @@
 # AMI-ENGINE — Phase 4.5 Soft Override & Safety Envelope (07_PHASE_45)
 # 3-level escalation (0 normal, 1 soft-safe, 2 hard fail-safe) + action-space restriction.
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import config as _config
+from .engine_config import EngineConfig, resolve_engine_config
 from .moral_evaluator import MoralScores
 
 # Action: [severity, compassion, intervention, delay] (01_STATE_SPACE)
@@ -17,7 +17,7 @@ def compute_escalation_level(
     constraint_margin: float,
     H: float,
     h_crit: float,
-    config: Optional[Dict[str, Any]] = None,
+    config: Optional[Union[EngineConfig, Dict[str, Any]]] = None,
     *,
     as_norm: Optional[float] = None,
     divergence: Optional[float] = None,
@@ -26,24 +26,13 @@ def compute_escalation_level(
     """
     Returns 0 (normal), 1 (soft-safe), or 2 (hard fail-safe).
     Optional: AS_norm / divergence thresholds; hysteresis when downgrading.
+    config: EngineConfig or an override dict (resolved once per fingerprint).
     """
-    co = config or {}
-    force = co.get(
-        "CONFIDENCE_ESCALATION_FORCE",
-        getattr(_config, "CONFIDENCE_ESCALATION_FORCE", 0.20),
-    )
-    hyst = co.get(
-        "ESCALATION_HYSTERESIS",
-        getattr(_config, "ESCALATION_HYSTERESIS", 0.02),
-    )
-    as_threshold = co.get(
-        "AS_SOFT_THRESHOLD",
-        getattr(_config, "AS_SOFT_THRESHOLD", 0.3),
-    )
-    div_threshold = co.get(
-        "DIVERGENCE_HARD_THRESHOLD",
-        getattr(_config, "DIVERGENCE_HARD_THRESHOLD", 0.5),
-    )
+    cfg = resolve_engine_config(config)
+    force = cfg.confidence_escalation_force
+    hyst = cfg.escalation_hysteresis
+    as_threshold = cfg.as_soft_threshold
+    div_threshold = cfg.divergence_hard_threshold
 
     # Level 2: force confidence or H critical, or divergence trigger
     if confidence < force or H > h_crit:
@@ -82,6 +71,8 @@ def restrict_action_space(
     """
     Fail-soft filter: severity <= max, intervention <= max, delay >= min.
     Action = [severity, compassion, intervention, delay].
+    Reference rule for the Level 1 envelope: ActionPlan.constraint_mask builds its compiled
+    ``envelope`` mask by applying this function to the grid.
     """
     out = []
     for a, s in candidates:
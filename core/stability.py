@@ -0,0 +1,242 @@
+# AMI-ENGINE — Karar kararlılık aralıkları (eşik ayarı, Phase 4.6).
+# Tek karar için her eşiğin, diğerleri sabitken, seçilen aksiyonu ve escalation seviyesini değiştirmeden
+# alabileceği değer aralığı. Config taramaları bu aralıklara bakarak motoru yeniden çalıştırmadan cevap verir.
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import DEFAULT_WEIGHTS, SAFE_ACTION
+from .batch_engine import BatchScores, combined_scores
+from .confidence import compute_confidence
+from .engine_config import EngineConfig
+from .moral_evaluator import MoralScores, evaluate_moral
+from .uncertainty import compute_uncertainty
+
+# (config anahtarı, EngineConfig attribute) — aralıklar bu sırayla kaydedilir
+_STABILITY_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("J_MIN", "j_min"),
+    ("H_MAX", "h_max"),
+    ("C_MIN", "c_min"),
+    ("C_MAX", "c_max"),
+    ("J_CRITICAL", "j_critical"),
+    ("H_CRITICAL", "h_critical"),
+    ("CONFIDENCE_ESCALATION_FORCE", "confidence_escalation_force"),
+    ("AS_SOFT_THRESHOLD", "as_soft_threshold"),
+    ("DIVERGENCE_HARD_THRESHOLD", "divergence_hard_threshold"),
+)
+STABILITY_KEYS: Tuple[str, ...] = tuple(key for key, _ in _STABILITY_FIELDS)
+
+_J_MIN, _H_MAX, _C_MIN, _C_MAX, _J_CRITICAL, _H_CRITICAL, _FORCE, _AS, _DIVERGENCE = range(len(_STABILITY_FIELDS))
+
+
+def _next(value: float, up: bool) -> float:
+    return float(np.nextafter(value, np.inf if up else -np.inf))
+
+
+class _Outcome:
+    """
+    Eşik vektörü → (karar, koşullar). Karar = (seçilen aksiyon indeksi, escalation seviyesi); koşullar =
+    pipeline'daki eşik karşılaştırmalarının sonuçları (geçerlilik maskesi, fail-safe, confidence < force,
+    divergence iki yönü, margin < 0, as_norm < eşik). Skorlar state'e bağlı olduğundan bir kez hesaplanır.
+    Escalation, compute_escalation_level'ın (hysteresis'siz) dallarıyla aynıdır; temporal drift dahil değildir.
+    """
+
+    def __init__(self, x_t: Any, plan: Any, cfg: EngineConfig, scores: Optional[tuple], worst: Optional[tuple]) -> None:
+        W, J, H, C = scores if scores is not None else plan.score(x_t)
+        self.J, self.H, self.C = J, H, C
+        self.worst_J, self.worst_H = worst if worst is not None else plan.worst_case(x_t)
+        self.combined = combined_scores(
+            BatchScores(W=W[None, :], J=J[None, :], H=H[None, :], C=np.array([C])), DEFAULT_WEIGHTS,
+        )[0]
+        self.W = W
+        self.safe_scores = evaluate_moral(x_t, list(SAFE_ACTION))
+        self.cfg = cfg
+        self._spread: Dict[bytes, Tuple[float, float]] = {}
+
+    def valid(self, t: Sequence[float]) -> np.ndarray:
+        # validate_constraints ile aynı karşılaştırmalar
+        c_ok = t[_C_MIN] <= self.C <= t[_C_MAX]
+        return (self.J >= t[_J_MIN]) & (self.H <= t[_H_MAX]) & c_ok
+
+    def __call__(self, t: Sequence[float]) -> Tuple[tuple, tuple]:
+        j_min, h_max, c_min, c_max, j_crit, h_crit, force, as_thr, div_thr = t
+        valid = self.valid(t)
+        mask = valid.tobytes()
+        j_low, h_high = self.worst_J < j_crit, self.worst_H > h_crit
+        signals = self.signals(t, valid, mask)
+        if signals is None:
+            return (self.action, 2 if j_low or h_high else 0), (mask, j_low, h_high)
+        confidence, margin, gap, as_norm = signals
+        conditions = (
+            mask, j_low, h_high, confidence < force, gap > div_thr, -gap > div_thr, margin < 0, as_norm < as_thr,
+        )
+        if confidence < force or h_high or abs(gap) > div_thr:
+            level = 2
+        elif margin < 0 or as_norm < as_thr:
+            level = 1
+        else:
+            level = 0
+        return (self.action, level), conditions
+
+    def signals(self, t: Sequence[float], valid: np.ndarray, mask: bytes) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Seçim (self.action: grid indeksi, -1 safe action, -2 geçerli aday yok) ve eşiklerle karşılaştırılan
+        büyüklükler: (confidence, constraint_margin, divergence işaretli farkı, as_norm); seçili skor yoksa None.
+        """
+        if self.worst_J < t[_J_CRITICAL] or self.worst_H > t[_H_CRITICAL]:
+            self.action, selected = -1, self.safe_scores
+        elif valid.any():
+            k = int(np.flatnonzero(valid)[np.argmax(self.combined[valid])])
+            self.action = k
+            selected = MoralScores(W=float(self.W[k]), J=float(self.J[k]), H=float(self.H[k]), C=self.C)
+        else:
+            self.action = -2
+            return None
+        conf = compute_confidence(selected, j_min=t[_J_MIN], h_max=t[_H_MAX], c_min=t[_C_MIN], c_max=t[_C_MAX])
+        de_norm, as_norm = self._spread_of(mask, valid)
+        return conf.confidence, conf.constraint_margin, conf.confidence - (1.0 - de_norm), as_norm
+
+    def _spread_of(self, mask: bytes, valid: np.ndarray) -> Tuple[float, float]:
+        # DE_norm ve AS_norm yalnızca geçerli aday kümesine bağlıdır
+        spread = self._spread.get(mask)
+        if spread is None:
+            u = compute_uncertainty(0.0, 0.0, self.combined[valid].tolist(), config=self.cfg)
+            spread = self._spread[mask] = (u.de_norm, u.as_norm)
+        return spread
+
+    def breakpoints(self, index: int, t: Sequence[float]) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        Eşik index değişirken bir karşılaştırmanın sonucunun değişebildiği değerler. İkinci değer: koşul
+        "değer >= eşik" biçiminde ise True (J_MIN, C_MIN; J_CRITICAL, force, AS için "değer < eşik"in tümleyeni),
+        "değer <= eşik" biçiminde ise False (H_MAX, C_MAX, H_CRITICAL, divergence). Maske ve confidence'a bağlı
+        koşullar için bu değerler kesindir; J_MIN..C_MAX'in margin üzerinden etkisi _walk'ta bisection ile bulunur.
+        """
+        if index == _J_MIN:
+            return self.J[(self.H <= t[_H_MAX]) & (t[_C_MIN] <= self.C <= t[_C_MAX])], True
+        if index == _H_MAX:
+            return self.H[(self.J >= t[_J_MIN]) & (t[_C_MIN] <= self.C <= t[_C_MAX])], False
+        if index in (_C_MIN, _C_MAX):
+            return np.array([self.C]), index == _C_MIN
+        if index == _J_CRITICAL:
+            return np.array([self.worst_J]), True
+        if index == _H_CRITICAL:
+            return np.array([self.worst_H]), False
+        # force / AS / divergence eşikleri seçimi ve confidence'ı değiştirmez
+        valid = self.valid(t)
+        signals = self.signals(t, valid, valid.tobytes())
+        if signals is None:
+            return None, True
+        confidence, _, gap, as_norm = signals
+        if index == _FORCE:
+            return np.array([confidence]), True
+        if index == _AS:
+            return np.array([as_norm]), True
+        return np.array([gap, -gap]), False
+
+
+def _segment(values: Optional[np.ndarray], upper: bool, cur: float, bound: float, up: bool) -> Tuple[float, Optional[float]]:
+    """
+    cur'dan bound yönünde maskenin sabit kaldığı son değer ve maskenin değiştiği ilk değer (yoksa None).
+    upper=True: aday v >= eşik iken geçerli → eşik v'yi geçince düşer; False: v <= eşik iken geçerli.
+    """
+    if values is not None and values.size:
+        if upper and up:
+            ahead = values[values >= cur]
+            if ahead.size:
+                end = float(ahead.min())
+                if end < bound:
+                    return end, _next(end, True)
+        elif upper:
+            ahead = values[values < cur]
+            if ahead.size:
+                t = float(ahead.max())
+                if t >= bound:
+                    return _next(t, True), t
+        elif up:
+            ahead = values[values > cur]
+            if ahead.size:
+                t = float(ahead.min())
+                if t <= bound:
+                    return _next(t, False), t
+        else:
+            ahead = values[values <= cur]
+            if ahead.size:
+                end = float(ahead.max())
+                if end > bound:
+                    return end, _next(end, False)
+    return bound, None
+
+
+def _walk(outcome: _Outcome, t: List[float], index: int, bound: float, up: bool) -> float:
+    """
+    t[index]'ten bound yönünde kararın değişmediği son değer. Tek eşik değişirken her koşul monotondur,
+    koşulların aynı kaldığı küme bir aralıktır: maske segmentleri atlanır, segment içinde koşulların
+    değiştiği nokta float bisection ile (komşu float'a kadar) bulunur, orada karar yeniden kontrol edilir.
+    """
+    def at(value: float) -> Tuple[tuple, tuple]:
+        t[index] = value
+        return outcome(t)
+
+    start = t[index]
+    try:
+        decision, conditions = at(start)
+        cur = start
+        while cur != bound:
+            values, upper = outcome.breakpoints(index, t)
+            end, following = _segment(values, upper, cur, bound, up)
+            if at(end)[1] == conditions:
+                if following is None:
+                    return end
+                cur = following
+            else:
+                good, bad = cur, end
+                while True:
+                    mid = good + (bad - good) / 2
+                    if mid == good or mid == bad:
+                        break
+                    if at(mid)[1] == conditions:
+                        good = mid
+                    else:
+                        bad = mid
+                end, cur = good, _next(good, up)
+            next_decision, conditions = at(cur)
+            if next_decision != decision:
+                return end
+        return bound
+    finally:
+        t[index] = start
+
+
+def compute_stability(
+    x_t: Any,
+    plan: Any,
+    cfg: EngineConfig,
+    scores: Optional[tuple] = None,
+    worst: Optional[Tuple[float, float]] = None,
+) -> Dict[str, List[float]]:
+    """
+    Her STABILITY_KEYS eşiği için [lo, hi]: diğer eşikler cfg'deki değerinde sabitken, eşik bu kapalı
+    aralıkta kaldıkça seçilen aksiyon (soft clamp öncesi, raw_action) ve state'e bağlı escalation seviyesi
+    (temporal drift / hysteresis öncesi) değişmez; aralığın hemen dışındaki float'ta karar değişir.
+    Arama [0, 1] (mevcut değeri içerecek şekilde genişletilir) ile sınırlıdır; C_MIN ≤ C_MAX korunur.
+    Yalnızca tam grid taraması (action_search="exhaustive") için tanımlıdır.
+    """
+    outcome = _Outcome(x_t, plan, cfg, scores, worst)
+    t = [float(getattr(cfg, attr)) for _, attr in _STABILITY_FIELDS]
+    out: Dict[str, List[float]] = {}
+    for index, key in enumerate(STABILITY_KEYS):
+        value = t[index]
+        lo, hi = min(0.0, value), max(1.0, value)
+        if index == _C_MIN:
+            hi = t[_C_MAX]
+        elif index == _C_MAX:
+            lo = t[_C_MIN]
+        out[key] = [_walk(outcome, t, index, lo, False), _walk(outcome, t, index, hi, True)]
+    return out
+
+
+def stability_contains(stability: Dict[str, Sequence[float]], key: str, value: float) -> bool:
+    """value, kaydedilen [lo, hi] aralığında mı (kayıt yoksa False)."""
+    interval = stability.get(key)
+    return interval is not None and interval[0] <= value <= interval[1]
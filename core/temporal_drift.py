@@ -1,8 +1,9 @@
 # AMI-ENGINE Phase 5 — Temporal Drift Monitor.
 # ΔCUS ve CUS_mean ile preemptive escalation.
 
+from array import array
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, List, Optional
 
 
 @dataclass
@@ -50,3 +51,98 @@ def compute_temporal_drift(
 
 def should_preemptively_escalate(drift_result: DriftResult) -> bool:
     return drift_result.preemptive_escalation
+
+
+class DriftState:
+    """
+    Tek karar akışının temporal drift durumu: sabit boyutlu ring buffer (array('d')) + running sum
+    ve hysteresis için previous_escalation. update() O(1); update_cus_history + compute_temporal_drift
+    ile aynı sonucu verir. Tek fark: pencere doluyken cus_mean running sum'dan hesaplanır ve liste
+    toplamından son ulp'lerde sapabilir (buffer her döndüğünde toplam yeniden tam hesaplanır).
+    window=0: sınırsız geçmiş (update_cus_history ile aynı anlam).
+    """
+
+    __slots__ = ("window", "previous_escalation", "_buf", "_head", "_size", "_sum")
+
+    def __init__(
+        self,
+        window: int,
+        history: Iterable[float] = (),
+        previous_escalation: Optional[int] = None,
+    ) -> None:
+        if isinstance(window, bool) or not isinstance(window, int) or window < 0:
+            raise ValueError(f"window must be a non-negative integer, got {window!r}")
+        self.window = window
+        self.previous_escalation = previous_escalation
+        self._buf = array("d", bytes(8 * window))
+        self._head = 0
+        self._size = 0
+        self._sum = 0.0
+        values = [float(v) for v in history]
+        for v in values[-window:] if window > 0 else values:
+            self._push(v)
+        self._sum = sum(self.history())
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last(self) -> Optional[float]:
+        """En son eklenen CUS (yoksa None)."""
+        if self._size == 0:
+            return None
+        if self.window == 0:
+            return self._buf[-1]
+        return self._buf[self._head - 1]
+
+    def history(self) -> List[float]:
+        """Penceredeki CUS değerleri, eskiden yeniye (context["cus_history"] ile aynı biçim)."""
+        if self.window == 0 or self._size < self.window:
+            return self._buf[: self._size].tolist()
+        return self._buf[self._head :].tolist() + self._buf[: self._head].tolist()
+
+    def _push(self, cus: float) -> None:
+        if self.window == 0:
+            self._buf.append(cus)
+            self._size += 1
+            self._sum += cus
+            return
+        if self._size == self.window:
+            self._sum -= self._buf[self._head]
+        else:
+            self._size += 1
+        self._buf[self._head] = cus
+        self._sum += cus
+        self._head += 1
+        if self._head == self.window:
+            self._head = 0
+            if self._size == self.window:
+                # Buffer sırası kronolojik: toplamı yeniden sabitle (kayan nokta birikimini sınırlar)
+                self._sum = sum(self._buf)
+
+    def update(self, cus: float, delta_threshold: float, mean_threshold: float) -> DriftResult:
+        """Yeni CUS'u ekler ve drift sonucunu döndürür (compute_temporal_drift semantiği)."""
+        previous = self.last
+        self._push(float(cus))
+        cus_mean = self._sum / self._size
+        delta_cus = cus - previous if self._size >= 2 else None
+
+        preemptive = False
+        if delta_cus is not None and delta_cus > delta_threshold:
+            preemptive = True
+        if cus_mean > mean_threshold:
+            preemptive = True
+
+        return DriftResult(
+            delta_cus=delta_cus,
+            cus_mean=cus_mean,
+            preemptive_escalation=preemptive,
+        )
+
+    def reset(self) -> None:
+        self.previous_escalation = None
+        self._head = 0
+        self._size = 0
+        self._sum = 0.0
+        if self.window == 0:
+            del self._buf[:]
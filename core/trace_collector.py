@@ -5,7 +5,7 @@ import json
 import time
 from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 
 def build_decision_trace(
@@ -51,6 +51,15 @@ def build_decision_trace(
     return rec
 
 
+def append_jsonl(path: Union[str, Path], rows: Iterable[Dict[str, Any]]) -> int:
+    """rows'u path'e JSON satırları olarak ekler (append); yazmadan önceki dosya sonu byte offset'ini döner."""
+    with open(path, "a", encoding="utf-8") as f:
+        offset = f.tell()
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return offset
+
+
 class TraceCollector:
     """
     Ring buffer + isteğe bağlı JSONL. push(entry), get_recent(n), get_all(), flush_jsonl().
@@ -67,8 +76,7 @@ class TraceCollector:
     def push(self, entry: Dict[str, Any]) -> None:
         self._buffer.append(entry)
         if self._jsonl_path is not None:
-            with open(self._jsonl_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            append_jsonl(self._jsonl_path, (entry,))
 
     def get_recent(self, n: int) -> List[Dict[str, Any]]:
         """Son n kayıt (yeniden eskiye)."""
@@ -83,9 +91,7 @@ class TraceCollector:
         p = Path(path) if path else self._jsonl_path
         if p is None:
             return
-        with open(p, "a", encoding="utf-8") as f:
-            for entry in self._buffer:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        append_jsonl(p, self._buffer)
 
     def __len__(self) -> int:
         return len(self._buffer)
@@ -1,24 +1,148 @@
 # AMI-ENGINE — Debug + Trace Logger (Phase 2 spec §1.7)
 # Her adımda event kaydı; deterministik, denetlenebilir.
 
-from dataclasses import dataclass, field
-from typing import Any, List
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# İhlal bitmask'i: validate_constraints ile aynı adlar ve sıra
+VIOLATION_FLAGS: Tuple[Tuple[int, str], ...] = ((1, "J_below_min"), (2, "H_above_max"), (4, "C_out_of_band"))
+_VIOLATION_NAMES: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(name for bit, name in VIOLATION_FLAGS if mask & bit) for mask in range(8)
+)
 
 
 @dataclass
 class TraceEvent:
+    __slots__ = ("step", "event_type", "data")
     step: int
     event_type: str
     data: Any
 
 
+class CompactSteps:
+    """
+    Full trace step 1–4'ün kolon tabanlı kaydı: aksiyon başına dict yerine W/J/H float64 dizileri ve
+    ihlal bitmask'i (uint8, VIOLATION_FLAGS). actions aksiyon planıyla paylaşılır (trace başına kopyalanmaz).
+    Diziler salt okunurdur; events() trace şemasına (step 1–4 event'leri) her çağrıda taze nesnelerle dönüştürür.
+    """
+
+    __slots__ = ("x_ext", "x_moral", "actions", "W", "J", "H", "C", "violations")
+
+    def __init__(
+        self,
+        x_ext: Sequence[float],
+        x_moral: Sequence[float],
+        actions: Sequence[Tuple[float, ...]],
+        W: Any,
+        J: Any,
+        H: Any,
+        C: float,
+        violations: Any,
+    ) -> None:
+        self.x_ext = tuple(x_ext)
+        self.x_moral = tuple(x_moral)
+        self.actions = actions
+        self.W = _frozen(W, np.float64)
+        self.J = _frozen(J, np.float64)
+        self.H = _frozen(H, np.float64)
+        self.C = C
+        self.violations = _frozen(violations, np.uint8)
+
+    @classmethod
+    def from_scores(
+        cls,
+        x_t: Any,
+        actions: Sequence[Tuple[float, ...]],
+        W: Any,
+        J: Any,
+        H: Any,
+        C: float,
+        j_min: float,
+        h_max: float,
+        c_min: float,
+        c_max: float,
+    ) -> "CompactSteps":
+        """Skor dizilerinden; ihlaller validate_constraints'in karşılaştırmalarıyla vektörel hesaplanır."""
+        J = np.asarray(J, dtype=np.float64)
+        H = np.asarray(H, dtype=np.float64)
+        violations = (J < j_min).astype(np.uint8) | ((H > h_max).astype(np.uint8) << 1)
+        if C < c_min or C > c_max:
+            violations |= 4
+        return cls(x_t.x_ext, x_t.x_moral, actions, W, J, H, C, violations)
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def events(self) -> List[Tuple[int, str, Any]]:
+        """Step 1–4 event'leri (step, event_type, data) — trace şemasındaki yapı ve sırayla."""
+        A = [list(a) for a in self.actions]
+        C = self.C
+        events: List[Tuple[int, str, Any]] = [
+            (1, "state_encoded", {"x_ext": list(self.x_ext), "x_moral": list(self.x_moral)}),
+            (2, "actions_generated", {"count": len(A), "actions": A}),
+            (3, "moral_scores", [
+                {"a": a, "W": w, "J": j, "H": h, "C": C}
+                for a, w, j, h in zip(A, self.W.tolist(), self.J.tolist(), self.H.tolist())
+            ]),
+        ]
+        events.extend(
+            (4, "constraint", {"a": a, "valid": m == 0, "violations": list(_VIOLATION_NAMES[m])})
+            for a, m in zip(A, self.violations.tolist())
+        )
+        return events
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON uyumlu kolon formu (DecisionCache kalıcılığı)."""
+        return {
+            "x_ext": list(self.x_ext),
+            "x_moral": list(self.x_moral),
+            "actions": [list(a) for a in self.actions],
+            "W": self.W.tolist(),
+            "J": self.J.tolist(),
+            "H": self.H.tolist(),
+            "C": self.C,
+            "violations": self.violations.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "CompactSteps":
+        return cls(
+            d["x_ext"], d["x_moral"], tuple(tuple(a) for a in d["actions"]),
+            d["W"], d["J"], d["H"], d["C"], d["violations"],
+        )
+
+
+def _frozen(values: Any, dtype: Any) -> np.ndarray:
+    # Kendi (taze) kopyası: skor dizilerinin tabanını tutmaz, çağıranla paylaşılmaz
+    arr = np.array(values, dtype=dtype)
+    arr.flags.writeable = False
+    return arr
+
+
 class TraceLogger:
-    """Pipeline adımlarını sırayla kaydeder."""
+    """
+    Pipeline adımlarını sırayla kaydeder.
+    steps verilirse yalnızca bu adımlar kaydedilir (trace_level: summary/none);
+    çağıran wants(step) ile pahalı event verisini hiç üretmeyebilir.
+    """
+
+    __slots__ = ("_trace", "_steps")
 
-    def __init__(self) -> None:
+    def __init__(self, steps: Optional[Iterable[int]] = None) -> None:
         self._trace: List[TraceEvent] = []
+        self._steps: Optional[FrozenSet[int]] = frozenset(steps) if steps is not None else None
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+    def wants(self, step: int) -> bool:
+        return self._steps is None or step in self._steps
 
     def log(self, step: int, event_type: str, data: Any = None) -> None:
+        if not self.wants(step):
+            return
         self._trace.append(TraceEvent(step=step, event_type=event_type, data=data))
 
     @property
@@ -3,9 +3,11 @@
 
 import math
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-import config as _config
+import numpy as np
+
+from .engine_config import EngineConfig, default_engine_config, resolve_engine_config
 
 
 @dataclass
@@ -43,42 +45,74 @@ def hesitation_index(
     k: Optional[float] = None,
 ) -> float:
     """HI = (1 - confidence) * (1 + sigmoid(-k * margin)) / 2. Aralık [0, 1]."""
-    k = k if k is not None else getattr(_config, "UNCERTAINTY_MARGIN_K", 5.0)
+    k = k if k is not None else default_engine_config().uncertainty_margin_k
     hi_base = 1.0 - max(0.0, min(1.0, confidence))
     margin_factor = (1.0 + _sigmoid(-k * constraint_margin)) / 2.0
     return hi_base * margin_factor
 
 
-def decision_entropy(
-    scores: List[float],
-    temperature: float = 1.0,
-) -> Tuple[float, float]:
+def _top2(scores: Sequence[float]) -> Tuple[float, float]:
+    """En büyük iki değer (eşitlikler dahil) tek geçişte; sorted(...)[:2] ile aynı."""
+    top1 = top2 = -math.inf
+    for x in scores:
+        if x > top1:
+            top2 = top1
+            top1 = x
+        elif x > top2:
+            top2 = x
+    return top1, top2
+
+
+def _entropy_spread(scores: Sequence[float]) -> Tuple[float, float, float]:
     """
-    Softmax + entropy. Overflow-safe: subtract max before exp.
-    Returns (DE, DE_norm). DE_norm = DE / log(N) ∈ [0, 1]; N=1 → (0, 0).
+    Füzyon çekirdek (temperature=1): (DE, DE_norm, AS_raw); ara liste ve sıralama yok, O(n).
+    Tarama 1: en iyi iki skor (max, softmax kaydırması için de kullanılır). Tarama 2: Z = Σ exp(s - max).
+    Tarama 3: DE = -Σ p·log p, p = exp(s - max) / Z (exp yeniden hesaplanır, liste tutulmaz).
+    Z ve DE, softmax + p·log p tanımıyla aynı sırada toplanır → sonuçlar (ve trace hash'leri)
+    bit-düzeyinde sabittir; log-sum-exp formu yalnızca compute_uncertainty_batch'te kullanılır.
     """
-    if not scores:
-        return 0.0, 0.0
-    if len(scores) == 1:
-        return 0.0, 0.0
-    s = [x / max(temperature, 1e-12) for x in scores]
-    m = max(s)
-    exp_s = [math.exp(x - m) for x in s]
-    z = sum(exp_s)
+    n = len(scores)
+    if n < 2:
+        return 0.0, 0.0, 0.0
+    top1, top2 = _top2(scores)
+    as_raw = max(0.0, top1 - top2)
+
+    exp = math.exp
+    log = math.log
+    z = sum(exp(x - top1) for x in scores)
     if z <= 0:
-        return 0.0, 0.0
-    probs = [e / z for e in exp_s]
+        return 0.0, 0.0, as_raw
     de = 0.0
-    for p in probs:
+    for x in scores:
+        p = exp(x - top1) / z
         if p > 0:
-            de -= p * math.log(p)
-    n = len(scores)
+            de -= p * log(p)
     de_max = math.log(n)
     de_norm = de / de_max if de_max > 0 else 0.0
     de_norm = max(0.0, min(1.0, de_norm))
+    return de, de_norm, as_raw
+
+
+def decision_entropy(
+    scores: List[float],
+    temperature: float = 1.0,
+) -> Tuple[float, float]:
+    """
+    Softmax + entropy. Overflow-safe: subtract max before exp.
+    Returns (DE, DE_norm). DE_norm = DE / log(N) ∈ [0, 1]; N=1 → (0, 0).
+    """
+    if temperature != 1.0:
+        t = max(temperature, 1e-12)
+        scores = [x / t for x in scores]
+    de, de_norm, _ = _entropy_spread(scores)
     return de, de_norm
 
 
+def _spread_norm(as_raw: float, lam: float) -> float:
+    as_norm = 1.0 - math.exp(-lam * as_raw)
+    return max(0.0, min(1.0, as_norm))
+
+
 def action_spread(
     scores: List[float],
     lambda_norm: Optional[float] = None,
@@ -87,15 +121,12 @@ def action_spread(
     AS = best - second_best (≥2 aday). AS_norm = 1 - exp(-λ*AS).
     Tek aday → (0, 0).
     """
-    lam = lambda_norm if lambda_norm is not None else getattr(_config, "UNCERTAINTY_AS_LAMBDA", 2.0)
+    lam = lambda_norm if lambda_norm is not None else default_engine_config().uncertainty_as_lambda
     if not scores or len(scores) < 2:
         return 0.0, 0.0
-    sorted_scores = sorted(scores, reverse=True)
-    as_raw = sorted_scores[0] - sorted_scores[1]
-    as_raw = max(0.0, as_raw)
-    as_norm = 1.0 - math.exp(-lam * as_raw)
-    as_norm = max(0.0, min(1.0, as_norm))
-    return as_raw, as_norm
+    top1, top2 = _top2(scores)
+    as_raw = max(0.0, top1 - top2)
+    return as_raw, _spread_norm(as_raw, lam)
 
 
 def combined_uncertainty_score(
@@ -105,7 +136,7 @@ def combined_uncertainty_score(
     weights: Optional[Tuple[float, float, float]] = None,
 ) -> float:
     """CUS = w1*HI + w2*DE_norm + w3*(1 - AS_norm)."""
-    w = weights or getattr(_config, "CUS_WEIGHTS", (0.4, 0.35, 0.25))
+    w = weights or default_engine_config().cus_weights
     w1, w2, w3 = w[0], w[1], w[2]
     cus = w1 * hi + w2 * de_norm + w3 * (1.0 - as_norm)
     return max(0.0, min(1.0, cus))
@@ -120,22 +151,19 @@ def compute_uncertainty(
     confidence: float,
     constraint_margin: float,
     candidate_scores: List[float],
-    config: Optional[dict] = None,
+    config: Optional[Union[EngineConfig, Dict[str, Any]]] = None,
 ) -> UncertaintyResult:
     """
     Tek çağrıda tüm belirsizlik metrikleri.
     candidate_scores: aday aksiyonların skorları (Score = α*W+β*J−γ*H+δ*C).
-    config: opsiyonel override (k, lambda_norm, cus_weights).
+    config: EngineConfig veya override dict'i (UNCERTAINTY_MARGIN_K, UNCERTAINTY_AS_LAMBDA, CUS_WEIGHTS).
     """
-    co = config or {}
-    k = co.get("UNCERTAINTY_MARGIN_K", getattr(_config, "UNCERTAINTY_MARGIN_K", 5.0))
-    lam = co.get("UNCERTAINTY_AS_LAMBDA", getattr(_config, "UNCERTAINTY_AS_LAMBDA", 2.0))
-    cus_weights = co.get("CUS_WEIGHTS", getattr(_config, "CUS_WEIGHTS", (0.4, 0.35, 0.25)))
-
-    hi = hesitation_index(confidence, constraint_margin, k=k)
-    de, de_norm = decision_entropy(candidate_scores)
-    as_raw, as_norm = action_spread(candidate_scores, lambda_norm=lam)
-    cus = combined_uncertainty_score(hi, de_norm, as_norm, weights=cus_weights)
+    cfg = resolve_engine_config(config)
+
+    hi = hesitation_index(confidence, constraint_margin, k=cfg.uncertainty_margin_k)
+    de, de_norm, as_raw = _entropy_spread(candidate_scores)
+    as_norm = _spread_norm(as_raw, cfg.uncertainty_as_lambda) if len(candidate_scores) >= 2 else 0.0
+    cus = combined_uncertainty_score(hi, de_norm, as_norm, weights=cfg.cus_weights)
     divergence = confidence_uncertainty_divergence(confidence, de_norm)
 
     return UncertaintyResult(
@@ -147,3 +175,102 @@ def compute_uncertainty(
         cus=cus,
         divergence=divergence,
     )
+
+
+def update_uncertainty(
+    previous: UncertaintyResult,
+    confidence: float,
+    constraint_margin: float,
+    config: Optional[Union[EngineConfig, Dict[str, Any]]] = None,
+) -> UncertaintyResult:
+    """
+    Aday kümesi değişmeden confidence/margin değiştiğinde (Level 1 soft clamp) belirsizliği günceller.
+    DE ve AS yalnızca candidate_scores'a bağlıdır, previous'tan aynen alınır; HI, CUS ve divergence
+    yeniden hesaplanır. Sonuç compute_uncertainty(confidence, constraint_margin, aynı adaylar) ile bit-aynıdır.
+    """
+    cfg = resolve_engine_config(config)
+
+    hi = hesitation_index(confidence, constraint_margin, k=cfg.uncertainty_margin_k)
+    cus = combined_uncertainty_score(hi, previous.de_norm, previous.as_norm, weights=cfg.cus_weights)
+    divergence = confidence_uncertainty_divergence(confidence, previous.de_norm)
+
+    return UncertaintyResult(
+        hi=hi,
+        de=previous.de,
+        de_norm=previous.de_norm,
+        as_=previous.as_,
+        as_norm=previous.as_norm,
+        cus=cus,
+        divergence=divergence,
+    )
+
+
+@dataclass
+class BatchUncertainty:
+    """compute_uncertainty_batch çıktısı: UncertaintyResult alanlarının (N,) dizileri."""
+    hi: np.ndarray
+    de: np.ndarray
+    de_norm: np.ndarray
+    as_: np.ndarray
+    as_norm: np.ndarray
+    cus: np.ndarray
+    divergence: np.ndarray
+
+
+def compute_uncertainty_batch(
+    confidence: np.ndarray,
+    constraint_margin: np.ndarray,
+    candidate_scores: np.ndarray,
+    valid: Optional[np.ndarray] = None,
+    config: Optional[Union[EngineConfig, Dict[str, Any]]] = None,
+) -> BatchUncertainty:
+    """
+    compute_uncertainty'nin NumPy karşılığı: candidate_scores (N, A), valid (N, A) bool maske
+    (None → tüm adaylar). DE log-sum-exp ile tek exp geçişinde: DE = log Z − Σ e·(s − max) / Z;
+    en iyi iki skor np.partition ile (sıralama yok).
+    Skaler sonuçla ~1e-12 içinde eşleşir, bit-düzeyinde değil: analiz/tuning içindir; motorun
+    trace üreten yolları skaler çekirdeği kullanır.
+    """
+    cfg = resolve_engine_config(config)
+    S = np.asarray(candidate_scores, dtype=np.float64)
+    if S.ndim != 2:
+        raise ValueError(f"candidate_scores must be 2-D (N, A), got shape {S.shape}")
+    mask = np.ones(S.shape, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+    if mask.shape != S.shape:
+        raise ValueError(f"valid must have shape {S.shape}, got {mask.shape}")
+    conf = np.asarray(confidence, dtype=np.float64)
+    margin = np.asarray(constraint_margin, dtype=np.float64)
+    n = mask.sum(axis=1)
+    multi = n >= 2
+
+    de = np.zeros(len(S))
+    de_norm = np.zeros(len(S))
+    as_raw = np.zeros(len(S))
+    if S.shape[1] >= 2:
+        masked = np.where(mask, S, -np.inf)
+        top = -np.partition(-masked, 1, axis=1)[:, :2]
+        with np.errstate(invalid="ignore"):  # < 2 geçerli adaylı satırlar: -inf - -inf
+            as_raw = np.where(multi, np.maximum(0.0, top[:, 0] - top[:, 1]), 0.0)
+        shifted = np.where(mask, S - np.where(n > 0, top[:, 0], 0.0)[:, None], 0.0)
+        e = np.where(mask, np.exp(shifted), 0.0)
+        z = np.where(multi, e.sum(axis=1), 1.0)
+        de = np.where(multi, np.maximum(0.0, np.log(z) - (e * shifted).sum(axis=1) / z), 0.0)
+        de_norm = np.where(multi, np.clip(de / np.log(np.where(multi, n, 2)), 0.0, 1.0), 0.0)
+    as_norm = np.where(multi, np.clip(1.0 - np.exp(-cfg.uncertainty_as_lambda * as_raw), 0.0, 1.0), 0.0)
+
+    x = -cfg.uncertainty_margin_k * margin
+    sig = np.exp(-np.logaddexp(0.0, -x))
+    hi = (1.0 - np.clip(conf, 0.0, 1.0)) * (1.0 + sig) / 2.0
+    w1, w2, w3 = cfg.cus_weights
+    cus = np.clip(w1 * hi + w2 * de_norm + w3 * (1.0 - as_norm), 0.0, 1.0)
+    divergence = np.abs(conf - (1.0 - de_norm))
+
+    return BatchUncertainty(
+        hi=hi,
+        de=de,
+        de_norm=de_norm,
+        as_=as_raw,
+        as_norm=as_norm,
+        cus=cus,
+        divergence=divergence,
+    )
@@ -8,6 +8,8 @@
 from ami_engine.engine import *
 from ami_engine.engine import (
     moral_decision_engine,
+    moral_decision_engine_batch,
+    moral_decision_engine_multi,
     replay,
     extract_raw_state,
     extract_action,
@@ -18,6 +20,8 @@ from ami_engine.engine import (
 
 __all__ = [
     "moral_decision_engine",
+    "moral_decision_engine_batch",
+    "moral_decision_engine_multi",
     "replay",
     "extract_raw_state",
     "extract_action",
@@ -1,6 +1,7 @@
 # Phase 6.0 — Offline bir adım: state seti + aday config'ler → en iyi config ve L
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -37,17 +38,30 @@ def run_engine_on_states(
     return traces
 
 
+def _evaluate_config(
+    states: List[Dict[str, Any]],
+    config_override: Dict[str, Any],
+    weights: tuple,
+) -> Tuple[Dict[str, float], float]:
+    """Tek aday: engine çalıştır, metrik ve L hesapla (process worker'ında da çalışır)."""
+    metrics = compute_metrics(run_engine_on_states(states, config_override, use_context=True))
+    return metrics, compute_loss(metrics, weights)
+
+
 def run_offline_step(
     states: List[Dict[str, Any]],
     current_config: Dict[str, Any],
     candidate_configs: Optional[List[Dict[str, Any]]] = None,
     weights: tuple = DEFAULT_WEIGHTS,
     base_config: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
 ) -> Tuple[Dict[str, Any], float, Dict[str, float]]:
     """
     Tüm aday config'ler (veya sadece current_config) için engine çalıştırır,
     trace'lerden L hesaplar; en düşük L'ye sahip config'i döndürür.
     base_config verilirse her aday onunla birleştirilir (J_CRITICAL, H_CRITICAL vb. sabit kalır).
+    workers > 1 ise adaylar process havuzunda paralel değerlendirilir; her aday kendi state akışını
+    (cus_history) sırayla işler, seçim sıralı çalıştırmayla aynıdır.
 
     Returns:
         (best_config, best_L, best_metrics)
@@ -60,11 +74,14 @@ def run_offline_step(
     best_L = float("inf")
     best_metrics = {}
 
-    for config in configs_to_try:
-        effective = {**(base_config or {}), **config}
-        traces = run_engine_on_states(states, effective, use_context=True)
-        metrics = compute_metrics(traces)
-        L = compute_loss(metrics, weights)
+    effective = [{**(base_config or {}), **config} for config in configs_to_try]
+    if workers is not None and workers > 1 and len(effective) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(effective))) as pool:
+            evaluated = list(pool.map(_evaluate_config, [states] * len(effective), effective, [weights] * len(effective)))
+    else:
+        evaluated = [_evaluate_config(states, e, weights) for e in effective]
+
+    for config, (metrics, L) in zip(configs_to_try, evaluated):
         if L < best_L:
             best_L = L
             best_config = config
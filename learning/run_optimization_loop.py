@@ -58,6 +58,7 @@ def run_optimization_loop(
     curriculum_schedule: Optional[List[Tuple[Optional[int], str]]] = None,
     states_per_step: int = 50,
     use_safety_gate: bool = True,
+    workers: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     num_steps adım optimizasyon: her adımda aday config'ler dene, en iyi config ile devam et.
@@ -65,6 +66,7 @@ def run_optimization_loop(
     curriculum_schedule verilirse her adımda states_per_step state, get_curriculum_profile_for_step(step)
     ile üretilir; aksi halde verilen states listesi kullanılır.
     use_safety_gate=True: en iyi aday safety_gate'ten geçmezse mevcut config korunur.
+    workers: > 1 ise her adımın adayları process havuzunda değerlendirilir (run_offline_step).
     Returns: history (her eleman _history_record formatında).
     """
     from learning.safety_gate import safety_gate
@@ -82,7 +84,7 @@ def run_optimization_loop(
         candidates = suggest_candidates(current, num_candidates=num_candidates, step_scale=step_scale, seed=seed + step)
         candidates.insert(0, current)
         best_config, best_L, best_metrics = run_offline_step(
-            step_states, current, candidate_configs=candidates, base_config=base
+            step_states, current, candidate_configs=candidates, base_config=base, workers=workers
         )
         gate_ok = True
         if use_safety_gate:
@@ -65,6 +65,66 @@ def main():
     if stage("2h. Phase 6.2 Scenario Generator (test_scenario_generator.py)", lambda: _run_scenario_generator()):
         ok += 1
 
+    total += 1
+    if stage("2i. Vektörel batch motor (test_batch_engine.py)", lambda: _run_batch_engine()):
+        ok += 1
+
+    total += 1
+    if stage("2j. Aksiyon planı (test_action_plan.py)", lambda: _run_action_plan()):
+        ok += 1
+
+    total += 1
+    if stage("2k. Trace seviyesi (test_trace_level.py)", lambda: _run_trace_level()):
+        ok += 1
+    total += 1
+    if stage("2l. EngineConfig (test_engine_config.py)", lambda: _run_engine_config()):
+        ok += 1
+    total += 1
+    if stage("2m. Karar önbelleği (test_decision_cache.py)", lambda: _run_decision_cache()):
+        ok += 1
+    total += 1
+    if stage("2n. Decision session (test_session.py)", lambda: _run_session()):
+        ok += 1
+    total += 1
+    if stage("2o. Paralel / thread-safety / process pool (test_parallel.py)", lambda: _run_parallel()):
+        ok += 1
+    total += 1
+    if stage("2p. Paylaşımlı bellek taşıma (test_transport.py)", lambda: _run_transport()):
+        ok += 1
+    total += 1
+    if stage("2q. asyncio API (test_aio.py)", lambda: _run_aio()):
+        ok += 1
+    total += 1
+    if stage("2r. Karar sunucusu (test_server.py)", lambda: _run_server()):
+        ok += 1
+    total += 1
+    if stage("2s. Branch-and-bound / adaptive aksiyon araması (test_action_search.py)", lambda: _run_action_search()):
+        ok += 1
+    total += 1
+    if stage("2t. Offline aksiyon grid budama (test_action_pruning.py)", lambda: _run_action_pruning()):
+        ok += 1
+    total += 1
+    if stage("2u. Tek geçişte çoklu profile / shadow (test_multi_profile.py)", lambda: _run_multi_profile()):
+        ok += 1
+    total += 1
+    if stage("2v. Karar kararlılık aralıkları (test_stability.py)", lambda: _run_stability()):
+        ok += 1
+    total += 1
+    if stage("2w. Lazy motor çıktısı / trace materialization (test_lazy_result.py)", lambda: _run_lazy_result()):
+        ok += 1
+    total += 1
+    if stage("2x. Kolon tabanlı trace kaydı (test_compact_trace.py)", lambda: _run_compact_trace()):
+        ok += 1
+    total += 1
+    if stage("2y. Trace şeması v1.1 / grid registry (test_trace_codec.py)", lambda: _run_trace_codec()):
+        ok += 1
+    total += 1
+    if stage("2z. Step başına Merkle özetleri (test_trace_merkle.py)", lambda: _run_trace_merkle()):
+        ok += 1
+    total += 1
+    if stage("2za. Hash zincirli denetim logu (test_audit_log.py)", lambda: _run_audit_log()):
+        ok += 1
+
     # 3) Adversarial
     total += 1
     if stage("3. Adversarial — extreme_compassion", lambda: _run_adversarial_extreme()):
@@ -137,6 +197,9 @@ def _run_uncertainty():
     tu.test_divergence_low()
     tu.test_compute_uncertainty_full()
     tu.test_compute_uncertainty_single_candidate()
+    tu.test_update_uncertainty_matches_full_recompute()
+    tu.test_fused_kernel_bit_identical_on_large_grid()
+    tu.test_compute_uncertainty_batch_matches_scalar()
 
 
 def _run_soft_override():
@@ -147,6 +210,8 @@ def _run_soft_override():
     tso.test_escalation_level_0_normal()
     tso.test_restrict_action_space_filters()
     tso.test_restrict_action_space_delay_min()
+    tso.test_envelope_mask_matches_restrict_action_space()
+    tso.test_soft_safe_restrict_reselects_inside_envelope()
 
 
 def _run_soft_clamp():
@@ -154,6 +219,8 @@ def _run_soft_clamp():
     tsc.test_soft_clamp_cus_zero_unchanged()
     tsc.test_soft_clamp_cus_high_softens()
     tsc.test_soft_clamp_bounds()
+    tsc.test_rescore_action_reuses_compassion()
+    tsc.test_level1_selection_record_rescored()
 
 
 def _run_temporal_drift():
@@ -195,6 +262,199 @@ def _run_scenario_generator():
     tsg.test_scenario_test_profile_produces_l0_l1_l2_mix()
 
 
+def _run_batch_engine():
+    import tests.batch.test_batch_engine as tb
+    tb.test_score_batch_matches_evaluate_moral()
+    tb.test_batch_matches_scalar_all_profiles()
+    tb.test_batch_context_matches_sequential_loop()
+    tb.test_batch_empty_and_no_trace()
+    tb.test_decide_batch_api()
+
+
+def _run_action_plan():
+    import tests.action_plan.test_action_plan as tap
+    tap.test_plan_cached_by_resolution()
+    tap.test_generate_actions_same_grid_fresh_lists()
+    tap.test_tables_read_only()
+    tap.test_plan_scores_match_evaluate_moral()
+    tap.test_engine_trace_uses_plan_grid()
+    tap.test_worst_case_matches_scored_extremes()
+    tap.test_override_short_circuit_matches_full_pipeline()
+    tap.test_constraint_mask_matches_validate_constraints()
+
+
+def _run_trace_level():
+    import tests.trace_level.test_trace_level as ttl
+    ttl.test_trace_level_none_skips_trace_and_hash()
+    ttl.test_trace_level_summary_keeps_steps_0_5_6()
+    ttl.test_summary_trace_replay_verifies_hash()
+    ttl.test_full_trace_unchanged_by_default()
+    ttl.test_result_detail_minimal()
+    ttl.test_decide_passes_levels()
+
+
+def _run_engine_config():
+    import tests.engine_config.test_engine_config as tec
+    tec.test_profile_loaded_once_and_cached()
+    tec.test_engine_config_is_frozen_and_slotted()
+    tec.test_unknown_profile_fails_loudly()
+    tec.test_invalid_values_rejected()
+    tec.test_dict_override_cached_by_fingerprint()
+    tec.test_repeated_dict_override_skips_validation()
+    tec.test_engine_config_matches_name_and_dict_override()
+
+
+def _run_decision_cache():
+    import tempfile
+    import tests.decision_cache.test_decision_cache as tdc
+    tdc.test_cache_hit_matches_uncached_result()
+    tdc.test_cache_keeps_cus_history_semantics()
+    tdc.test_cache_key_includes_config_fingerprint()
+    tdc.test_lru_eviction_and_ttl_expiration()
+    tdc.test_quantized_cache_is_order_independent_and_replayable()
+    with tempfile.TemporaryDirectory() as tmp:
+        tdc.test_persistence_starts_warm(Path(tmp))
+
+
+def _run_session():
+    import tests.session.test_session as tss
+    for window in (0, 1, 3, 10):
+        tss.test_drift_state_matches_list_history(window)
+    tss.test_drift_state_restores_history()
+    tss.test_session_cus_window_matches_context_path()
+    tss.test_session_applies_escalation_hysteresis()
+    tss.test_session_validates_profile_and_options()
+
+
+def _run_parallel():
+    import pytest
+    import tests.parallel.test_parallel as tpa
+    tpa.test_engine_leaves_global_random_untouched()
+    tpa.test_decide_many_matches_sequential()
+    tpa.test_process_executor_matches_sequential_and_streams_in_order()
+    tpa.test_failures_surface_per_item()
+    tpa.test_dead_worker_and_timeout_only_fail_their_chunk()
+    tpa.test_concurrent_calls_with_shared_cache_are_deterministic()
+    tpa.test_decide_many_rejects_bad_arguments()
+    with pytest.MonkeyPatch.context() as mp:
+        tpa.test_terminate_works_without_cancel_futures(mp)
+
+
+def _run_transport():
+    import tests.parallel.test_transport as ttr
+    ttr.test_pack_states_matches_encoder_defaults()
+    for executor in ("process", "thread"):
+        ttr.test_shared_results_match_decide_and_trace_lazily(executor)
+    ttr.test_caller_owned_batch_and_array_input()
+    ttr.test_failed_rows_are_flagged()
+
+
+def _run_aio():
+    import tests.aio.test_aio as tai
+    tai.test_concurrent_requests_are_micro_batched_and_exact()
+    tai.test_full_trace_and_process_executor()
+    tai.test_backpressure_bounds_the_queue()
+    tai.test_timeout_cancellation_and_errors_are_per_request()
+    tai.test_stream_preserves_order()
+    tai.test_one_off_adecide_and_validation()
+
+
+def _run_server():
+    import socket
+    import tests.server.test_server as tsv
+    tsv.test_batcher_results_match_decide()
+    tsv.test_identical_inflight_requests_are_coalesced()
+    tsv.test_sessions_match_decision_session_in_arrival_order()
+    tsv.test_identical_session_requests_each_advance_the_session()
+    tsv.test_session_with_mixed_output_options_keeps_arrival_order()
+    tsv.test_http_server_endpoints()
+    if hasattr(socket, "AF_UNIX"):
+        tsv.test_unix_socket_server()
+
+
+def _run_action_search():
+    import tests.action_search.test_action_search as tas
+    tas.test_action_search_rejects_unsupported_options()
+    tas.test_adaptive_keeps_base_grid_for_clear_decisions()
+    tas.test_adaptive_refines_close_calls()
+    tas.test_adaptive_refines_only_a_small_fraction_of_decisions()
+    tas.test_adaptive_trace_replays_with_recorded_budget()
+
+
+def _run_action_pruning():
+    import tempfile
+    import tests.action_pruning.test_action_pruning as tap
+    with tempfile.TemporaryDirectory() as tmp:
+        tap.test_pruning_proofs_verify_and_round_trip(Path(tmp))
+    tap.test_pruned_actions_are_never_valid_or_selected()
+    tap.test_engine_decisions_unchanged_by_pruned_scoring()
+    with tempfile.TemporaryDirectory() as tmp:
+        tap.test_tampered_or_mismatched_artifact_rejected(Path(tmp))
+
+
+def _run_multi_profile():
+    import tests.multi_profile.test_multi_profile as tmu
+    tmu.test_decide_multi_matches_per_profile_decide()
+    tmu.test_decide_multi_fine_grid_and_replay()
+    tmu.test_decide_multi_rejects_invalid_options()
+
+
+def _run_stability():
+    import tests.stability.test_stability as tst
+    tst.test_stability_intervals_are_exact()
+    tst.test_stability_recorded_in_trace_and_replays()
+    tst.test_stability_rejects_non_exhaustive_search()
+    tst.test_escalation_sweep_matches_reexecution()
+
+
+def _run_lazy_result():
+    import pytest
+    import tests.result.test_lazy_result as tlr
+    tlr.test_lazy_result_matches_eager_trace()
+    with pytest.MonkeyPatch.context() as mp:
+        tlr.test_trace_not_built_until_accessed(mp)
+    tlr.test_hash_reflects_trace_at_decision_time()
+    tlr.test_lazy_result_copies_pickles_and_replays()
+
+
+def _run_compact_trace():
+    import tests.compact_trace.test_compact_trace as tct
+    tct.test_compact_steps_export_matches_per_action_events()
+    tct.test_compact_steps_are_read_only_and_exports_are_fresh()
+    tct.test_cached_full_traces_share_no_state()
+
+
+def _run_trace_codec():
+    import tempfile
+    import tests.trace_codec.test_trace_codec as ttc
+    ttc.test_v11_roundtrip_and_hash_match_v10()
+    ttc.test_v11_is_much_smaller_and_replays()
+    with tempfile.TemporaryDirectory() as tmp:
+        ttc.test_grid_registry_and_invalid_input(Path(tmp))
+    ttc.test_server_encodes_traces_on_request()
+
+
+def _run_trace_merkle():
+    import tests.merkle.test_trace_merkle as ttm
+    ttm.test_merkle_tree_matches_rfc6962_shape_and_proofs()
+    ttm.test_digests_match_trace_hash_and_documented_leaves()
+    ttm.test_single_step_proof_and_tamper_detection()
+    ttm.test_replay_verifies_individual_steps()
+
+
+def _run_audit_log():
+    import tempfile
+    import tests.audit_log.test_audit_log as tal
+    tal.test_merkle_tree_matches_recursive_definition()
+    for test in (
+        tal.test_records_chain_and_checkpoints,
+        tal.test_single_record_and_range_proofs,
+        tal.test_tampering_is_detected,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+
+
 def _run_adversarial_extreme():
     from tests.adversarial.extreme_compassion import test_extreme_compassion_batch
     test_extreme_compassion_batch()
@@ -0,0 +1 @@
+# Action plan tests
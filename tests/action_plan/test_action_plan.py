@@ -0,0 +1,131 @@
+# AMI-ENGINE — Derlenmiş aksiyon planı testleri (katsayı tabloları + önbellek)
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from core import encode_state, evaluate_moral, generate_actions
+from core.action_plan import get_action_plan
+
+
+def _grid(resolution):
+    A = []
+    for s in resolution:
+        for c in resolution:
+            for i in resolution:
+                for d in resolution:
+                    A.append([float(s), float(c), float(i), float(d)])
+    A.append([0.0, 0.0, 0.0, 1.0])
+    return A
+
+
+def test_plan_cached_by_resolution():
+    assert get_action_plan() is get_action_plan([0.0, 0.5, 1.0])
+    assert get_action_plan([0, 0.5, 1]) is get_action_plan((0.0, 0.5, 1.0))
+    assert get_action_plan([0.0, 0.25, 0.5, 0.75, 1.0]) is not get_action_plan()
+
+
+def test_generate_actions_same_grid_fresh_lists():
+    x_t = encode_state({})
+    A = generate_actions(x_t)
+    assert A == _grid([0.0, 0.5, 1.0])
+    assert len(A) == 3 ** 4 + 1
+    A[0][0] = 0.9
+    assert generate_actions(x_t)[0][0] == 0.0
+
+
+def test_tables_read_only():
+    plan = get_action_plan()
+    with pytest.raises(ValueError):
+        plan.w_harm[0] = 1.0
+
+
+def test_plan_scores_match_evaluate_moral():
+    rng = random.Random(5)
+    keys = ["physical", "social", "context", "risk", "compassion",
+            "justice", "harm_sens", "responsibility", "empathy"]
+    for resolution in ([0.0, 0.5, 1.0], [0.0, 0.25, 0.5, 0.75, 1.0], [i / 6 for i in range(7)]):
+        plan = get_action_plan(resolution)
+        assert [list(a) for a in plan.actions] == _grid(resolution)
+        for _ in range(10):
+            x_t = encode_state({k: rng.random() for k in keys})
+            W, J, H, C = plan.score(x_t)
+            for col, a in enumerate(plan.actions):
+                s = evaluate_moral(x_t, list(a))
+                assert (W[col], J[col], H[col], C) == (s.W, s.J, s.H, s.C)
+
+
+def test_engine_trace_uses_plan_grid():
+    result = moral_decision_engine({"risk": 0.7}, resolution=[0.0, 0.25, 0.5, 0.75, 1.0])
+    step2 = result["trace"]["steps"][2]["data"]
+    assert step2["count"] == 5 ** 4 + 1
+    assert step2["actions"] == [list(a) for a in get_action_plan([0.0, 0.25, 0.5, 0.75, 1.0]).actions]
+
+
+def test_worst_case_matches_scored_extremes():
+    rng = random.Random(9)
+    keys = ["physical", "social", "context", "risk", "compassion",
+            "justice", "harm_sens", "responsibility", "empathy"]
+    for resolution in ([0.0, 0.5, 1.0], [0.0, 0.25, 0.5, 0.75, 1.0], [i / 6 for i in range(7)]):
+        plan = get_action_plan(resolution)
+        for _ in range(200):
+            x_t = encode_state({k: rng.choice([rng.random(), 0.0, 0.5, 1.0]) for k in keys})
+            W, J, H, C = plan.score(x_t)
+            assert plan.worst_case(x_t) == (min(J.tolist()), max(H.tolist()))
+
+
+def test_override_short_circuit_matches_full_pipeline():
+    state = {"physical": 0.2, "social": 0.9, "context": 0.8, "risk": 0.9, "compassion": 0.4,
+             "justice": 0.5, "harm_sens": 0.6, "responsibility": 0.5, "empathy": 0.5}
+    full = moral_decision_engine(state, config_override="high_critical")
+    assert full["reason"] == "fail_safe"
+    for level in ("summary", "none"):
+        fast = moral_decision_engine(state, config_override="high_critical", trace_level=level)
+        for key in ("action", "raw_action", "escalation", "human_escalation", "confidence", "uncertainty", "J", "H"):
+            assert fast[key] == full[key], (level, key)
+    summary = moral_decision_engine(state, config_override="high_critical", trace_level="summary")
+    full_steps = [s for s in full["trace"]["steps"] if s["step"] in (0, 5, 6)]
+    assert summary["trace"]["steps"] == full_steps
+
+
+def test_constraint_mask_matches_validate_constraints():
+    from config_profiles import PROFILES
+    from core import validate_constraints
+    from core.engine_config import load_engine_config
+    from core.moral_evaluator import MoralScores
+    from core.soft_override import restrict_action_space
+
+    rng = random.Random(18)
+    keys = ["physical", "social", "context", "risk", "compassion", "justice", "harm_sens", "responsibility", "empathy"]
+    for name in sorted(PROFILES):
+        cfg = load_engine_config(name)
+        th = {"j_min": cfg.j_min, "h_max": cfg.h_max, "c_min": cfg.c_min, "c_max": cfg.c_max}
+        for resolution in (None, [0.0, 0.25, 0.5, 0.75, 1.0]):
+            plan = get_action_plan(resolution)
+            mask = plan.constraint_mask(
+                cfg.j_min, cfg.h_max, cfg.c_min, cfg.c_max,
+                cfg.severity_soft_max, cfg.intervention_soft_max, cfg.delay_soft_min,
+            )
+            assert plan.constraint_mask(
+                cfg.j_min, cfg.h_max, cfg.c_min, cfg.c_max,
+                cfg.severity_soft_max, cfg.intervention_soft_max, cfg.delay_soft_min,
+            ) is mask
+            # envelope = restrict_action_space'in derlenmiş hali
+            dummy = MoralScores(W=0.0, J=0.0, H=0.0, C=0.0)
+            kept = restrict_action_space([(list(a), dummy) for a in plan.actions],
+                                         cfg.severity_soft_max, cfg.intervention_soft_max, cfg.delay_soft_min)
+            assert [list(a) for a, ok in zip(plan.actions, mask.envelope.tolist()) if ok] == [a for a, _ in kept]
+            for _ in range(40):
+                x = encode_state({k: rng.choice([rng.random(), 0.0, 1.0]) for k in keys})
+                W, J, H, C = plan.score(x)
+                expected = [
+                    validate_constraints(MoralScores(W=w, J=j, H=h, C=C), **th).valid
+                    for w, j, h in zip(W.tolist(), J.tolist(), H.tolist())
+                ]
+                assert mask.valid(J, H, C).tolist() == expected
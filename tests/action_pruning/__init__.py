@@ -0,0 +1 @@
+# Offline action grid pruning tests
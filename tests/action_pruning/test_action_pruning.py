@@ -0,0 +1,97 @@
+# AMI-ENGINE — Offline aksiyon grid budama testleri (kanıt artifact'ı + örneklenmiş state'lerde doğrulama)
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from ami_engine.config import DEFAULT_WEIGHTS
+from config_profiles import PROFILES
+from core import FailSafeResult, encode_state, evaluate_moral, generate_actions, select_action, validate_constraints
+from core.action_plan import get_action_plan
+from core.action_pruning import analyze_action_grid, load_pruning, save_pruning, verify_pruning
+from core.engine_config import load_engine_config
+from tests.monte_carlo.generator import generate_states
+
+# Kutunun köşeleri (social = 0, risk ≤ 0.5 sınırları dahil) + rastgele iç noktalar
+CORNERS = (0.0, 0.5, 1.0)
+GRIDS = ([0.0, 0.5, 1.0], [0.0, 0.25, 0.5, 0.75, 1.0])
+
+
+def test_pruning_proofs_verify_and_round_trip(tmp_path):
+    for profile in sorted(PROFILES):
+        for grid in GRIDS:
+            pruning = analyze_action_grid(grid, profile)
+            verify_pruning(pruning)
+            assert pruning.live == get_action_plan(grid).feasible_indices(pruning.j_min, pruning.h_max)
+            path = tmp_path / f"{profile}_{len(grid)}.json"
+            save_pruning(pruning, path)
+            loaded = load_pruning(path)
+            assert loaded == pruning
+            verify_pruning(loaded)
+
+    # Varsayılan grid + profile: 82 aksiyonun 73'ü hiçbir state'te J_MIN = 0.85'i sağlayamaz
+    default = analyze_action_grid()
+    assert len(default.actions) == 82 and len(default.live) == 9
+    assert all("J_below_min" in entry["violations"] for entry in default.infeasible)
+
+
+def test_pruned_actions_are_never_valid_or_selected():
+    for profile in ("scenario_test", "high_critical"):
+        cfg = load_engine_config(profile)
+        th = {"j_min": cfg.j_min, "h_max": cfg.h_max, "c_min": cfg.c_min, "c_max": cfg.c_max}
+        for grid in GRIDS:
+            pruning = analyze_action_grid(grid, profile)
+            infeasible = {entry["index"] for entry in pruning.infeasible}
+            dominated = {entry["index"] for entry in pruning.dominated}
+            for raw in generate_states(80, seed=len(grid), corners=CORNERS):
+                x_t = encode_state(raw)
+                candidates = []
+                for k, a in enumerate(generate_actions(x_t, grid)):
+                    scores = evaluate_moral(x_t, a)
+                    valid = validate_constraints(scores, **th).valid
+                    assert not (valid and k in infeasible)
+                    if valid:
+                        candidates.append((k, a, scores))
+                sel = select_action([(a, s) for _, a, s in candidates], FailSafeResult(False, None, False),
+                                    DEFAULT_WEIGHTS)
+                if candidates:
+                    chosen = next(k for k, a, _ in candidates if a == sel.action)
+                    assert chosen not in dominated
+                # Budanmış aday kümesi aynı geçerli adayları aynı sırayla verir
+                pruned = [a for a in generate_actions(x_t, grid, pruning=pruning)
+                          if validate_constraints(evaluate_moral(x_t, a), **th).valid]
+                assert pruned == [a for _, a, _ in candidates]
+
+
+def test_engine_decisions_unchanged_by_pruned_scoring():
+    # summary/none seviyeleri yalnızca budanmış adayları skorlar; full trace tüm grid'i kaydeder
+    for profile in ("scenario_test", "production_safe"):
+        for raw in generate_states(60, seed=17, corners=CORNERS):
+            full = moral_decision_engine(raw, config_override=profile)
+            summary = moral_decision_engine(raw, config_override=profile, trace_level="summary")
+            assert summary["action"] == full["action"] and summary.get("uncertainty") == full.get("uncertainty")
+            assert summary["trace"]["steps"][-1] == full["trace"]["steps"][-1]
+            assert full["trace"]["steps"][2]["data"]["count"] == 82
+
+
+def test_tampered_or_mismatched_artifact_rejected(tmp_path):
+    pruning = analyze_action_grid(None, "scenario_test")
+    path = tmp_path / "pruning.json"
+    save_pruning(pruning, path)
+    data = json.loads(path.read_text())
+    data["live"] = data["live"][:-1]
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="digest"):
+        load_pruning(path)
+    data["version"] = 99
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="version"):
+        load_pruning(path)
+    with pytest.raises(ValueError, match="resolution"):
+        generate_actions(encode_state({}), [0.0, 1.0], pruning=pruning)
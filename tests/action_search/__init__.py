@@ -0,0 +1 @@
+# Branch-and-bound and adaptive action search tests
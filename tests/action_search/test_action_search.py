@@ -0,0 +1,104 @@
+# AMI-ENGINE — Aksiyon araması testleri (adaptive grid inceltmesi, desteklenmeyen seçenekler)
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine, replay
+from core.engine_config import load_engine_config
+from tests.monte_carlo.generator import generate_states
+
+
+def test_action_search_rejects_unsupported_options():
+    from core.decision_cache import DecisionCache
+
+    for method in ("greedy", "branch_and_bound"):
+        with pytest.raises(ValueError):
+            moral_decision_engine({}, action_search=method)
+    with pytest.raises(ValueError):
+        moral_decision_engine({}, action_search="adaptive", cache=DecisionCache())
+
+
+# scenario_test profilinde max_score ile biten yakın karar (as_norm ≈ 0)
+CLOSE_CALL = {"physical": 0.32, "social": 0.15, "context": 0.65, "risk": 0.07, "compassion": 0.54,
+              "justice": 0.37, "harm_sens": 0.06, "responsibility": 0.51, "empathy": 0.04}
+
+
+def _without_search(result):
+    trace = result["trace"]
+    data = dict(trace["steps"][-1]["data"])
+    data.pop("search", None)
+    return {k: v for k, v in result.items() if k not in ("trace", "trace_hash")}, data
+
+
+def test_adaptive_keeps_base_grid_for_clear_decisions():
+    # [0, 1]'i kapsayan grid'de taban en iyi aday skor üst sınırında: hiç incelme yok, sonuç tam taramayla aynı
+    states = generate_states(20, seed=16) + [CLOSE_CALL]
+    overrides = (None, "scenario_test", {**load_engine_config("scenario_test").to_dict(), "REFINE_MAX_LEVELS": 0})
+    for state in states:
+        for override in overrides:
+            base = moral_decision_engine(state, config_override=override, trace_level="summary")
+            adaptive = moral_decision_engine(state, config_override=override, trace_level="summary",
+                                             action_search="adaptive")
+            search = adaptive["trace"]["steps"][-1]["data"]["search"]
+            assert search["levels"] == []
+            assert _without_search(adaptive) == _without_search(base)
+
+
+# Uç noktaları 0 / 1 olmayan grid: en iyi aksiyon grid noktaları arasında kalabilir
+OFF_GRID = [0.2, 0.5, 0.8]
+
+
+def test_adaptive_refines_close_calls():
+    base = moral_decision_engine(CLOSE_CALL, resolution=OFF_GRID, config_override="scenario_test",
+                                 trace_level="summary")
+    refined = moral_decision_engine(CLOSE_CALL, resolution=OFF_GRID, config_override="scenario_test",
+                                    trace_level="summary", action_search="adaptive")
+    assert base["reason"] == refined["reason"] == "max_score"
+    assert base["uncertainty"]["as_norm"] < 0.01
+    search = refined["trace"]["steps"][-1]["data"]["search"]
+    assert search["method"] == "adaptive" and search["resolution"] == OFF_GRID
+    assert search["budget"]["REFINE_MAX_LEVELS"] == 2 and search["budget"]["REFINE_TOP_K"] == 2
+    levels = search["levels"]
+    assert 1 <= len(levels) <= 2
+    assert [lv["step"] for lv in levels] == pytest.approx([0.15, 0.075][: len(levels)])
+    assert all(lv["evaluated"] > 0 for lv in levels)
+    # Grid noktaları arasındaki aksiyon taban grid'in en iyisini geçer
+    assert refined["raw_action"] == levels[-1]["best"] != base["raw_action"]
+    assert levels[-1]["score"] > base["trace"]["steps"][-1]["data"]["score"]
+    # Uncertainty taban grid aday kümesi üzerinden (DE / AS tam taramayla aynı)
+    assert refined["uncertainty"]["de"] == base["uncertainty"]["de"]
+    assert refined["uncertainty"]["as_norm"] == base["uncertainty"]["as_norm"]
+
+    deep = moral_decision_engine(CLOSE_CALL, resolution=OFF_GRID, config_override="high_critical",
+                                 action_search="adaptive")
+    assert deep["trace"]["steps"][-1]["data"]["search"]["budget"]["REFINE_MAX_LEVELS"] == 3
+
+
+def test_adaptive_refines_only_a_small_fraction_of_decisions():
+    # Varsayılan eşiklerle incelme nadir: [0, 1] grid'inde hiç, OFF_GRID'de kararların küçük bir kısmı
+    states = generate_states(200, seed=17)
+    for resolution, limit in ((None, 0), ([i / 4 for i in range(5)], 0), (OFF_GRID, 0.25)):
+        refined = 0
+        for state in states:
+            result = moral_decision_engine(state, resolution=resolution, config_override="scenario_test",
+                                           trace_level="summary", action_search="adaptive")
+            refined += bool(result["trace"]["steps"][-1]["data"]["search"]["levels"])
+        assert refined <= limit * len(states)
+        if limit:
+            assert refined > 0
+
+
+def test_adaptive_trace_replays_with_recorded_budget():
+    budget = {"REFINE_MAX_LEVELS": 1, "REFINE_TOP_K": 3, "REFINE_AS_THRESHOLD": 0.2}
+    for state in ({}, CLOSE_CALL):
+        for level in ("full", "summary"):
+            result = moral_decision_engine(state, config_override=budget, trace_level=level,
+                                           action_search="adaptive")
+            search = result["trace"]["steps"][-1]["data"]["search"]
+            assert search["budget"]["REFINE_TOP_K"] == 3 and search["budget"]["REFINE_AS_THRESHOLD"] == 0.2
+            replay(result["trace"], verify_hash=True)
@@ -0,0 +1 @@
+# Async API tests
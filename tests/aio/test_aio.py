@@ -0,0 +1,122 @@
+# AMI-ENGINE — AsyncDecisionEngine: micro-batch, backpressure, timeout/iptal ve akış testleri
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from ami_engine import AsyncDecisionEngine, adecide
+from tests.monte_carlo.generator import generate_states
+
+
+def test_concurrent_requests_are_micro_batched_and_exact():
+    states = generate_states(200, seed=41)
+    expected = [moral_decision_engine(s, config_override="scenario_test", trace_level="none") for s in states]
+
+    async def main():
+        async with AsyncDecisionEngine("scenario_test", workers=2, max_batch=32) as engine:
+            results = await asyncio.gather(*(engine.adecide(s) for s in states))
+            return results, engine.stats()
+
+    results, stats = asyncio.run(main())
+    assert results == expected
+    assert stats["decisions"] == len(states)
+    assert 1 < stats["largest_batch"] <= 32
+    assert stats["batches"] < len(states)
+
+
+def test_full_trace_and_process_executor():
+    states = generate_states(12, seed=42)
+    expected = [moral_decision_engine(s, config_override="clamp_test") for s in states]
+
+    async def main():
+        async with AsyncDecisionEngine("clamp_test", workers=2, executor="process", trace_level="full") as engine:
+            return await asyncio.gather(*(engine.adecide(s) for s in states))
+
+    assert asyncio.run(main()) == expected
+
+
+def test_backpressure_bounds_the_queue():
+    states = generate_states(120, seed=43)
+    seen = []
+
+    async def main():
+        async with AsyncDecisionEngine(workers=1, max_queue=4, max_batch=2) as engine:
+            async def probe():
+                while len(seen) < 20:
+                    seen.append(engine.stats()["queued"])
+                    await asyncio.sleep(0)
+
+            watcher = asyncio.create_task(probe())
+            await asyncio.gather(*(engine.adecide(s) for s in states))
+            watcher.cancel()
+            return engine.stats()
+
+    stats = asyncio.run(main())
+    assert stats["decisions"] == len(states)
+    assert max(seen) <= 4
+
+
+def test_timeout_cancellation_and_errors_are_per_request():
+    states = generate_states(6, seed=44)
+    expected = [moral_decision_engine(s, trace_level="none") for s in states]
+
+    async def main():
+        async with AsyncDecisionEngine(workers=1) as engine:
+            with pytest.raises(asyncio.TimeoutError):
+                await engine.adecide(states[0], timeout=1e-9)
+            cancelled = asyncio.create_task(engine.adecide(states[1]))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            ok = await engine.adecide(states[2])
+            with pytest.raises(AttributeError):
+                await engine.adecide(None)
+            return cancelled, ok
+
+    cancelled, ok = asyncio.run(main())
+    assert cancelled.cancelled()
+    assert ok == expected[2]
+
+
+def test_stream_preserves_order():
+    states = generate_states(50, seed=45)
+    expected = [moral_decision_engine(s, trace_level="none") for s in states]
+
+    async def source():
+        for s in states:
+            await asyncio.sleep(0)
+            yield s
+
+    async def main():
+        async with AsyncDecisionEngine(workers=2, max_batch=4) as engine:
+            streamed = [r async for r in engine.adecide_stream(source())]
+            mixed = [r async for r in engine.adecide_stream([states[0], None, states[1]], return_exceptions=True)]
+            return streamed, mixed
+
+    streamed, mixed = asyncio.run(main())
+    assert streamed == expected
+    assert mixed[0] == expected[0] and mixed[2] == expected[1]
+    assert isinstance(mixed[1], AttributeError)
+
+
+def test_one_off_adecide_and_validation():
+    state = generate_states(1, seed=46)[0]
+    result = asyncio.run(adecide(state, "scenario_test"))
+    assert result["trace_hash"] == moral_decision_engine(state, config_override="scenario_test")["trace_hash"]
+    with pytest.raises(ValueError):
+        AsyncDecisionEngine("no_such_profile")
+    with pytest.raises(ValueError):
+        AsyncDecisionEngine(max_queue=0)
+
+    async def closed():
+        engine = AsyncDecisionEngine()
+        await engine.aclose()
+        await engine.adecide(state)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(closed())
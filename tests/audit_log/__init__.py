@@ -0,0 +1 @@
+# Hash-chained audit log and checkpoint proof tests
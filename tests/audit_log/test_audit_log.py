@@ -0,0 +1,129 @@
+# AMI-ENGINE — Hash zincirli denetim logu (checkpoint, O(log n) kayıt / aralık doğrulama, kurcalama tespiti)
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from ami_engine import AuditLog, moral_decision_engine, verify_audit_log, verify_range, verify_record
+from ami_engine.audit_log import GENESIS, chain_hash
+from ami_engine.engine import compute_trace_hash
+from core.merkle import MerkleTree, inclusion_proof, leaf_hash, merkle_root
+from core.trace_collector import build_decision_trace
+from tests.monte_carlo.generator import STATE_KEYS
+
+
+def _entries(n, seed):
+    rng = random.Random(seed)
+    return [{"t": float(i), "cus": rng.random(), "level": rng.choice([0, 1, 2]), "note": "karar ğüş"} for i in range(n)]
+
+
+def _rewrite(path, lineno, edit):
+    lines = path.read_text(encoding="utf-8").splitlines()
+    row = json.loads(lines[lineno])
+    edit(row)
+    lines[lineno] = json.dumps(row, ensure_ascii=False)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_merkle_tree_matches_recursive_definition():
+    leaves = [leaf_hash(i.to_bytes(2, "big")) for i in range(140)]
+    tree = MerkleTree(leaves)
+    for size in list(range(0, 40)) + [63, 64, 65, 128, 140]:
+        assert tree.root(size) == merkle_root(leaves[:size])
+        for index in range(0, size, max(1, size // 9)):
+            assert tree.proof(index, size) == inclusion_proof(leaves[:size], index)
+    with pytest.raises(ValueError):
+        tree.root(141)
+
+
+def test_records_chain_and_checkpoints(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    log = AuditLog(path, checkpoint_every=10, max_buffer_size=5)
+    entries = _entries(25, seed=1)
+    records = [log.push(e) for e in entries]
+    assert log.size == 25 and len(log) == 5 and log.get_all() == entries[-5:]
+    assert [cp["size"] for cp in log.checkpoints] == [10, 20]
+
+    prev = GENESIS
+    for seq, (record, entry) in enumerate(zip(records, entries)):
+        assert record["seq"] == seq and record["prev"] == prev and record["entry"] == entry
+        assert record["entry_hash"] == compute_trace_hash(entry)
+        assert record["chain"] == chain_hash(prev, record["entry_hash"])
+        prev = record["chain"]
+    leaves = [leaf_hash(bytes.fromhex(r["chain"])) for r in records]
+    checkpoint = log.checkpoint()
+    assert checkpoint == {"size": 25, "root": merkle_root(leaves).hex(), "chain": log.head}
+    assert log.checkpoint() == checkpoint and len(log.checkpoints) == 3
+    assert log.read(3, 8) == json.loads(json.dumps(records[3:8]))
+    assert log.read(5, 5) == [] and log.read(3, 2) == [] and log.read(24, 100) == json.loads(json.dumps(records[24:]))
+    # Kayıt olmayan start, stop verilse de IndexError (stop yalnızca log boyutuna kırpılır)
+    for start, stop in ((25, None), (40, None), (25, 30), (40, 50), (25, 25), (-1, 3)):
+        with pytest.raises(IndexError):
+            log.read(start, stop)
+    assert verify_audit_log(path) == {"records": 25, "checkpoints": 3, "root": checkpoint["root"], "chain": log.head}
+
+    # Kaldığı yerden devam: zincir ve ağaç dosyadan kurulur
+    resumed = AuditLog(path, checkpoint_every=10)
+    assert resumed.size == 25 and resumed.head == log.head and resumed.checkpoints == log.checkpoints
+    resumed.push(entries[0])
+    assert verify_audit_log(path)["records"] == 26
+
+
+def test_single_record_and_range_proofs(tmp_path):
+    log = AuditLog(tmp_path / "audit.jsonl", checkpoint_every=16)
+    for entry in _entries(50, seed=2):
+        log.push(entry)
+    checkpoint = log.checkpoint()
+    early = log.checkpoints[0]
+    for seq in (0, 1, 15, 16, 31, 49):
+        record = log.read(seq)[0]
+        assert verify_record(record, log.proof(seq), checkpoint)
+        if seq < 16:
+            assert verify_record(record, log.proof(seq, 16), early)
+        assert not verify_record(record, log.proof((seq + 1) % 50), checkpoint)
+
+    records = log.read(10, 40)
+    assert verify_range(records, checkpoint, log.proof(10), log.proof(39))
+    tampered = json.loads(json.dumps(records))
+    tampered[12]["entry"]["level"] = 9
+    assert not verify_range(tampered, checkpoint, log.proof(10), log.proof(39))
+    assert not verify_range(records[:-1], checkpoint, log.proof(10), log.proof(39))
+    with pytest.raises(ValueError):
+        log.proof(3, size=30)
+    with pytest.raises(ValueError):
+        AuditLog(tmp_path / "empty.jsonl").proof(0)
+
+
+def test_tampering_is_detected(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    log = AuditLog(path, checkpoint_every=4)
+    for state in [{k: random.Random(i).random() for k in STATE_KEYS} for i in range(6)]:
+        log.push(build_decision_trace(moral_decision_engine(state), t=0.0))
+    log.checkpoint()
+    verify_audit_log(path)
+    original = path.read_text(encoding="utf-8")
+
+    cases = [
+        (2, lambda row: row["entry"].update(level=2 - row["entry"]["level"])),   # kayıt içeriği
+        (2, lambda row: row.update(entry_hash=compute_trace_hash({"x": 1}))),    # hash değiştirilmiş
+        (4, lambda row: row["checkpoint"].update(size=3)),                       # checkpoint
+    ]
+    for lineno, edit in cases:
+        path.write_text(original, encoding="utf-8")
+        _rewrite(path, lineno, edit)
+        with pytest.raises(ValueError, match=f"line {lineno + 1}"):
+            verify_audit_log(path)
+
+    # Kayıt silme: sonraki kaydın prev'i bağlanmaz
+    lines = original.splitlines()
+    path.write_text("\n".join(lines[:1] + lines[2:]) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        verify_audit_log(path)
+    with pytest.raises(ValueError):
+        AuditLog(path)
@@ -0,0 +1 @@
+# Batch engine tests
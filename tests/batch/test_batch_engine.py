@@ -0,0 +1,76 @@
+# AMI-ENGINE — Vektörel batch motor testleri (skaler motorla bit-uyum)
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine, moral_decision_engine_batch
+from core import evaluate_moral, generate_actions
+from core.action_plan import get_action_plan
+from core.batch_engine import encode_states, score_batch
+from tests.monte_carlo.generator import generate_states
+
+
+def _states(n, seed=3):
+    # Rastgele state'ler + geçersiz / boş girdi (fail-safe ve varsayılan yolları)
+    return generate_states(n, seed) + [{"risk": 1.7, "social": None, "context": "x"}, {}]
+
+
+def _strip_trace(result):
+    return {k: v for k, v in result.items() if k not in ("trace", "trace_hash")}
+
+
+def test_score_batch_matches_evaluate_moral():
+    states = _states(20)
+    encoded, X = encode_states(states)
+    A = generate_actions(encoded[0])
+    scores = score_batch(X, get_action_plan())
+    for row, x_t in enumerate(encoded):
+        for col, a in enumerate(A):
+            s = evaluate_moral(x_t, a)
+            assert scores.W[row, col] == s.W
+            assert scores.J[row, col] == s.J
+            assert scores.H[row, col] == s.H
+            assert scores.C[row] == s.C
+
+
+def test_batch_matches_scalar_all_profiles():
+    states = _states(40)
+    for profile in (None, "production_safe", "high_critical", "chaos_tuning", "scenario_test"):
+        expected = [_strip_trace(moral_decision_engine(s, config_override=profile)) for s in states]
+        got = moral_decision_engine_batch(states, config_override=profile)
+        assert got == expected, profile
+
+
+def test_batch_context_matches_sequential_loop():
+    states = _states(30, seed=11)
+    ctx_scalar = {"cus_history": []}
+    ctx_batch = {"cus_history": []}
+    expected = [
+        _strip_trace(moral_decision_engine(s, config_override="chaos_tuning", context=ctx_scalar))
+        for s in states
+    ]
+    got = moral_decision_engine_batch(states, config_override="chaos_tuning", context=ctx_batch)
+    assert got == expected
+    assert ctx_batch["cus_history"] == ctx_scalar["cus_history"]
+
+
+def test_batch_empty_and_no_trace():
+    assert moral_decision_engine_batch([]) == []
+    out = moral_decision_engine_batch(_states(2))
+    assert "trace" not in out[0] and "trace_hash" not in out[0]
+    assert out[0]["escalation"] in (0, 1, 2)
+
+
+def test_decide_batch_api():
+    from ami_engine import decide, decide_batch
+
+    states = _states(5)
+    got = decide_batch(states, profile="scenario_test")
+    for s, r in zip(states, got):
+        ref = decide(s, profile="scenario_test")
+        assert r["action"] == ref["action"]
+        assert r["escalation"] == ref["escalation"]
+        assert r["human_escalation"] == ref["human_escalation"]
@@ -0,0 +1 @@
+# Compact trace representation tests
@@ -0,0 +1,82 @@
+# AMI-ENGINE — Kolon tabanlı step 1–4 trace kaydı testleri (export şeması per-aksiyon üretimle birebir aynı)
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from ami_engine import DecisionCache, moral_decision_engine
+from core import MoralScores, encode_state, validate_constraints
+from core.action_plan import get_action_plan
+from core.engine_config import resolve_engine_config
+from core.trace_logger import CompactSteps, TraceEvent, TraceLogger
+from tests.monte_carlo.generator import generate_states
+
+CORNERS = (0.0, 1.0)
+
+
+def _reference_events(x_t, plan, cfg):
+    # Aksiyon başına MoralScores + validate_constraints ile eski (eager) step 1–4 üretimi
+    W, J, H, C = plan.score(x_t)
+    A = plan.action_lists()
+    scored = [(a, MoralScores(W=w, J=j, H=h, C=C)) for a, w, j, h in zip(A, W.tolist(), J.tolist(), H.tolist())]
+    events = [
+        (1, "state_encoded", {"x_ext": list(x_t.x_ext), "x_moral": list(x_t.x_moral)}),
+        (2, "actions_generated", {"count": len(A), "actions": A}),
+        (3, "moral_scores", [{"a": a, "W": s.W, "J": s.J, "H": s.H, "C": s.C} for a, s in scored]),
+    ]
+    th = {"j_min": cfg.j_min, "h_max": cfg.h_max, "c_min": cfg.c_min, "c_max": cfg.c_max}
+    for a, s in scored:
+        cv = validate_constraints(s, **th)
+        events.append((4, "constraint", {"a": a, "valid": cv.valid, "violations": cv.violations}))
+    return events
+
+
+def test_compact_steps_export_matches_per_action_events():
+    for i, state in enumerate(generate_states(40, seed=22, corners=CORNERS)):
+        cfg = resolve_engine_config(("scenario_test", "high_critical", None)[i % 3])
+        plan = get_action_plan([0.0, 0.5, 1.0] if i % 2 else None)
+        x_t = encode_state(state)
+        W, J, H, C = plan.score(x_t)
+        compact = CompactSteps.from_scores(x_t, plan.actions, W, J, H, C, cfg.j_min, cfg.h_max, cfg.c_min, cfg.c_max)
+        assert len(compact) == len(plan)
+        assert json.dumps(compact.events()) == json.dumps(_reference_events(x_t, plan, cfg))
+        restored = CompactSteps.from_dict(json.loads(json.dumps(compact.to_dict())))
+        assert json.dumps(restored.events()) == json.dumps(compact.events())
+
+
+def test_compact_steps_are_read_only_and_exports_are_fresh():
+    x_t = encode_state(generate_states(1, seed=2, corners=CORNERS)[0])
+    plan = get_action_plan(None)
+    W, J, H, C = plan.score(x_t)
+    compact = CompactSteps.from_scores(x_t, plan.actions, W, J, H, C, 0.5, 0.5, 0.0, 1.0)
+    with pytest.raises(ValueError):
+        compact.W[0] = 1.0
+    assert compact.actions is plan.actions and compact.violations.dtype == np.uint8
+    first = compact.events()
+    first[2][2][0]["W"] = -1.0
+    first[1][2]["actions"][0][0] = 99.0
+    assert compact.events() == CompactSteps.from_scores(x_t, plan.actions, W, J, H, C, 0.5, 0.5, 0.0, 1.0).events()
+
+    logger = TraceLogger(steps=(0, 6))
+    logger.log(0, "raw_state", {})
+    logger.log(3, "moral_scores", [])
+    assert len(logger) == 1 and not hasattr(logger.trace[0], "__dict__")
+    assert logger.trace[0] == TraceEvent(step=0, event_type="raw_state", data={})
+
+
+def test_cached_full_traces_share_no_state():
+    cache = DecisionCache()
+    state = generate_states(1, seed=7, corners=CORNERS)[0]
+    expected = moral_decision_engine(state, config_override="scenario_test")
+    first = moral_decision_engine(state, config_override="scenario_test", cache=cache)
+    first["trace"]["steps"][3]["data"][0]["W"] = -1.0
+    second = moral_decision_engine(state, config_override="scenario_test", cache=cache)
+    assert cache.hits == 1
+    assert second == expected
+    assert isinstance(cache.get(next(iter(cache._entries)), with_steps=True).steps, CompactSteps)
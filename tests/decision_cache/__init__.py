@@ -0,0 +1 @@
+# Decision cache tests
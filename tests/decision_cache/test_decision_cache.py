@@ -0,0 +1,107 @@
+# AMI-ENGINE — DecisionCache (LRU/TTL memoization) testleri
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine, replay
+from core.decision_cache import DecisionCache
+from tests.monte_carlo.generator import generate_states
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_matches_uncached_result():
+    cache = DecisionCache(maxsize=16)
+    state = generate_states(1, seed=11)[0]
+    expected = moral_decision_engine(state, config_override="scenario_test")
+    first = moral_decision_engine(state, config_override="scenario_test", cache=cache)
+    second = moral_decision_engine(state, config_override="scenario_test", cache=cache)
+    assert first == expected and second == expected
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    # Dönen aksiyonu değiştirmek önbelleği bozmaz
+    second["action"][0] = 99.0
+    second["trace"]["steps"][2]["data"]["actions"][0][0] = 99.0
+    assert moral_decision_engine(state, config_override="scenario_test", cache=cache) == expected
+
+
+def test_cache_keeps_cus_history_semantics():
+    states = generate_states(20, seed=11)
+    seq = states + states[:10]
+    ctx_plain, ctx_cached = {"cus_history": []}, {"cus_history": []}
+    cache = DecisionCache(maxsize=64)
+    for s in seq:
+        a = moral_decision_engine(s, config_override="clamp_test", context=ctx_plain)
+        b = moral_decision_engine(s, config_override="clamp_test", context=ctx_cached, cache=cache)
+        assert a == b
+    assert ctx_plain == ctx_cached
+    assert cache.hits == 10
+
+
+def test_cache_key_includes_config_fingerprint():
+    cache = DecisionCache()
+    state = generate_states(1, seed=11)[0]
+    moral_decision_engine(state, config_override="scenario_test", cache=cache, trace_level="none")
+    r = moral_decision_engine(state, config_override="high_critical", cache=cache, trace_level="none")
+    assert cache.misses == 2 and len(cache) == 2
+    assert r == moral_decision_engine(state, config_override="high_critical", trace_level="none")
+
+
+def test_lru_eviction_and_ttl_expiration():
+    clock = _Clock()
+    cache = DecisionCache(maxsize=2, ttl=60.0, clock=clock)
+    a, b, c = generate_states(3, seed=11)
+    for s in (a, b, a, c):  # c eklenince en eski (b) düşer
+        moral_decision_engine(s, cache=cache, trace_level="none")
+    assert cache.evictions == 1 and len(cache) == 2
+    moral_decision_engine(a, cache=cache, trace_level="none")
+    assert cache.hits == 2
+    clock.now += 61.0
+    moral_decision_engine(a, cache=cache, trace_level="none")
+    assert cache.expirations == 1
+
+
+def test_quantized_cache_is_order_independent_and_replayable():
+    state = generate_states(1, seed=11)[0]
+    nearby = {k: v + 1e-4 for k, v in state.items()}
+    warm = DecisionCache(quantize=0.01)
+    r1 = moral_decision_engine(state, cache=warm)
+    r2 = moral_decision_engine(nearby, cache=warm)
+    assert warm.hits == 1 and r2["action"] == r1["action"]
+    cold = moral_decision_engine(nearby, cache=DecisionCache(quantize=0.01))
+    assert cold["trace"]["steps"][1] == r2["trace"]["steps"][1]
+    assert r2["trace"]["quantize"] == 0.01
+    replay(r2["trace"], validate=True, verify_hash=True)
+    with pytest.raises(ValueError):
+        DecisionCache(quantize=0.0)
+
+
+def test_persistence_starts_warm(tmp_path):
+    states = generate_states(5, seed=11)
+    cache = DecisionCache()
+    expected = [moral_decision_engine(s, config_override="production_safe", cache=cache) for s in states]
+    path = tmp_path / "decisions.json"
+    assert cache.save(path) == 5
+
+    restarted = DecisionCache()
+    assert restarted.load(path) == 5
+    got = [moral_decision_engine(s, config_override="production_safe", cache=restarted) for s in states]
+    assert got == expected
+    assert restarted.hits == 5 and restarted.misses == 0
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["format"] = 0
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(ValueError):
+        DecisionCache().load(path)
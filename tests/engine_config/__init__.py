@@ -0,0 +1 @@
+# EngineConfig tests
@@ -0,0 +1,92 @@
+# AMI-ENGINE — EngineConfig (derlenmiş, dondurulmuş profile config) testleri
+
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from config_profiles import get_config
+from core.engine_config import (
+    EngineConfig,
+    default_engine_config,
+    load_engine_config,
+    resolve_engine_config,
+)
+
+STATE = {
+    "physical": 0.4, "social": 0.3, "context": 0.6, "risk": 0.7,
+    "compassion": 0.6, "justice": 0.8, "harm_sens": 0.5,
+    "responsibility": 0.6, "empathy": 0.7,
+}
+
+
+def test_profile_loaded_once_and_cached():
+    cfg = load_engine_config("scenario_test")
+    assert load_engine_config(" Scenario_Test ") is cfg
+    assert cfg.name == "scenario_test"
+    assert cfg.to_dict()["H_CRITICAL"] == get_config("scenario_test")["H_CRITICAL"]
+    # base profili config.py varsayılanlarıyla aynı değerleri taşır
+    assert load_engine_config("base").fingerprint == default_engine_config().fingerprint
+
+
+def test_engine_config_is_frozen_and_slotted():
+    cfg = load_engine_config("production_safe")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cfg.j_min = 0.0
+    assert not hasattr(cfg, "__dict__")
+
+
+def test_unknown_profile_fails_loudly():
+    with pytest.raises(ValueError, match="Unknown config profile"):
+        load_engine_config("no_such_profile")
+    with pytest.raises(ValueError):
+        moral_decision_engine(STATE, config_override="no_such_profile")
+
+
+def test_invalid_values_rejected():
+    with pytest.raises(ValueError, match="J_MIN"):
+        EngineConfig.from_mapping({"J_MIN": "high"})
+    with pytest.raises(ValueError, match="CUS_WEIGHTS"):
+        EngineConfig.from_mapping({"CUS_WEIGHTS": (0.5, 0.5)})
+    with pytest.raises(ValueError, match="C_MIN"):
+        EngineConfig.from_mapping({"C_MIN": 0.9, "C_MAX": 0.1})
+    with pytest.raises(ValueError, match="REFINE_MAX_LEVELS"):
+        EngineConfig.from_mapping({"REFINE_MAX_LEVELS": -1})
+    with pytest.raises(ValueError, match="REFINE_TOP_K"):
+        EngineConfig.from_mapping({"REFINE_TOP_K": 1.5})
+    with pytest.raises(ValueError, match="SOFT_SAFE_RESTRICT"):
+        EngineConfig.from_mapping({"SOFT_SAFE_RESTRICT": 1})
+
+
+def test_dict_override_cached_by_fingerprint():
+    a = resolve_engine_config({"J_MIN": 0.8, "H_MAX": 0.35})
+    b = resolve_engine_config({"H_MAX": 0.35, "J_MIN": 0.8})
+    assert a is b
+    assert resolve_engine_config(a) is a
+    assert resolve_engine_config(None) is default_engine_config()
+
+
+def test_repeated_dict_override_skips_validation():
+    override = {**get_config("clamp_test"), "J_MIN": 0.71, "CUS_WEIGHTS": [0.5, 0.3, 0.2]}
+    cfg = resolve_engine_config(override)
+    with pytest.MonkeyPatch.context() as mp:
+        # Aynı içerik: doğrulama + fingerprint yeniden çalışmaz
+        mp.setattr(EngineConfig, "from_mapping", classmethod(lambda cls, *a, **k: pytest.fail("revalidated")))
+        assert resolve_engine_config(dict(override)) is cfg
+    # Eşit hash'lenen ama tipi farklı değer önbellekten dönmez, doğrulanır
+    assert resolve_engine_config({"SOFT_SAFE_RESTRICT": True}).soft_safe_restrict is True
+    with pytest.raises(ValueError, match="SOFT_SAFE_RESTRICT"):
+        resolve_engine_config({"SOFT_SAFE_RESTRICT": 1})
+
+
+def test_engine_config_matches_name_and_dict_override():
+    by_name = moral_decision_engine(STATE, config_override="clamp_test")
+    by_cfg = moral_decision_engine(STATE, config_override=load_engine_config("clamp_test"))
+    by_dict = moral_decision_engine(STATE, config_override=get_config("clamp_test"))
+    assert by_cfg["trace_hash"] == by_name["trace_hash"] == by_dict["trace_hash"]
+    assert by_cfg["action"] == by_name["action"] == by_dict["action"]
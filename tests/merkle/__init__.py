@@ -0,0 +1 @@
+# Per-step Merkle digest and inclusion proof tests
@@ -0,0 +1,114 @@
+# AMI-ENGINE — Step başına Merkle özetleri (tek geçişte trace_hash, inclusion proof, step karşılaştırma)
+
+import copy
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from ami_engine import (
+    DecisionCache,
+    compute_trace_digests,
+    compute_trace_root,
+    decode_trace,
+    diff_trace_steps,
+    moral_decision_engine,
+    replay,
+    trace_step_proof,
+    verify_trace_step,
+)
+from ami_engine.engine import compute_trace_hash
+from core.merkle import inclusion_proof, leaf_hash, merkle_root, node_hash, verify_inclusion
+from tests.monte_carlo.generator import generate_states
+
+
+OPTIONS = (
+    {},
+    {"trace_level": "summary"},
+    {"action_search": "adaptive"},
+    {"trace_format": "1.1"},
+    {"cache": DecisionCache(quantize=0.01)},
+)
+
+
+def _canonical(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def test_merkle_tree_matches_rfc6962_shape_and_proofs():
+    assert merkle_root([]) == hashlib.sha256(b"").digest()
+    a, b, c = (leaf_hash(x) for x in (b"a", b"b", b"c"))
+    assert a == hashlib.sha256(b"\x00a").digest()
+    # 3 yaprak: sol alt ağaç 2 yaprak (en büyük 2^k < n)
+    assert merkle_root([a, b, c]) == node_hash(node_hash(a, b), c)
+    for n in range(1, 20):
+        leaves = [leaf_hash(bytes([i])) for i in range(n)]
+        root = merkle_root(leaves)
+        for i in range(n):
+            proof = inclusion_proof(leaves, i)
+            assert verify_inclusion(leaves[i], i, n, proof, root)
+            assert not verify_inclusion(leaf_hash(b"x"), i, n, proof, root)
+            assert n == 1 or not verify_inclusion(leaves[i], (i + 1) % n, n, proof, root)
+    with pytest.raises(IndexError):
+        inclusion_proof([a], 1)
+
+
+def test_digests_match_trace_hash_and_documented_leaves():
+    for i, state in enumerate(generate_states(25, seed=24)):
+        options = OPTIONS[i % len(OPTIONS)]
+        result = moral_decision_engine(state, **options)
+        digests = result.digests()
+        trace = result["trace"]
+        assert digests.trace_hash == result["trace_hash"] == compute_trace_hash(trace)
+        assert digests == compute_trace_digests(trace) == compute_trace_digests(json.loads(json.dumps(trace)))
+        # Yapraklar v1.0 canonical JSON'dan: [header, *steps]
+        expanded = decode_trace(trace)
+        header = {k: v for k, v in expanded.items() if k != "steps"}
+        leaves = [leaf_hash(_canonical(header))] + [leaf_hash(_canonical(e)) for e in expanded["steps"]]
+        assert digests.header == leaves[0].hex()
+        assert list(digests.steps) == [leaf.hex() for leaf in leaves[1:]]
+        assert digests.root == merkle_root(leaves).hex() == compute_trace_root(trace)
+    legacy = decode_trace(trace)["steps"]
+    assert compute_trace_digests(legacy).trace_hash == compute_trace_hash(legacy)
+
+
+def test_single_step_proof_and_tamper_detection():
+    result = moral_decision_engine(generate_states(1, seed=6)[0])
+    trace = copy.deepcopy(result["trace"])
+    root = result.digests().root
+    position = next(i for i, e in enumerate(trace["steps"]) if e["step"] == 6)
+    proof = trace_step_proof(trace, position)
+    selection = json.loads(json.dumps(trace["steps"][position]))
+    # Yalnızca step 6 event'i + proof ile doğrulama (trace'in geri kalanı olmadan)
+    assert proof["root"] == root and verify_trace_step(selection, proof, root)
+    assert not verify_trace_step(trace["steps"][position - 1], proof, root)
+    selection["data"]["action"] = [0.0, 0.0, 0.0, 0.0]
+    assert not verify_trace_step(selection, proof, root)
+
+    tampered = copy.deepcopy(trace)
+    tampered["steps"][position]["data"]["action"] = [0.0, 0.0, 0.0, 0.0]
+    assert diff_trace_steps(trace, tampered) == [position]
+    assert diff_trace_steps(trace, tampered, steps=[3, 4]) == []
+    assert diff_trace_steps(result.digests(), compute_trace_digests(tampered)) == [position]
+    with pytest.raises(IndexError):
+        trace_step_proof(trace, len(trace["steps"]))
+
+
+def test_replay_verifies_individual_steps():
+    for i, state in enumerate(generate_states(6, seed=12)):
+        options = OPTIONS[i % 4]
+        trace = moral_decision_engine(state, **options)["trace"]
+        replay(trace, verify_hash=True, verify_steps=True)
+        replay(trace, verify_steps=[6])
+
+    trace = moral_decision_engine(generate_states(1, seed=13)[0])["trace"]
+    position = next(i for i, e in enumerate(trace["steps"]) if e["step"] == 6)
+    trace["steps"][position]["data"]["reason"] = "edited"
+    with pytest.raises(AssertionError, match=rf"\[{position}\]"):
+        replay(trace, verify_steps=[6])
+    replay(trace, verify_steps=[0, 1, 2, 3, 4, 5])
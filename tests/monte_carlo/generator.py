@@ -2,7 +2,7 @@
 # U(0,1) veya seçilmiş dağılımla raw_state üretir.
 
 import random
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 
 
 STATE_KEYS = [
@@ -41,3 +41,18 @@ def generate_batch(
         s = seed + i if seed is not None else None
         states.append(generate_random_state(s))
     return states
+
+
+def generate_states(
+    n: int,
+    seed: int,
+    corners: Sequence[float] = (),
+) -> List[Dict[str, float]]:
+    """
+    n adet raw_state; kendi random.Random(seed) örneğiyle (global random'a dokunmaz).
+    corners verilirse her bileşen U(0,1) örneği ile bu sınır değerleri arasından seçilir (ör. (0.0, 1.0)).
+    """
+    rng = random.Random(seed)
+    if corners:
+        return [{k: rng.choice([rng.random(), *corners]) for k in STATE_KEYS} for _ in range(n)]
+    return [{k: rng.random() for k in STATE_KEYS} for _ in range(n)]
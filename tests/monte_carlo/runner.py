@@ -9,6 +9,7 @@ ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
 from engine import moral_decision_engine, extract_selection_data
+from ami_engine.parallel import decide_many
 from .generator import generate_batch
 
 
@@ -22,20 +23,26 @@ def run_monte_carlo(
     seed: Optional[int] = None,
     deterministic_engine: bool = True,
     config_override: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     n rastgele state üretir, her biri için motoru çalıştırır.
     config_override: Phase 4.3 chaos için J_MIN, H_MAX, C_MIN, C_MAX, J_CRITICAL, H_CRITICAL.
+    workers: > 1 ise state'ler decide_many ile process havuzuna dağıtılır (sonuçlar aynı, sıra korunur).
     Her kayıt: action, reason, override, human_escalation, confidence, scores (W,J,H,C).
     """
     states = generate_batch(n, seed)
-    records = []
-    for raw_state in states:
-        result = moral_decision_engine(
-            raw_state,
-            deterministic=deterministic_engine,
-            config_override=config_override,
+    if workers is not None and workers > 1:
+        results = decide_many(states, config_override, workers=workers)
+    else:
+        results = (
+            moral_decision_engine(raw_state, deterministic=deterministic_engine, config_override=config_override)
+            for raw_state in states
         )
+    records = []
+    for result in results:
+        if "error" in result:
+            raise RuntimeError(f"Monte Carlo scenario failed: {result['error_type']}: {result['error']}")
         scores = _extract_scores(result.get("trace", {}))
         rec = {
             "action": result["action"],
@@ -0,0 +1 @@
+# Multi-profile (shadow) evaluation tests
@@ -0,0 +1,58 @@
+# AMI-ENGINE — Tek geçişte çoklu profile (shadow) değerlendirme testleri
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from ami_engine import decide, decide_multi, replay_trace
+from config_profiles import PROFILES
+from core.engine_config import load_engine_config
+from tests.monte_carlo.generator import generate_states
+
+CORNERS = (0.0, 0.5, 1.0)
+CLOSE_CALL = {"physical": 0.2, "social": 0.3, "context": 0.4, "risk": 0.1, "compassion": 0.9,
+              "justice": 0.9, "harm_sens": 0.2, "responsibility": 0.8, "empathy": 0.9}
+
+
+def _profiles():
+    # Kayıtlı tüm profile'lar + varsayılan + L1 kısıtlı seçim açık inline override
+    restrict = load_engine_config("scenario_test").to_dict()
+    restrict.update({"SOFT_SAFE_RESTRICT": True})
+    return sorted(PROFILES) + [None, restrict]
+
+
+def test_decide_multi_matches_per_profile_decide():
+    profiles = _profiles()
+    for state in [CLOSE_CALL] + generate_states(40, seed=19, corners=CORNERS):
+        for trace_level in ("full", "summary", "none"):
+            for result_detail in ("full", "minimal"):
+                results = decide_multi(state, profiles, trace_level=trace_level, result_detail=result_detail)
+                assert len(results) == len(profiles)
+                for profile, result in zip(profiles, results):
+                    assert result == decide(state, profile=profile, trace_level=trace_level,
+                                            result_detail=result_detail)
+
+
+def test_decide_multi_fine_grid_and_replay():
+    grid = [0.0, 0.25, 0.5, 0.75, 1.0]
+    profiles = ["base", "scenario_test"]
+    for state in [CLOSE_CALL] + generate_states(10, seed=7, corners=CORNERS):
+        results = decide_multi(state, profiles, resolution=grid)
+        for profile, result in zip(profiles, results):
+            assert result == decide(state, profile=profile, resolution=grid)
+    # Varsayılan profile sonucunun trace'i (replay varsayılan config ile çalışır) tek başına replay edilir
+    shadow, default = decide_multi(CLOSE_CALL, ["scenario_test", None])
+    replayed = replay_trace(default["trace"], verify_hash=True)
+    assert replayed["action"] == default["action"]
+
+
+def test_decide_multi_rejects_invalid_options():
+    assert decide_multi(CLOSE_CALL, []) == []
+    with pytest.raises(ValueError):
+        decide_multi(CLOSE_CALL, ["base", "no_such_profile"])
+    with pytest.raises(ValueError):
+        decide_multi(CLOSE_CALL, ["base"], trace_level="verbose")
@@ -0,0 +1 @@
+# Parallel / thread-safety tests
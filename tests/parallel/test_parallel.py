@@ -0,0 +1,153 @@
+# AMI-ENGINE — Thread-safety (global RNG'ye dokunmama) ve decide_many (thread/process) testleri
+
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from ami_engine import DecisionCache, decide_many, iter_decide_many
+from tests.monte_carlo.generator import generate_states
+
+
+def test_engine_leaves_global_random_untouched():
+    state = generate_states(1, seed=21)[0]
+    random.seed(1234)
+    expected = [random.random() for _ in range(3)]
+    random.seed(1234)
+    got = [random.random()]
+    moral_decision_engine(state)
+    moral_decision_engine(state, deterministic=False)
+    got += [random.random() for _ in range(2)]
+    assert got == expected
+
+
+class _ExitInWorker:
+    """Ana süreçte 0.5, worker süreçte process'i öldürür (çöken worker senaryosu)."""
+
+    def __init__(self, parent_pid):
+        self.parent_pid = parent_pid
+
+    def __float__(self):
+        if os.getpid() != self.parent_pid:
+            os._exit(1)
+        return 0.5
+
+
+class _SlowInWorker(_ExitInWorker):
+    def __float__(self):
+        if os.getpid() != self.parent_pid:
+            time.sleep(60)
+        return 0.5
+
+
+def test_decide_many_matches_sequential():
+    states = generate_states(40, seed=21)
+    expected = [moral_decision_engine(s, config_override="scenario_test") for s in states]
+    assert decide_many(states, "scenario_test", workers=4, executor="thread") == expected
+    assert decide_many(states, "scenario_test", workers=3, chunk_size=7, executor="thread") == expected
+    assert decide_many(states, "scenario_test", workers=1) == expected
+    assert decide_many([], "scenario_test") == []
+
+
+def test_process_executor_matches_sequential_and_streams_in_order():
+    states = generate_states(60, seed=4)
+    expected = [
+        moral_decision_engine(s, config_override="clamp_test", trace_level="summary") for s in states
+    ]
+    got = decide_many(states, "clamp_test", workers=3, chunk_size=8, trace_level="summary")
+    assert got == expected
+    stream = iter_decide_many(states, "clamp_test", workers=2, chunk_size=5, trace_level="summary")
+    assert next(stream) == expected[0]
+    assert list(stream) == expected[1:]
+
+
+def test_failures_surface_per_item():
+    states = generate_states(12, seed=5)
+    expected = [moral_decision_engine(s) for s in states]
+    bad = list(states)
+    bad[3] = None  # encode_state AttributeError
+    for executor in ("thread", "process"):
+        got = decide_many(bad, workers=2, chunk_size=2, executor=executor)
+        assert got[3]["error_type"] == "AttributeError"
+        assert got[:3] + got[4:] == expected[:3] + expected[4:]
+
+
+def test_dead_worker_and_timeout_only_fail_their_chunk():
+    states = generate_states(12, seed=6)
+    expected = [moral_decision_engine(s) for s in states]
+
+    crash = list(states)
+    crash[5] = dict(states[5], risk=_ExitInWorker(os.getpid()))
+    got = decide_many(crash, workers=2, chunk_size=2)
+    assert [r.get("error_type") for r in got[4:6]] == ["BrokenProcessPool"] * 2
+    assert got[:4] + got[6:] == expected[:4] + expected[6:]
+
+    slow = list(states)
+    slow[0] = dict(states[0], risk=_SlowInWorker(os.getpid()))
+    started = time.monotonic()
+    got = decide_many(slow, workers=2, chunk_size=3, timeout=1.0)
+    assert time.monotonic() - started < 30
+    assert [r.get("error_type") for r in got[:3]] == ["TimeoutError"] * 3
+    assert got[3:] == expected[3:]
+
+
+def test_concurrent_calls_with_shared_cache_are_deterministic():
+    states = generate_states(30, seed=21)
+    expected = [moral_decision_engine(s, config_override="clamp_test", trace_level="summary") for s in states]
+    cache = DecisionCache(maxsize=16)  # eviction'ları da zorlar
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(len(states)):
+                j = (i + offset) % len(states)
+                r = moral_decision_engine(states[j], config_override="clamp_test", trace_level="summary", cache=cache)
+                assert r == expected[j]
+        except Exception as e:  # pragma: no cover - hata raporu için
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(k * 7,)) for k in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 6 * len(states)
+
+
+def test_decide_many_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        decide_many(generate_states(2, seed=21), "no_such_profile")
+    with pytest.raises(ValueError):
+        decide_many(generate_states(2, seed=21), workers=0)
+    with pytest.raises(ValueError):
+        decide_many(generate_states(2, seed=21), executor="fiber")
+    with pytest.raises(ValueError):
+        decide_many(generate_states(2, seed=21), timeout=0)
+    with pytest.raises(ValueError):
+        iter_decide_many(generate_states(2, seed=21), cache=DecisionCache())
+
+
+def test_terminate_works_without_cancel_futures(monkeypatch):
+    # Python 3.8: Executor.shutdown'da cancel_futures yok; bekleyen işler elle iptal edilir
+    import ami_engine.parallel as parallel
+    from concurrent.futures import Future
+
+    class Pool:
+        def shutdown(self, wait=True):
+            self.closed = wait
+
+    monkeypatch.setattr(parallel.sys, "version_info", (3, 8, 18))
+    pool, queued, running = Pool(), Future(), Future()
+    running.set_running_or_notify_cancel()
+    parallel._terminate(pool, [queued, running])
+    assert pool.closed is False and queued.cancelled() and not running.cancelled()
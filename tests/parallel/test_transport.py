@@ -0,0 +1,74 @@
+# AMI-ENGINE — Paylaşımlı bellek / kompakt dizi taşıma katmanı (decide_many_shared) testleri
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from ami_engine import SharedBatch, decide_many_shared
+from ami_engine.transport import ACTION, FLAG_ERROR, pack_states, read_result
+from tests.monte_carlo.generator import generate_states
+
+
+def _assert_matches(row, full):
+    assert row["action"] == full["action"]
+    assert row["raw_action"] == full["raw_action"]
+    assert row["escalation"] == full["escalation"]
+    assert row["human_escalation"] == full["human_escalation"]
+    assert row["reason"] == full["reason"]
+    assert row["soft_safe_applied"] == full["soft_safe_applied"]
+    assert row["confidence"] == full.get("confidence")
+    assert row["J"] == full.get("J") and row["H"] == full.get("H")
+    assert row["cus"] == (full["uncertainty"]["cus"] if "uncertainty" in full else None)
+
+
+def test_pack_states_matches_encoder_defaults():
+    packed = pack_states([{"risk": 1.7, "physical": "n/a"}, {}])
+    assert packed.shape == (2, 9)
+    assert packed[0].tolist() == [0.5, 0.5, 0.5, 1.0, 0.5, 0.5, 0.5, 0.5, 0.5]
+    assert packed[1].tolist() == [0.5] * 9
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_shared_results_match_decide_and_trace_lazily(executor):
+    states = generate_states(48, seed=31)
+    states[4] = {"risk": 0.95, "physical": 0.9, "social": 0.9}  # eksik alanlar varsayılanla paketlenir
+    expected = [moral_decision_engine(s, config_override="clamp_test") for s in states]
+    results = decide_many_shared(states, "clamp_test", workers=3, chunk_size=5, executor=executor)
+    assert len(results) == len(states)
+    for row, full in zip(results, expected):
+        _assert_matches(row, full)
+    full = results.trace(7)
+    assert full["trace_hash"] == expected[7]["trace_hash"]
+    assert results.column("action").shape == (48, 4)
+
+
+def test_caller_owned_batch_and_array_input():
+    states = generate_states(20, seed=8)
+    expected = [moral_decision_engine(s) for s in states]
+    with SharedBatch(len(states)) as batch:
+        pack_states(states, out=batch.states)
+        decide_many_shared(batch, workers=2)
+        rows = [read_result(batch.results[i]) for i in range(len(states))]
+        assert batch.results[0, ACTION].tolist() == expected[0]["action"]
+    for row, full in zip(rows, expected):
+        _assert_matches(row, full)
+    from_array = decide_many_shared(pack_states(states), workers=1)
+    assert list(from_array) == rows
+
+
+def test_failed_rows_are_flagged():
+    states = generate_states(6, seed=9)
+    bad = np.array(pack_states(states))
+    results = decide_many_shared(bad, workers=2, chunk_size=2, timeout=0.000001)
+    assert all(int(f) & FLAG_ERROR for f in results.column("flags"))
+    assert results[0]["error_type"] == "TimeoutError"
+    assert math.isnan(results.results[0, ACTION].sum())
+    with pytest.raises(ValueError):
+        decide_many_shared(np.zeros((3, 4)))
@@ -0,0 +1 @@
+# Lazy engine result tests
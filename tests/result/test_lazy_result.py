@@ -0,0 +1,90 @@
+# AMI-ENGINE — Lazy motor çıktısı testleri (trace / trace_hash ilk erişimde, eager çıktıyla birebir aynı)
+
+import copy
+import json
+import pickle
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import ami_engine.engine as engine_module
+from ami_engine import DecisionCache, decide_multi, moral_decision_engine, replay
+from ami_engine.engine import compute_trace_hash
+from ami_engine.result import LazyEngineResult
+from tests.monte_carlo.generator import generate_states
+
+
+def test_lazy_result_matches_eager_trace():
+    # Önbellek yolu step 1–4'ü eager üretir (quantize'sız çıktı önbelleksiz çağrıyla aynı)
+    for i, state in enumerate(generate_states(30, seed=21)):
+        profile = ("scenario_test", "clamp_test", None)[i % 3]
+        for level in ("full", "summary"):
+            lazy = moral_decision_engine(state, config_override=profile, trace_level=level)
+            eager = moral_decision_engine(state, config_override=profile, trace_level=level, cache=DecisionCache())
+            assert isinstance(lazy, LazyEngineResult)
+            assert list(lazy.keys()) == list(eager.keys())
+            assert lazy["trace"] == eager["trace"]
+            assert lazy["trace_hash"] == eager["trace_hash"] == compute_trace_hash(lazy["trace"])
+            assert json.dumps(lazy) == json.dumps(eager)
+
+
+def test_trace_not_built_until_accessed(monkeypatch):
+    calls = []
+    state_steps = engine_module._state_steps
+
+    def counting(*args):
+        calls.append(1)
+        return state_steps(*args)
+
+    monkeypatch.setattr(engine_module, "_state_steps", counting)
+    result = moral_decision_engine(generate_states(1, seed=3)[0], config_override="scenario_test")
+    assert result["action"] and "trace" in result and "trace_hash" in result
+    assert result.get("escalation") in (0, 1, 2) and len(result) > 4
+    assert calls == []
+    digest = result["trace_hash"]
+    assert calls == [1] and result["trace"]["steps"][1]["event_type"] == "state_encoded"
+    result["trace"]
+    assert calls == [1] and compute_trace_hash(result["trace"]) == digest
+
+    untraced = moral_decision_engine(generate_states(1, seed=3)[0], config_override="scenario_test", trace_level="none")
+    assert "trace" not in untraced and calls == [1]
+
+
+def test_hash_reflects_trace_at_decision_time():
+    state = generate_states(1, seed=5)[0]
+    reference = moral_decision_engine(state, config_override="clamp_test")
+    expected = dict(reference)
+
+    # Çağıranın sonuç üzerindeki değişiklikleri geç üretilen trace'e / hash'e yansımaz
+    result = moral_decision_engine(state, config_override="clamp_test")
+    result["action"][0] = -1.0
+    result.pop("temporal_drift", None)
+    assert result["trace_hash"] == expected["trace_hash"]
+    assert result["trace"] == expected["trace"]
+
+    # Trace okunup değiştirilirse kayıtlı hash tutarsızlığı gösterir
+    tampered = moral_decision_engine(state, config_override="clamp_test")
+    tampered["trace"]["steps"][-1]["data"]["action"] = [0.0, 0.0, 0.0, 0.0]
+    assert tampered["trace_hash"] == expected["trace_hash"] != compute_trace_hash(tampered["trace"])
+
+
+def test_lazy_result_copies_pickles_and_replays():
+    for state in generate_states(6, seed=8):
+        result = moral_decision_engine(state, config_override="scenario_test")
+        expected = moral_decision_engine(state, config_override="scenario_test", cache=DecisionCache())
+        for other in (
+            pickle.loads(pickle.dumps(moral_decision_engine(state, config_override="scenario_test"))),
+            copy.deepcopy(moral_decision_engine(state, config_override="scenario_test")),
+            moral_decision_engine(state, config_override="scenario_test").copy(),
+            {**moral_decision_engine(state, config_override="scenario_test")},
+        ):
+            assert other == expected and list(other) == list(expected)
+        assert result == expected and dict(expected) == result
+        # replay varsayılan profile ile çalışır
+        replay(moral_decision_engine(state)["trace"], validate=True, verify_hash=True)
+
+    shadow = decide_multi(generate_states(1, seed=9)[0], [None, "scenario_test"])
+    for result, profile in zip(shadow, [None, "scenario_test"]):
+        assert result == moral_decision_engine(generate_states(1, seed=9)[0], config_override=profile, cache=DecisionCache())
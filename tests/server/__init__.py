@@ -0,0 +1 @@
+# Decision server tests
@@ -0,0 +1,174 @@
+# AMI-ENGINE — MicroBatcher (micro-batch, single-flight, session) ve HTTP/Unix socket sunucu testleri
+
+import http.client
+import json
+import socket
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from ami_engine import DecisionSession
+from ami_engine.server import MicroBatcher, make_server
+from tests.monte_carlo.generator import generate_states
+
+
+def test_batcher_results_match_decide():
+    states = generate_states(60, seed=51)
+    expected = [moral_decision_engine(s, config_override="scenario_test", trace_level="none") for s in states]
+    batcher = MicroBatcher(max_batch=16, max_wait=0.01)
+    try:
+        futures = [batcher.submit(s, "scenario_test") for s in states]
+        assert [f.result(10) for f in futures] == expected
+        full = batcher.decide(states[0], 10, profile="scenario_test", trace_level="full")
+        assert full == moral_decision_engine(states[0], config_override="scenario_test")
+        stats = batcher.stats()
+        assert stats["largest_batch"] > 1 and stats["batches"] < len(states)
+    finally:
+        batcher.close()
+
+
+def test_identical_inflight_requests_are_coalesced():
+    state = generate_states(1, seed=52)[0]
+    batcher = MicroBatcher(max_batch=64, max_wait=0.05)
+    try:
+        futures = [batcher.submit(dict(state), "scenario_test") for _ in range(10)]
+        assert all(f is futures[0] for f in futures)
+        assert futures[0].result(10) == moral_decision_engine(state, config_override="scenario_test", trace_level="none")
+        assert batcher.stats()["coalesced"] == 9
+        assert batcher.submit(state, "scenario_test").result(10) == futures[0].result()  # tamamlandıktan sonra yeniden hesaplanır
+    finally:
+        batcher.close()
+
+
+def test_sessions_match_decision_session_in_arrival_order():
+    states = generate_states(40, seed=53)
+    reference = DecisionSession("scenario_test", trace_level="none")
+    expected = [reference.decide(s) for s in states]
+    batcher = MicroBatcher(max_batch=8, max_wait=0.005)
+    try:
+        futures = [batcher.submit(s, "scenario_test", session="s1") for s in states]
+        assert [f.result(10) for f in futures] == expected
+        snapshot = batcher.session_snapshot("s1")
+        assert snapshot == dict(reference.snapshot(), profile="scenario_test", fingerprint=reference.config.fingerprint)
+        with pytest.raises(ValueError):
+            batcher.submit(states[0], "clamp_test", session="s1")
+        assert batcher.drop_session("s1") and batcher.session_snapshot("s1") is None
+    finally:
+        batcher.close()
+
+
+def test_identical_session_requests_each_advance_the_session():
+    # CUS üreten (fail-safe'e düşmeyen) bir state: her karar session penceresine bir değer ekler
+    state = next(s for s in generate_states(50, seed=54) if "uncertainty" in moral_decision_engine(s, config_override="scenario_test"))
+    reference = DecisionSession("scenario_test", trace_level="none")
+    expected = [reference.decide(state) for _ in range(3)]
+    batcher = MicroBatcher(max_batch=64, max_wait=0.05)
+    try:
+        futures = [batcher.submit(dict(state), "scenario_test", session="a") for _ in range(3)]
+        assert len({id(f) for f in futures}) == 3 and batcher.stats()["coalesced"] == 0
+        assert [f.result(10) for f in futures] == expected
+        assert batcher.session_snapshot("a")["cus_history"] == reference.snapshot()["cus_history"]
+        assert len(batcher.session_snapshot("a")["cus_history"]) == 3
+    finally:
+        batcher.close()
+
+
+def test_session_with_mixed_output_options_keeps_arrival_order():
+    # Aynı session'da trace_level değişse de adımlar geliş sırasıyla işlenmeli (DecisionSession ile aynı pencere)
+    states = generate_states(12, seed=56)
+    levels = ["full" if k % 2 == 0 else "none" for k in range(len(states))]
+    reference = DecisionSession("scenario_test")
+    expected = []
+    for state, level in zip(states, levels):
+        reference.trace_level = level
+        expected.append(reference.decide(state))
+    batcher = MicroBatcher(max_batch=64, max_wait=0.2)
+    try:
+        futures = [
+            batcher.submit(dict(state), "scenario_test", session="S", trace_level=level)
+            for state, level in zip(states, levels)
+        ]
+        results = [f.result(10) for f in futures]
+        assert [r.get("temporal_drift") for r in results] == [r.get("temporal_drift") for r in expected]
+        assert [r["action"] for r in results] == [r["action"] for r in expected]
+        assert batcher.session_snapshot("S")["cus_history"] == reference.snapshot()["cus_history"]
+    finally:
+        batcher.close()
+
+
+def _request(conn, method, path, payload=None):
+    body = json.dumps(payload) if payload is not None else None
+    conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_http_server_endpoints():
+    states = generate_states(20, seed=54)
+    server = make_server("127.0.0.1", 0, max_batch=8, max_wait=0.005)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    try:
+        def one(state):
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            try:
+                return _request(conn, "POST", "/decide", {"state": state, "profile": "scenario_test"})
+            finally:
+                conn.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            replies = list(pool.map(one, states))
+        expected = [moral_decision_engine(s, config_override="scenario_test", trace_level="none") for s in states]
+        assert [status for status, _ in replies] == [200] * len(states)
+        assert [body for _, body in replies] == json.loads(json.dumps(expected))
+
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        status, body = _request(conn, "POST", "/decide_batch", {"states": states[:3] + [None], "session": "a"})
+        assert status == 200 and len(body["results"]) == 4 and "error" in body["results"][3]
+        assert _request(conn, "GET", "/sessions/a")[1]["cus_history"]
+        assert _request(conn, "POST", "/decide", {"state": states[0], "profile": "nope"})[0] == 400
+        assert _request(conn, "GET", "/health") == (200, {"status": "ok"})
+        assert _request(conn, "GET", "/stats")[1]["requests"] >= len(states)
+        assert _request(conn, "DELETE", "/sessions/a")[0] == 200
+        assert _request(conn, "GET", "/sessions/a")[0] == 404
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+def test_unix_socket_server():
+    state = generate_states(1, seed=55)[0]
+    path = str(Path(tempfile.mkdtemp()) / "ami.sock")
+    server = make_server(unix_socket=path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        body = json.dumps({"state": state}).encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(
+                b"POST /decide HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                b"Content-Type: application/json\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+            )
+            raw = b""
+            while chunk := sock.recv(65536):
+                raw += chunk
+        head, _, payload = raw.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200")
+        assert json.loads(payload) == json.loads(json.dumps(moral_decision_engine(state, trace_level="none")))
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
@@ -0,0 +1 @@
+# Decision session tests
@@ -0,0 +1,75 @@
+# AMI-ENGINE — DecisionSession + DriftState (ring buffer temporal drift) testleri
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import moral_decision_engine
+from ami_engine import DecisionSession
+from core.temporal_drift import DriftState, compute_temporal_drift, update_cus_history
+from tests.monte_carlo.generator import generate_states
+
+
+# scenario_test altında tek başına L1; previous_escalation=2 iken hysteresis L2'de tutar
+HYSTERESIS_STATE = {
+    "physical": 0.62, "social": 0.63, "context": 0.06, "risk": 0.63, "compassion": 0.47,
+    "justice": 0.68, "harm_sens": 0.35, "responsibility": 0.71, "empathy": 0.74,
+}
+
+
+@pytest.mark.parametrize("window", [0, 1, 3, 10])
+def test_drift_state_matches_list_history(window):
+    rng = random.Random(window)
+    drift, hist = DriftState(window), []
+    for _ in range(200):
+        cus = rng.random()
+        hist = update_cus_history(hist, cus, window)
+        expected = compute_temporal_drift(cus, hist, 0.15, 0.65)
+        got = drift.update(cus, 0.15, 0.65)
+        assert got.delta_cus == expected.delta_cus
+        assert got.preemptive_escalation == expected.preemptive_escalation
+        assert abs(got.cus_mean - expected.cus_mean) <= 1e-12
+        assert drift.history() == hist
+
+
+def test_drift_state_restores_history():
+    drift = DriftState(3, [0.1, 0.2, 0.3, 0.4], previous_escalation=1)
+    assert drift.history() == [0.2, 0.3, 0.4]
+    assert drift.last == 0.4 and len(drift) == 3
+    drift.reset()
+    assert drift.history() == [] and drift.previous_escalation is None
+    with pytest.raises(ValueError):
+        DriftState(-1)
+
+
+def test_session_cus_window_matches_context_path():
+    states = generate_states(25, seed=5)
+    session = DecisionSession("clamp_test", trace_level="none")
+    ctx = {"cus_history": []}
+    for s in states:
+        r = session.decide(s)
+        moral_decision_engine(s, config_override="clamp_test", context=ctx, trace_level="none")
+        assert session.previous_escalation == r["escalation"]
+    assert session.snapshot()["cus_history"] == ctx["cus_history"]
+
+
+def test_session_applies_escalation_hysteresis():
+    stateless = moral_decision_engine(HYSTERESIS_STATE, config_override="scenario_test", trace_level="none")
+    fresh = DecisionSession("scenario_test", trace_level="none").decide(HYSTERESIS_STATE)
+    held = DecisionSession("scenario_test", trace_level="none", previous_escalation=2).decide(HYSTERESIS_STATE)
+    assert stateless["escalation"] == fresh["escalation"] == 1
+    assert held["escalation"] == 2
+
+
+def test_session_validates_profile_and_options():
+    with pytest.raises(ValueError):
+        DecisionSession("no_such_profile")
+    with pytest.raises(ValueError):
+        DecisionSession(trace_level="verbose")
+    with pytest.raises(ValueError):
+        moral_decision_engine(HYSTERESIS_STATE, context={}, drift_state=DriftState(10))
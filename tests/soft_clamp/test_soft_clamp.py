@@ -6,7 +6,10 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
+from ami_engine import moral_decision_engine
+from core.moral_evaluator import evaluate_moral, rescore_action
 from core.soft_clamp import soft_clamp_action
+from core.state_encoder import encode_state
 
 
 def test_soft_clamp_cus_zero_unchanged():
@@ -29,3 +32,25 @@ def test_soft_clamp_bounds():
     out = soft_clamp_action(a, cus=1.0, alpha=0.6, beta=0.5, gamma=0.35)
     for x in out:
         assert 0 <= x <= 1.0
+
+
+def test_rescore_action_reuses_compassion():
+    x = encode_state({"physical": 0.3, "social": 0.6, "context": 0.7, "risk": 0.8, "empathy": 0.4})
+    a = [0.7, 0.3, 0.2, 0.1]
+    full = evaluate_moral(x, a)
+    assert rescore_action(x, a) == full
+    assert rescore_action(x, a, compassion=full.C) == full
+
+
+def test_level1_selection_record_rescored():
+    raw = {"physical": 0.5855, "social": 0.0496, "context": 0.2211, "risk": 0.5567, "compassion": 0.1332,
+           "justice": 0.4191, "harm_sens": 0.5407, "responsibility": 0.5709, "empathy": 0.5603}
+    r = moral_decision_engine(raw, config_override="scenario_test")
+    assert r["soft_safe_applied"] and r["escalation"] == 1
+    sel = r["trace"]["steps"][-1]["data"]
+    assert sel["action"] == r["action"] != r["raw_action"]
+    expected = evaluate_moral(encode_state(raw), r["action"])
+    assert sel["scores"] == {"W": expected.W, "J": expected.J, "H": expected.H, "C": expected.C}
+    assert sel["confidence"] == r["confidence"]
+    assert sel["uncertainty"] == r["uncertainty"]
+    assert "self_regulation" in sel
@@ -51,3 +51,52 @@ def test_restrict_action_space_delay_min():
     restricted = restrict_action_space(candidates, severity_max=0.6, intervention_max=0.5, delay_min=0.3)
     assert len(restricted) == 1
     assert restricted[0][0] == [0.0, 0.0, 0.0, 1.0]
+
+
+def test_envelope_mask_matches_restrict_action_space():
+    from core.action_plan import get_action_plan
+
+    for resolution in (None, [i / 4 for i in range(5)], [0.0, 0.3, 0.3, 1.0]):
+        plan = get_action_plan(resolution)
+        for soft in ((0.6, 0.5, 0.3), (0.5, 0.5, 0.5), (1.0, 1.0, 0.0), (0.0, 0.0, 1.0)):
+            mask = plan.constraint_mask(0.6, 0.4, 0.0, 1.0, *soft)
+            kept = restrict_action_space([(list(a), None) for a in plan.actions], *soft)
+            assert [list(a) for a, m in zip(plan.actions, mask.envelope.tolist()) if m] == [a for a, _ in kept]
+
+
+def test_soft_safe_restrict_reselects_inside_envelope():
+    from engine import moral_decision_engine, moral_decision_engine_batch, replay
+    from core.engine_config import load_engine_config
+    from tests.monte_carlo.generator import generate_states
+
+    cfg = {**load_engine_config("scenario_test").to_dict(), "SOFT_SAFE_RESTRICT": True}
+    states = generate_states(60, seed=45)
+    batch = moral_decision_engine_batch(states, config_override=cfg)
+    restricted = 0
+    for state, row in zip(states, batch):
+        r = moral_decision_engine(state, config_override=cfg, trace_level="summary")
+        data = r["trace"]["steps"][-1]["data"]
+        assert data["soft_safe_restrict"] is True
+        assert row["action"] == r["action"] and row["escalation"] == r["escalation"]
+        clamped = moral_decision_engine(state, config_override="scenario_test", trace_level="none")
+        assert clamped["raw_action"] == r["raw_action"]
+        if not r["soft_safe_applied"]:
+            assert "filtered_candidate_count" not in data
+            assert r["action"] == clamped["action"]
+            continue
+        if data["filtered_candidate_count"] > 0:
+            # Level 1: soft eşikleri sağlayan geçerli bir aday seçilir
+            severity, _, intervention, delay = r["action"]
+            assert severity <= cfg["SEVERITY_SOFT_MAX"] and intervention <= cfg["INTERVENTION_SOFT_MAX"]
+            assert delay >= cfg["DELAY_SOFT_MIN"]
+            assert data["scores"]["J"] >= cfg["J_MIN"] and data["scores"]["H"] <= cfg["H_MAX"]
+            restricted += 1
+        else:
+            assert r["action"] == clamped["action"]
+    assert restricted > 0
+
+    # Kapalıyken (varsayılan) trace'e alan eklenmez; açıkken replay ayarı trace'ten geri yükler
+    default = moral_decision_engine({}, trace_level="summary")
+    assert "soft_safe_restrict" not in default["trace"]["steps"][-1]["data"]
+    traced = moral_decision_engine({}, config_override={"SOFT_SAFE_RESTRICT": True})
+    replay(traced["trace"], verify_hash=True)
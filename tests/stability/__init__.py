@@ -0,0 +1 @@
+# Decision stability interval tests
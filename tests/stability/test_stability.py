@@ -0,0 +1,84 @@
+# AMI-ENGINE — Karar kararlılık aralıkları testleri (aralık içi aynı karar, hemen dışı farklı karar)
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from ami_engine import decide, replay_trace
+from config_profiles import PROFILES
+from core.engine_config import load_engine_config
+from core.stability import STABILITY_KEYS, stability_contains
+from tests.monte_carlo.report import compute_report
+from tests.monte_carlo.runner import run_monte_carlo
+import tune_thresholds
+from tests.monte_carlo.generator import generate_states
+
+CORNERS = (0.0, 0.5, 1.0)
+
+
+def _decision(state, config):
+    result = decide(state, profile=config, trace_level="none")
+    return result["raw_action"], result["escalation"]
+
+
+def test_stability_intervals_are_exact():
+    for i, state in enumerate(generate_states(24, seed=20, corners=CORNERS)):
+        profile = sorted(PROFILES)[i % len(PROFILES)]
+        base = load_engine_config(profile).to_dict()
+        result = decide(state, profile=profile, trace_level="none", stability=True)
+        expected = (result["raw_action"], result["escalation"])
+        assert list(result["stability"]) == list(STABILITY_KEYS)
+        for key, (lo, hi) in result["stability"].items():
+            assert lo <= base[key] <= hi
+            for value in (lo, hi, (lo + hi) / 2):
+                assert _decision(state, {**base, key: value}) == expected, (profile, key, value)
+            # Arama sınırı ([0, 1], C_MIN ≤ C_MAX) değilse hemen dışarıdaki float'ta karar değişir
+            floor = base["C_MIN"] if key == "C_MAX" else min(0.0, base[key])
+            ceiling = base["C_MAX"] if key == "C_MIN" else max(1.0, base[key])
+            if lo > floor:
+                assert _decision(state, {**base, key: float(np.nextafter(lo, -np.inf))}) != expected
+            if hi < ceiling:
+                assert _decision(state, {**base, key: float(np.nextafter(hi, np.inf))}) != expected
+
+
+def test_stability_recorded_in_trace_and_replays():
+    state = generate_states(1, seed=4, corners=CORNERS)[0]
+    plain = decide(state, profile="scenario_test")
+    assert "stability" not in plain
+    for trace_level in ("full", "summary"):
+        result = decide(state, trace_level=trace_level, stability=True)
+        step6 = result["trace"]["steps"][-1]["data"]
+        assert step6["stability"] == result["stability"]
+        replayed = replay_trace(result["trace"], verify_hash=True)
+        assert replayed["stability"] == result["stability"]
+    assert stability_contains(result["stability"], "J_MIN", load_engine_config("base").j_min)
+    assert not stability_contains(result["stability"], "UNKNOWN", 0.5)
+    assert "stability" not in decide(state, result_detail="minimal", stability=True)
+
+
+def test_stability_rejects_non_exhaustive_search():
+    state = generate_states(1, seed=5, corners=CORNERS)[0]
+    with pytest.raises(ValueError):
+        decide(state, action_search="adaptive", stability=True)
+
+
+def test_escalation_sweep_matches_reexecution():
+    # tools/tune_thresholds.py: aralık araması tam yeniden çalıştırmayla aynı escalation oranlarını verir
+    base = load_engine_config("scenario_test").to_dict()
+    states = tune_thresholds.generate_batch(40, 7)
+    decisions, reused_total = None, 0
+    for j_min in (0.3, 0.45):
+        for h_max in (0.5, 0.6):
+            for div in (0.2, 0.4, 0.6):
+                cfg = {**base, "J_MIN": j_min, "H_MAX": h_max, "DIVERGENCE_HARD_THRESHOLD": div}
+                decisions, reused = tune_thresholds.escalation_sweep(states, cfg, decisions)
+                reused_total += reused
+                report = compute_report(run_monte_carlo(n=40, seed=7, config_override=cfg))
+                assert tune_thresholds._escalation_report(decisions)["escalation_counts"] == report["escalation_counts"]
+    assert reused_total > 0
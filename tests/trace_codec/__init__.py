@@ -0,0 +1 @@
+# Grid-deduplicated trace encoding (schema v1.1) tests
@@ -0,0 +1,96 @@
+# AMI-ENGINE — Trace şeması v1.1 testleri (grid-deduplicated kodlama, kayıpsız geri dönüş, aynı hash)
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from ami_engine import decide, replay
+from ami_engine.engine import compute_trace_hash
+from ami_engine.server import MicroBatcher, _formatted
+from ami_engine.trace_codec import GridRegistry, decode_trace, encode_trace, grid_digest
+from core.action_plan import get_action_plan
+from tests.monte_carlo.generator import generate_states
+
+CORNERS = (0.0, 1.0)
+
+OPTIONS = (
+    {},
+    {"trace_level": "summary"},
+    {"resolution": [0.0, 0.3, 0.6, 1.0]},
+    {"action_search": "adaptive"},
+)
+
+
+def test_v11_roundtrip_and_hash_match_v10():
+    for i, state in enumerate(generate_states(30, seed=23, corners=CORNERS)):
+        profile = ("scenario_test", "clamp_test", None)[i % 3]
+        for options in OPTIONS:
+            v10 = decide(state, profile=profile, **options)
+            v11 = decide(state, profile=profile, trace_format="1.1", **options)
+            assert v11["trace"]["version"] == "1.1" and v10["trace"]["version"] == "1.0"
+            assert v11["trace"] == encode_trace(v10["trace"])
+            assert v11["trace_hash"] == v10["trace_hash"] == compute_trace_hash(v11["trace"])
+            # Diskten / ağdan okunmuş trace, boş registry ile resolution'dan açılır
+            wire = json.loads(json.dumps(v11["trace"]))
+            assert decode_trace(wire, GridRegistry()) == v10["trace"]
+            assert {k: v for k, v in v11.items() if k != "trace"} == {k: v for k, v in v10.items() if k != "trace"}
+
+
+def test_v11_is_much_smaller_and_replays():
+    v10_size = v11_size = 0
+    for state in generate_states(20, seed=4, corners=CORNERS):
+        v10 = decide(state)
+        v11 = decide(state, trace_format="1.1")
+        v10_size += len(json.dumps(v10["trace"]))
+        v11_size += len(json.dumps(v11["trace"]))
+        replayed = replay(v11["trace"], validate=True, verify_hash=True, validate_ethics=True)
+        assert replayed["trace"] == v11["trace"]
+        steps = {e["step"]: e for e in v11["trace"]["steps"]}
+        assert steps[2]["data"]["grid"] == grid_digest(get_action_plan(None).actions)
+        assert "i" not in steps[3]["data"] and len(steps[3]["data"]["W"]) == len(get_action_plan(None))
+    assert v11_size < 0.35 * v10_size
+
+
+def test_grid_registry_and_invalid_input(tmp_path):
+    registry = GridRegistry()
+    actions = [[0.0, 0.1, 0.2, 0.3], [1.0, 1.0, 1.0, 1.0]]
+    digest = registry.register(actions)
+    assert digest in registry and registry.resolve(digest) == ((0.0, 0.1, 0.2, 0.3), (1.0, 1.0, 1.0, 1.0))
+    path = tmp_path / "grids.json"
+    registry.save(path)
+    restored = GridRegistry()
+    assert restored.load(path) == 1 and restored.resolve(digest) == registry.resolve(digest)
+    with pytest.raises(ValueError):
+        GridRegistry().resolve(digest)
+    with pytest.raises(ValueError):
+        GridRegistry().resolve(digest, resolution=[0.0, 1.0])
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data[digest][0][0] = 0.5
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(ValueError):
+        GridRegistry().load(path)
+
+    trace = decide(generate_states(1, seed=1, corners=CORNERS)[0])["trace"]
+    trace["steps"][3]["data"][0]["a"] = [0.2, 0.2, 0.2, 0.2]
+    with pytest.raises(ValueError):
+        encode_trace(trace)
+    with pytest.raises(ValueError):
+        decide(generate_states(1, seed=1, corners=CORNERS)[0], trace_format="2.0")
+
+
+def test_server_encodes_traces_on_request():
+    batcher = MicroBatcher(max_wait=0.001)
+    try:
+        state = generate_states(1, seed=2, corners=CORNERS)[0]
+        result = batcher.decide(state, trace_level="full", timeout=30)
+        encoded = _formatted(result, "1.1")
+        assert encoded["trace"] == encode_trace(result["trace"]) and result["trace"]["version"] == "1.0"
+        assert encoded["trace_hash"] == result["trace_hash"] == compute_trace_hash(encoded["trace"])
+        assert _formatted(result, "1.0") is result
+    finally:
+        batcher.close()
@@ -0,0 +1 @@
+# Trace level / result detail tests
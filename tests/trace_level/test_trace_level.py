@@ -0,0 +1,72 @@
+# AMI-ENGINE — trace_level (none/summary/full) ve result_detail testleri
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from engine import compute_trace_hash, moral_decision_engine, replay
+
+STATE = {
+    "physical": 0.4, "social": 0.3, "context": 0.6, "risk": 0.7,
+    "compassion": 0.6, "justice": 0.8, "harm_sens": 0.5,
+    "responsibility": 0.6, "empathy": 0.7,
+}
+
+
+def test_trace_level_none_skips_trace_and_hash():
+    full = moral_decision_engine(STATE, config_override="scenario_test")
+    r = moral_decision_engine(STATE, config_override="scenario_test", trace_level="none")
+    assert "trace" not in r and "trace_hash" not in r
+    for key in ("action", "raw_action", "escalation", "human_escalation", "confidence", "uncertainty"):
+        assert r[key] == full[key]
+
+
+def test_trace_level_summary_keeps_steps_0_5_6():
+    r = moral_decision_engine(STATE, config_override="scenario_test", trace_level="summary")
+    steps = r["trace"]["steps"]
+    assert [e["step"] for e in steps] == [0, 5, 6]
+    assert r["trace"]["level"] == "summary"
+    assert r["trace_hash"] == compute_trace_hash(r["trace"])
+    full = moral_decision_engine(STATE, config_override="scenario_test")
+    assert steps[2]["data"] == full["trace"]["steps"][-1]["data"]
+
+
+def test_summary_trace_replay_verifies_hash():
+    r = moral_decision_engine(STATE, trace_level="summary")
+    replayed = replay(r["trace"], validate=True, verify_hash=True, validate_ethics=True)
+    assert replayed["action"] == r["action"]
+    assert replayed["trace_hash"] == r["trace_hash"]
+
+
+def test_full_trace_unchanged_by_default():
+    r = moral_decision_engine(STATE)
+    assert "level" not in r["trace"]
+    assert len(r["trace"]["steps"]) == 2 + 1 + 1 + 82 + 1 + 1
+
+
+def test_result_detail_minimal():
+    r = moral_decision_engine(STATE, config_override="chaos_tuning", trace_level="none", result_detail="minimal")
+    assert set(r) == {"action", "escalation", "human_escalation", "reason"}
+    full = moral_decision_engine(STATE, config_override="chaos_tuning")
+    for key in r:
+        assert r[key] == full[key]
+
+
+def test_invalid_levels_rejected():
+    with pytest.raises(ValueError):
+        moral_decision_engine(STATE, trace_level="verbose")
+    with pytest.raises(ValueError):
+        moral_decision_engine(STATE, result_detail="tiny")
+
+
+def test_decide_passes_levels():
+    from ami_engine import decide, decide_batch
+
+    r = decide(STATE, profile="scenario_test", trace_level="none", result_detail="minimal")
+    assert set(r) == {"action", "escalation", "human_escalation", "reason"}
+    b = decide_batch([STATE], profile="scenario_test", result_detail="minimal")
+    assert b == [r]
@@ -1,12 +1,15 @@
 # AMI-ENGINE Phase 4.4 — Cognitive Uncertainty birim testleri (06_PHASE_44)
 
 import math
+import random
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
+import numpy as np
+
 from core.uncertainty import (
     hesitation_index,
     decision_entropy,
@@ -14,6 +17,8 @@ from core.uncertainty import (
     combined_uncertainty_score,
     confidence_uncertainty_divergence,
     compute_uncertainty,
+    compute_uncertainty_batch,
+    update_uncertainty,
     UncertaintyResult,
 )
 
@@ -105,3 +110,49 @@ def test_compute_uncertainty_single_candidate():
     u = compute_uncertainty(0.5, 0.0, [0.9])
     assert u.de == 0.0 and u.de_norm == 0.0
     assert u.as_ == 0.0 and u.as_norm == 0.0
+
+
+def test_update_uncertainty_matches_full_recompute():
+    scores = [0.9, 0.7, 0.5, 0.45]
+    before = compute_uncertainty(0.6, 0.1, scores)
+    updated = update_uncertainty(before, 0.75, 0.2)
+    assert updated == compute_uncertainty(0.75, 0.2, scores)
+    assert updated.de == before.de and updated.as_norm == before.as_norm
+
+
+def _reference_entropy_spread(scores):
+    m = max(scores)
+    exp_s = [math.exp(x - m) for x in scores]
+    z = sum(exp_s)
+    de = 0.0
+    for p in [e / z for e in exp_s]:
+        if p > 0:
+            de -= p * math.log(p)
+    ordered = sorted(scores, reverse=True)
+    return de, max(0.0, ordered[0] - ordered[1])
+
+
+def test_fused_kernel_bit_identical_on_large_grid():
+    rng = random.Random(3)
+    for n in (2, 3, 81, 2500):
+        scores = [rng.uniform(-1.0, 2.0) for _ in range(n)]
+        scores[n // 2] = scores[0]  # eşit en iyi skorlar
+        de, as_raw = _reference_entropy_spread(scores)
+        assert decision_entropy(scores)[0] == de
+        assert action_spread(scores)[0] == as_raw
+
+
+def test_compute_uncertainty_batch_matches_scalar():
+    rng = random.Random(5)
+    S = np.array([[rng.uniform(0.0, 1.5) for _ in range(64)] for _ in range(12)])
+    valid = np.array([[rng.random() > 0.3 for _ in range(64)] for _ in range(12)])
+    valid[0, :] = False
+    valid[1, :] = False
+    valid[1, 7] = True
+    conf = np.array([rng.random() for _ in range(12)])
+    margin = np.array([rng.uniform(-0.2, 0.3) for _ in range(12)])
+    batch = compute_uncertainty_batch(conf, margin, S, valid)
+    for i in range(12):
+        u = compute_uncertainty(float(conf[i]), float(margin[i]), S[i][valid[i]].tolist())
+        for key, value in u.to_dict().items():
+            assert math.isclose(getattr(batch, key)[i], value, rel_tol=1e-9, abs_tol=1e-12), (i, key)
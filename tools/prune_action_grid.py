@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# AMI-ENGINE — Offline aksiyon grid budama.
+# Grid + profile için hiçbir state'te geçerli olamayan / seçilemeyen aksiyonları kanıtlar ve artifact yazar.
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import engine  # noqa: F401  (core ↔ config import sırası)
+from core.action_pruning import analyze_action_grid, save_pruning, verify_pruning
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Prove infeasible / dominated grid actions and write a pruning artifact.")
+    ap.add_argument("--profile", default=None, help="Config profile (default: config.py thresholds)")
+    ap.add_argument("--resolution", type=float, nargs="+", default=None,
+                    help="Grid values per dimension (default: ACTION_GRID_RESOLUTION)")
+    ap.add_argument("-o", "--output", default=None, help="Artifact path (JSON); omitted = summary only")
+    args = ap.parse_args()
+
+    pruning = analyze_action_grid(args.resolution, args.profile)
+    verify_pruning(pruning)
+    total = len(pruning.actions)
+    print("Grid %s, profile=%s (J_MIN=%s, H_MAX=%s)" % (
+        list(pruning.resolution), pruning.profile or "default", pruning.j_min, pruning.h_max))
+    print("  actions:    %d" % total)
+    print("  infeasible: %d (never valid in any state)" % len(pruning.infeasible))
+    print("  live:       %d (scored per decision)" % len(pruning.live))
+    print("  dominated:  %d of live (never selected; kept for uncertainty)" % len(pruning.dominated))
+    if args.output:
+        save_pruning(pruning, args.output)
+        print("Wrote %s" % args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,17 @@
 # AMI-ENGINE Phase 6.0 — Offline Learning: JSONL'dan L hesaplama veya bir adım optimizasyon.
 # Kullanım (proje kökünden):
 #   python tools/run_offline_learning.py jsonl traces.jsonl
-#   python tools/run_offline_learning.py step --states 80 --candidates 5
+#   python tools/run_offline_learning.py step --states 80 --candidates 5 [--workers 8]
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
+import engine  # noqa: F401  (core'dan önce yüklenmeli; config → ami_engine → core döngüsü)
 import config as _config
 from learning.feedback_metrics import load_traces_from_jsonl, compute_metrics
 from learning.loss import compute_loss, DEFAULT_WEIGHTS
@@ -55,7 +57,7 @@ def _get_states(n: int, profile: str, seed: int):
     return generate_batch(n, seed=seed)
 
 
-def cmd_step(states_n: int, candidates_n: int, seed: int, profile: str = "") -> None:
+def cmd_step(states_n: int, candidates_n: int, seed: int, profile: str = "", workers: int | None = None) -> None:
     """State seti üretir, aday config'lerle engine çalıştırır, en iyi config ve L'yi yazdırır."""
     current = current_config_from_module()
     states = _get_states(states_n, profile, seed)
@@ -63,7 +65,7 @@ def cmd_step(states_n: int, candidates_n: int, seed: int, profile: str = "") ->
     candidates.insert(0, current)
 
     print("Offline step: state sayısı=%d, aday=%d, profil=%s" % (states_n, len(candidates), profile or "chaos"))
-    best_config, best_L, best_metrics = run_offline_step(states, current, candidate_configs=candidates)
+    best_config, best_L, best_metrics = run_offline_step(states, current, candidate_configs=candidates, workers=workers)
     print("En iyi L: %.4f" % best_L)
     print("Metrikler: fail_safe_rate=%.4f  mean_cus=%.4f  clamp_distortion=%.4f" % (
         best_metrics.get("fail_safe_rate", 0),
@@ -76,7 +78,10 @@ def cmd_step(states_n: int, candidates_n: int, seed: int, profile: str = "") ->
             print("  %s: %s" % (k, best_config[k]))
 
 
-def cmd_optimize(steps: int, states: int, candidates: int, seed: int, out_path: str, profile: str = "", config_base: str = "") -> None:
+def cmd_optimize(
+    steps: int, states: int, candidates: int, seed: int, out_path: str,
+    profile: str = "", config_base: str = "", workers: int | None = None,
+) -> None:
     """N adım optimizasyon döngüsü çalıştırır, optimization_history.jsonl üretir."""
     from learning.run_optimization_loop import run_optimization_loop
 
@@ -94,6 +99,7 @@ def cmd_optimize(steps: int, states: int, candidates: int, seed: int, out_path:
         num_candidates=candidates,
         history_path=out_path,
         base_config=base_config,
+        workers=workers,
     )
     print("Optimization tamamlandı: %d adım (profil=%s)" % (len(history), profile or "chaos"))
     print("L: %.4f -> %.4f" % (history[0]["L"], history[-1]["L"]))
@@ -109,6 +115,7 @@ def main():
     sp.add_argument("--candidates", type=int, default=5, help="Aday config sayısı")
     sp.add_argument("--seed", type=int, default=42)
     sp.add_argument("--profile", default="", help="safe|balanced|critical|chaos (Phase 6.2, boş=chaos)")
+    sp.add_argument("--workers", type=int, default=None, help="Adayları paralel değerlendiren process sayısı (0 = tüm çekirdekler)")
     op = sub.add_parser("optimize", help="Phase 6.1: N adım döngü, optimization_history.jsonl üret")
     op.add_argument("--steps", type=int, default=5)
     op.add_argument("--states", type=int, default=50)
@@ -117,17 +124,22 @@ def main():
     op.add_argument("--profile", default="balanced", help="safe|balanced|critical|chaos (Phase 6.2)")
     op.add_argument("--config-base", default="", help="scenario_test = L0/L1/L2 gorunur; bos = varsayilan")
     op.add_argument("--out", default="optimization_history.jsonl")
+    op.add_argument("--workers", type=int, default=None, help="Adayları paralel değerlendiren process sayısı (0 = tüm çekirdekler)")
     args = p.parse_args()
+    workers = getattr(args, "workers", None)
+    if workers == 0:
+        workers = os.cpu_count() or 1
 
     if args.cmd == "jsonl":
         cmd_jsonl(args.path)
     elif args.cmd == "step":
-        cmd_step(args.states, args.candidates, args.seed, getattr(args, "profile", ""))
+        cmd_step(args.states, args.candidates, args.seed, getattr(args, "profile", ""), workers)
     else:
         cmd_optimize(
             args.steps, args.states, args.candidates, args.seed, args.out,
             getattr(args, "profile", "") or "balanced",
             getattr(args, "config_base", "") or "",
+            workers,
         )
 
 
@@ -3,13 +3,17 @@
 # Hedef escalation dağılımına (L0 ~70-90%, L1 ~5-25%, L2 ~0.5-3%) en yakın config'i arar.
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+from engine import moral_decision_engine
 from config_profiles import get_config
+from core.stability import STABILITY_KEYS, stability_contains
+from tests.monte_carlo.generator import generate_batch
 from tests.monte_carlo.runner import run_monte_carlo
 from tests.monte_carlo.report import compute_report
 
@@ -23,6 +27,50 @@ def loss_escalation(
     return (p0 - t0) ** 2 + (p1 - t1) ** 2 + weight_l2 * (p2 - t2) ** 2
 
 
+def escalation_sweep(
+    states: list,
+    cfg: dict,
+    previous: list | None = None,
+) -> tuple:
+    """
+    cfg altında karar başına (escalation, kararlılık aralıkları, referans config) ve yeniden kullanılan karar sayısı.
+    previous: önceki config'in aynı state'ler için sonucu. Bir kararın referans config'i cfg'den yalnızca bir
+    kararlılık eşiğinde (STABILITY_KEYS) farklıysa ve yeni değer o eşiğin aralığındaysa karar motor
+    çalıştırılmadan yeniden kullanılır (aralıklar referans config'e göredir, referans korunur).
+    """
+    decisions = []
+    reused = 0
+    changed_by_ref: dict = {}
+    for i, state in enumerate(states):
+        if previous is not None:
+            level, stability, ref = previous[i]
+            if id(ref) not in changed_by_ref:
+                changed_by_ref[id(ref)] = [k for k in set(cfg) | set(ref) if cfg.get(k) != ref.get(k)]
+            changed = changed_by_ref[id(ref)]
+            if not changed or (
+                len(changed) == 1 and changed[0] in STABILITY_KEYS
+                and stability_contains(stability, changed[0], cfg[changed[0]])
+            ):
+                decisions.append(previous[i])
+                reused += 1
+                continue
+        result = moral_decision_engine(state, config_override=cfg, trace_level="none", stability=True)
+        decisions.append((result["escalation"], result["stability"], cfg))
+    return decisions, reused
+
+
+def _escalation_report(decisions: list) -> dict:
+    """compute_report'un escalation alanları (escalation_sweep sonucundan)."""
+    n = len(decisions)
+    counts = {0: 0, 1: 0, 2: 0}
+    for level, _, _ in decisions:
+        counts[level] += 1
+    report = {"n": n, "escalation_counts": counts}
+    for level in (0, 1, 2):
+        report["escalation_ratio_%d" % level] = counts[level] / n if n else 0.0
+    return report
+
+
 def grid_search(
     profile_name: str,
     mc_n: int,
@@ -33,10 +81,15 @@ def grid_search(
     grid_steps: int,
     center_cfg: dict | None = None,
     narrow_radius: float = 0.08,
+    workers: int | None = None,
+    stability: bool = True,
 ) -> tuple:
     """
     center_cfg None ise: profile'dan base alır, geniş aralıkta tara.
     center_cfg verilirse: dar aralık (center ± narrow_radius) ile ince grid (adaptive narrowing).
+    workers: Monte Carlo senaryoları için process sayısı (None/1 = tek çekirdek; yalnızca stability=False).
+    stability: True ise aday config'ler escalation_sweep ile değerlendirilir (kararlılık aralığı içinde kalan
+    kararlar yeniden çalıştırılmaz; escalation oranları tam çalıştırmayla aynıdır).
     """
     base = get_config(profile_name) if center_cfg is None else center_cfg
 
@@ -57,6 +110,9 @@ def grid_search(
     best_report = None
     total = len(j_min_vals) * len(h_max_vals) * len(as_vals) * len(div_vals)
     done = 0
+    states = generate_batch(mc_n, seed) if stability else None
+    decisions = None
+    reused_total = 0
 
     for j_min in j_min_vals:
         for h_max in h_max_vals:
@@ -69,8 +125,13 @@ def grid_search(
                         "AS_SOFT_THRESHOLD": round(as_t, 3),
                         "DIVERGENCE_HARD_THRESHOLD": round(div_t, 3),
                     }
-                    records = run_monte_carlo(n=mc_n, seed=seed, config_override=cfg)
-                    report = compute_report(records)
+                    if stability:
+                        decisions, reused = escalation_sweep(states, cfg, decisions)
+                        reused_total += reused
+                        report = _escalation_report(decisions)
+                    else:
+                        records = run_monte_carlo(n=mc_n, seed=seed, config_override=cfg, workers=workers)
+                        report = compute_report(records)
                     p0 = report.get("escalation_ratio_0", 0.0)
                     p1 = report.get("escalation_ratio_1", 0.0)
                     p2 = report.get("escalation_ratio_2", 0.0)
@@ -83,6 +144,8 @@ def grid_search(
                         best_cfg = cfg
                         best_report = report
 
+    if stability:
+        print("  Kararlılık aralıklarından yeniden kullanılan karar: %d/%d" % (reused_total, total * mc_n))
     return best_cfg, best_report, best_loss
 
 
@@ -106,8 +169,13 @@ def main():
                     help="Önce kaba grid, sonra en iyi config etrafında dar grid (ince ayar)")
     ap.add_argument("--no-adaptive", action="store_false", dest="adaptive",
                     help="Sadece tek grid (adaptive yok)")
-    ap.set_defaults(adaptive=False)
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Monte Carlo için process sayısı (default: tek çekirdek; 0 = tüm çekirdekler)")
+    ap.add_argument("--no-stability", action="store_false", dest="stability",
+                    help="Her aday config için tüm senaryoları yeniden çalıştır (kararlılık aralıkları kullanılmaz)")
+    ap.set_defaults(adaptive=False, stability=True)
     args = ap.parse_args()
+    workers = (os.cpu_count() or 1) if args.workers == 0 else args.workers
 
     t0, t1, t2 = args.target[0], args.target[1], args.target[2]
     print("Phase 4.6 — Tune thresholds (profile=%s, mc_n=%d, target L0=%.2f L1=%.2f L2=%.2f)" % (
@@ -116,13 +184,14 @@ def main():
 
     print("\n--- Phase 1: Coarse grid ---")
     best_cfg, best_report, best_loss = grid_search(
-        args.profile, args.mc_n, args.seed, t0, t1, t2, args.grid,
+        args.profile, args.mc_n, args.seed, t0, t1, t2, args.grid, workers=workers, stability=args.stability,
     )
 
     if args.adaptive and best_cfg:
         print("\n--- Phase 2: Narrow grid around best ---")
         best_cfg2, best_report2, best_loss2 = grid_search(
             args.profile, args.mc_n, args.seed + 1, t0, t1, t2, grid_steps=3, center_cfg=best_cfg, narrow_radius=0.07,
+            workers=workers, stability=args.stability,
         )
         if best_loss2 < best_loss:
             best_cfg, best_report, best_loss = best_cfg2, best_report2, best_loss2